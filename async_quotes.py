@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from batch_results import quote_linear_mortgages, quote_annuity_mortgages, gift_tax_results, project_investments
+
+# Vectorized calculator and number of arguments per quote type
+QUOTE_FUNCTIONS = {
+    "linear_mortgage": (quote_linear_mortgages, 3),
+    "annuity_mortgage": (quote_annuity_mortgages, 3),
+    "gift_tax": (gift_tax_results, 1),
+    "investment": (project_investments, 3)
+}
+BACKENDS = ("vectorized", "process")
+
+
+def _run_batch(name, columns):
+    return QUOTE_FUNCTIONS[name][0](*columns)
+
+
+class _Pending:
+    __slots__ = ("args", "futures", "timer")
+
+    def __init__(self):
+        self.args = []
+        self.futures = []
+        self.timer = None
+
+
+class AsyncQuoteClient:
+    """
+    Quotes for async code, micro-batched.
+
+    Calls of the same type that arrive within `window` seconds of the first one are collected
+    into one batch (dispatched early once it holds max_batch calls), priced with a single call of
+    the vectorized calculator, and every caller's future is resolved with its own scalar result
+    (MortgageQuote, GiftTaxResult or InvestmentProjection). The pricing runs off the event loop:
+    on a thread for the "vectorized" backend, or in a process pool for "process". At most
+    max_in_flight batches are priced at the same time; later batches wait for a free slot.
+    """
+
+    def __init__(self, window=0.002, max_batch=4096, backend="vectorized", max_in_flight=4, workers=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Invalid backend '{backend}'. Must be one of: {', '.join(BACKENDS)}.")
+
+        self.window = window
+        self.max_batch = max_batch
+        self.backend = backend
+        self.max_in_flight = max_in_flight
+        self.workers = workers
+        self.batches = 0
+        self.quotes = 0
+        self._pending = {}
+        self._tasks = set()
+        self._slots = None
+        self._executor = None
+
+    def _start(self):
+        if self._executor is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._executor = ThreadPoolExecutor(self.max_in_flight) if self.backend == "vectorized" else \
+                ProcessPoolExecutor(self.workers or os.cpu_count() or 1)
+
+    def quote(self, name, *args):
+        """Queue one quote and return a future for its result. Must be called from a running event loop."""
+        if name not in QUOTE_FUNCTIONS:
+            raise ValueError(f"Unknown quote type '{name}'. Must be one of: {', '.join(QUOTE_FUNCTIONS)}.")
+        if len(args) != QUOTE_FUNCTIONS[name][1]:
+            raise TypeError(f"A {name} quote takes {QUOTE_FUNCTIONS[name][1]} arguments, got {len(args)}.")
+        # Converted here, so a bad argument fails this call only and not the batch it would join
+        args = tuple(float(arg) for arg in args)
+
+        loop = asyncio.get_running_loop()
+        self._start()
+        pending = self._pending.get(name)
+        if pending is None:
+            pending = self._pending[name] = _Pending()
+            pending.timer = loop.call_later(self.window, self._flush, name)
+
+        future = loop.create_future()
+        pending.args.append(args)
+        pending.futures.append(future)
+        if len(pending.futures) >= self.max_batch:
+            self._flush(name)
+
+        return future
+
+    async def linear_mortgage(self, mortgage_amount, interest_rate, years):
+        return await self.quote("linear_mortgage", mortgage_amount, interest_rate, years)
+
+    async def annuity_mortgage(self, mortgage_amount, interest_rate, years):
+        return await self.quote("annuity_mortgage", mortgage_amount, interest_rate, years)
+
+    async def gift_tax(self, gift_amount):
+        return await self.quote("gift_tax", gift_amount)
+
+    async def investment(self, annual_principal, annual_yield, years):
+        return await self.quote("investment", annual_principal, annual_yield, years)
+
+    def _flush(self, name):
+        pending = self._pending.pop(name, None)
+        if pending is None:
+            return
+        pending.timer.cancel()
+
+        task = asyncio.get_running_loop().create_task(self._dispatch(name, pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, name, pending):
+        async with self._slots:
+            try:
+                columns = [np.array(column, dtype=np.float64) for column in zip(*pending.args)]
+                batch = await asyncio.get_running_loop().run_in_executor(self._executor, _run_batch, name, columns)
+            except Exception as error:
+                for future in pending.futures:
+                    if not future.done():
+                        future.set_exception(error)
+                return
+
+        self.batches += 1
+        self.quotes += len(pending.futures)
+        for index, future in enumerate(pending.futures):
+            if not future.done():  # the caller may have been cancelled meanwhile
+                future.set_result(batch[index])
+
+    async def flush(self):
+        """Dispatch everything queued and wait until all batches are priced."""
+        for name in list(self._pending):
+            self._flush(name)
+        while self._tasks:
+            await asyncio.gather(*self._tasks)
+
+    async def close(self):
+        await self.flush()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def _random_requests(count, seed):
+    rng = np.random.default_rng(seed)
+    names = rng.choice(list(QUOTE_FUNCTIONS), count)
+    amounts = np.round(rng.uniform(50000, 800000, count), 2)
+    rates = np.round(rng.uniform(0.01, 0.07, count), 4)
+    years = rng.integers(5, 31, count)
+
+    requests = []
+    for name, amount, rate, duration in zip(names.tolist(), amounts.tolist(), rates.tolist(), years.tolist()):
+        if name == "gift_tax":
+            requests.append((name, (amount / 4,)))
+        elif name == "investment":
+            requests.append((name, (amount / 100, rate + 0.02, duration)))
+        else:
+            requests.append((name, (amount, rate, duration)))
+    return requests
+
+
+async def benchmark(requests=20000, concurrency=1000, seed=0, **client_options):
+    """
+    Fire `requests` random quotes from `concurrency` concurrent callers, each awaiting its quote
+    before sending the next one, and report throughput and latency percentiles.
+    """
+    queue = _random_requests(requests, seed)
+    latencies = np.empty(len(queue))
+    position = 0
+
+    async def caller(client):
+        nonlocal position
+        while position < len(queue):
+            index = position
+            position += 1
+            name, args = queue[index]
+            start = time.perf_counter()
+            await client.quote(name, *args)
+            latencies[index] = time.perf_counter() - start
+
+    async with AsyncQuoteClient(**client_options) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(caller(client) for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+        batches = client.batches
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "seconds": seconds,
+        "quotes_per_second": requests / seconds if seconds else float("inf"),
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000),
+        "batches": batches,
+        "mean_batch_size": requests / batches if batches else 0.0
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched async quoting.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--backend", choices=BACKENDS, default="vectorized")
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=4096)
+    arguments = parser.parse_args()
+
+    for concurrency in arguments.concurrency:
+        report = asyncio.run(benchmark(arguments.requests, concurrency, backend=arguments.backend,
+                                       window=arguments.window_ms / 1000, max_batch=arguments.max_batch))
+        print(f"concurrency {concurrency}: {report['quotes_per_second']:.0f} quotes/s, "
+              f"p50 {report['p50_ms']:.2f} ms, p99 {report['p99_ms']:.2f} ms, "
+              f"mean batch {report['mean_batch_size']:.1f}")
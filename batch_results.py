@@ -0,0 +1,347 @@
+import numpy as np
+
+from constants import INTEREST_DEDUCTION
+from gifts import (
+    HOME_ACQUISITION_EXEMPTION,
+    ANNUAL_PARENTAL_EXEMPTION,
+    FIRST_BRACKET_LIMIT,
+    FIRST_BRACKET_RATE,
+    SECOND_BRACKET_RATE
+)
+from mortgage import MONTHS_IN_YEAR
+from results import _Result, MortgageQuote, GiftTaxResult, InvestmentProjection
+
+
+class _ResultBatch:
+    """
+    Struct-of-arrays counterpart of a scalar result type.
+
+    Every field of the scalar result is stored as one read-only NumPy column, so a batch of
+    a million results costs a few flat arrays instead of a million Python objects. Indexing
+    with an integer gives back the scalar result; slices and boolean masks give a new batch.
+    """
+    __slots__ = ("_columns",)
+    _result_type = None
+    _dtypes = {}
+
+    def __init__(self, **columns):
+        fields = self._result_type.__slots__
+        unknown = set(columns) - set(fields)
+        if unknown:
+            raise TypeError(f"{type(self).__name__} got unexpected columns: {', '.join(sorted(unknown))}")
+
+        missing = [name for name in fields if name not in columns]
+        if missing:
+            raise TypeError(f"{type(self).__name__} is missing columns: {', '.join(missing)}")
+
+        arrays = {}
+        length = None
+        for name in fields:
+            array = np.asarray(columns[name], dtype=self._dtypes.get(name, np.float64)).reshape(-1).view()
+            array.flags.writeable = False
+            if length is None:
+                length = len(array)
+            elif len(array) != length:
+                raise ValueError(f"Column '{name}' has {len(array)} rows, expected {length}")
+            arrays[name] = array
+
+        object.__setattr__(self, "_columns", arrays)
+
+    def __getattr__(self, name):
+        try:
+            return object.__getattribute__(self, "_columns")[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return _rebuild_batch, (type(self), self._columns)
+
+    def __len__(self):
+        return len(next(iter(self._columns.values())))
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return self._result_type(*(_to_python(self._columns[name][index]) for name in self._result_type.__slots__))
+
+        return type(self)(**{name: column[index] for name, column in self._columns.items()})
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        return f"{type(self).__name__}(rows={len(self)}, nbytes={self.nbytes})"
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self._columns.values())
+
+    def columns(self):
+        return dict(self._columns)
+
+    @classmethod
+    def from_results(cls, results):
+        results = list(results)
+        return cls(**{name: [getattr(result, name) for result in results] for name in cls._result_type.__slots__})
+
+    @classmethod
+    def concatenate(cls, batches):
+        batches = list(batches)
+        return cls(**{name: np.concatenate([batch._columns[name] for batch in batches])
+                      for name in cls._result_type.__slots__})
+
+
+def _rebuild_batch(cls, columns):
+    return cls(**columns)
+
+
+def _to_python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class MortgageQuoteBatch(_ResultBatch):
+    __slots__ = ()
+    _result_type = MortgageQuote
+    _dtypes = {"kind": np.str_, "years": np.int64}
+
+
+class GiftTaxBatch(_ResultBatch):
+    __slots__ = ()
+    _result_type = GiftTaxResult
+
+
+class InvestmentProjectionBatch(_ResultBatch):
+    __slots__ = ()
+    _result_type = InvestmentProjection
+    _dtypes = {"years": np.int64}
+
+
+class _ColumnResult(_Result):
+    """
+    Base for immutable results whose fields are NumPy columns (one value per loan or scenario).
+
+    Fields are compared with np.array_equal, with NaNs in float columns equal to each other, and
+    like the arrays they hold the results are not hashable.
+    """
+    __slots__ = ()
+    __hash__ = None
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(np.array_equal(mine, theirs, equal_nan=np.asarray(mine).dtype.kind in "fc")
+                   for mine, theirs in zip(self.astuple(), other.astuple()))
+
+    def columns(self):
+        return self.asdict()
+
+
+def _broadcast(*values):
+    arrays = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in values))
+    return [array.reshape(-1) for array in arrays]
+
+
+def calculate_annuity_mortgage_payments(principals, interest_rates, years):
+    """
+    Vectorized calculate_annuity_mortgage_payment: same formula, including the 0% case, over arrays.
+    """
+    principals, interest_rates, years = _broadcast(principals, interest_rates, years)
+    monthly_rates = interest_rates / MONTHS_IN_YEAR
+    num_payments = years * MONTHS_IN_YEAR
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + monthly_rates) ** num_payments
+        payments = principals * (monthly_rates * growth) / (growth - 1)
+
+    return np.where(monthly_rates == 0, principals / num_payments, payments)
+
+
+def quote_linear_mortgages(mortgage_amounts, interest_rates, years):
+    """
+    Vectorized quote_linear_mortgage.
+
+    The monthly interest of a linear mortgage falls by the same amount every month, so the
+    total interest over n payments is the arithmetic series amount * rate / 12 * (n + 1) / 2.
+    """
+    mortgage_amounts, interest_rates, years = _broadcast(mortgage_amounts, interest_rates, years)
+    num_payments = years * MONTHS_IN_YEAR
+    monthly_principal = mortgage_amounts / num_payments
+
+    initial_payment = monthly_principal + mortgage_amounts * interest_rates / MONTHS_IN_YEAR
+    final_payment = monthly_principal + monthly_principal * interest_rates / MONTHS_IN_YEAR
+    total_interest = mortgage_amounts * interest_rates / MONTHS_IN_YEAR * (num_payments + 1) / 2
+
+    return MortgageQuoteBatch(
+        kind=np.full(len(mortgage_amounts), "linear"),
+        mortgage_amount=mortgage_amounts,
+        interest_rate=interest_rates,
+        years=years,
+        initial_payment=initial_payment,
+        final_payment=final_payment,
+        total_interest=total_interest,
+        total_tax_return=total_interest * (INTEREST_DEDUCTION / 100),
+        total_paid=mortgage_amounts + total_interest
+    )
+
+
+def quote_annuity_mortgages(mortgage_amounts, interest_rates, years):
+    """
+    Vectorized quote_annuity_mortgage.
+
+    The interest portions of an annuity add up to everything paid minus the principal, so the
+    tax return is that total times the deduction rate instead of a month-by-month loop.
+    """
+    mortgage_amounts, interest_rates, years = _broadcast(mortgage_amounts, interest_rates, years)
+    monthly_payment = calculate_annuity_mortgage_payments(mortgage_amounts, interest_rates, years)
+    total_paid = monthly_payment * years * MONTHS_IN_YEAR
+    total_interest = total_paid - mortgage_amounts
+
+    return MortgageQuoteBatch(
+        kind=np.full(len(mortgage_amounts), "annuity"),
+        mortgage_amount=mortgage_amounts,
+        interest_rate=interest_rates,
+        years=years,
+        initial_payment=monthly_payment,
+        final_payment=monthly_payment,
+        total_interest=total_interest,
+        total_tax_return=total_interest * (INTEREST_DEDUCTION / 100),
+        total_paid=total_paid
+    )
+
+
+def quote_interest_only_mortgages(mortgage_amounts, interest_rates, years):
+    """Vectorized quote_interest_only_mortgage."""
+    mortgage_amounts, interest_rates, years = _broadcast(mortgage_amounts, interest_rates, years)
+    monthly_interest = mortgage_amounts * interest_rates / MONTHS_IN_YEAR
+    total_interest = monthly_interest * years * MONTHS_IN_YEAR
+
+    return MortgageQuoteBatch(
+        kind=np.full(len(mortgage_amounts), "interest_only"),
+        mortgage_amount=mortgage_amounts,
+        interest_rate=interest_rates,
+        years=years,
+        initial_payment=monthly_interest,
+        final_payment=monthly_interest,
+        total_interest=total_interest,
+        total_tax_return=total_interest * (INTEREST_DEDUCTION / 100),
+        total_paid=mortgage_amounts + total_interest
+    )
+
+
+def calculate_bank_savings_deposits(mortgage_amounts, interest_rates, years):
+    """Vectorized calculate_bank_savings_deposit, including the 0% case."""
+    mortgage_amounts, interest_rates, years = _broadcast(mortgage_amounts, interest_rates, years)
+    monthly_rates = interest_rates / MONTHS_IN_YEAR
+    num_payments = years * MONTHS_IN_YEAR
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        deposits = mortgage_amounts * monthly_rates / ((1 + monthly_rates) ** num_payments - 1)
+
+    return np.where(monthly_rates == 0, mortgage_amounts / num_payments, deposits)
+
+
+def quote_bank_savings_mortgages(mortgage_amounts, interest_rates, years):
+    """
+    Vectorized quote_bank_savings_mortgage. The interest is that of an interest-only loan; the
+    payment adds the savings deposit, which makes it equal to the annuity payment.
+    """
+    mortgage_amounts, interest_rates, years = _broadcast(mortgage_amounts, interest_rates, years)
+    monthly_interest = mortgage_amounts * interest_rates / MONTHS_IN_YEAR
+    monthly_payment = monthly_interest + calculate_bank_savings_deposits(mortgage_amounts, interest_rates, years)
+    total_interest = monthly_interest * years * MONTHS_IN_YEAR
+
+    return MortgageQuoteBatch(
+        kind=np.full(len(mortgage_amounts), "bank_savings"),
+        mortgage_amount=mortgage_amounts,
+        interest_rate=interest_rates,
+        years=years,
+        initial_payment=monthly_payment,
+        final_payment=monthly_payment,
+        total_interest=total_interest,
+        total_tax_return=total_interest * (INTEREST_DEDUCTION / 100),
+        total_paid=monthly_payment * years * MONTHS_IN_YEAR
+    )
+
+
+MORTGAGE_QUOTE_ENGINES = {
+    "linear": quote_linear_mortgages,
+    "annuity": quote_annuity_mortgages,
+    "interest_only": quote_interest_only_mortgages,
+    "bank_savings": quote_bank_savings_mortgages
+}
+
+
+def quote_mortgages(kinds, mortgage_amounts, interest_rates, years):
+    """
+    Quote a book that mixes mortgage kinds: every kind is priced once on its rows by its
+    vectorized engine and the results are scattered back in the original order.
+    """
+    kinds = np.asarray(kinds)
+    kinds, mortgage_amounts, interest_rates, years = [array.reshape(-1) for array in np.broadcast_arrays(
+        kinds, np.asarray(mortgage_amounts, dtype=np.float64), np.asarray(interest_rates, dtype=np.float64),
+        np.asarray(years, dtype=np.float64))]
+
+    unknown = set(np.unique(kinds).tolist()) - set(MORTGAGE_QUOTE_ENGINES)
+    if unknown:
+        raise ValueError(f"Invalid mortgage kinds {', '.join(sorted(unknown))}. "
+                         f"Must be one of: {', '.join(MORTGAGE_QUOTE_ENGINES)}.")
+
+    columns = {name: np.empty(len(kinds), dtype=MortgageQuoteBatch._dtypes.get(name, np.float64))
+               for name in MortgageQuote.__slots__ if name != "kind"}
+    for kind, engine in MORTGAGE_QUOTE_ENGINES.items():
+        rows = kinds == kind
+        if rows.any():
+            batch = engine(mortgage_amounts[rows], interest_rates[rows], years[rows])
+            for name, column in columns.items():
+                column[rows] = getattr(batch, name)
+
+    return MortgageQuoteBatch(kind=kinds, **columns)
+
+
+def calculate_gift_taxes(gift_amounts):
+    gift_amounts = np.asarray(gift_amounts, dtype=np.float64)
+    taxable_amount = np.maximum(0, gift_amounts - (HOME_ACQUISITION_EXEMPTION + ANNUAL_PARENTAL_EXEMPTION))
+
+    return np.where(taxable_amount <= FIRST_BRACKET_LIMIT,
+                    taxable_amount * FIRST_BRACKET_RATE,
+                    FIRST_BRACKET_LIMIT * FIRST_BRACKET_RATE + (taxable_amount - FIRST_BRACKET_LIMIT) * SECOND_BRACKET_RATE)
+
+
+def gift_tax_results(gift_amounts):
+    gift_amounts = np.asarray(gift_amounts, dtype=np.float64).reshape(-1)
+    tax = calculate_gift_taxes(gift_amounts)
+
+    return GiftTaxBatch(gift_amount=gift_amounts, tax=tax, net=gift_amounts - tax)
+
+
+def calculate_growths_over_n_years(yields, years):
+    """
+    Vectorized calculate_growth_over_n_years.
+
+    The loop averages (1 + y) ** i for i = 1..n, which is the geometric series
+    (1 + y) * ((1 + y) ** n - 1) / (y * n), or exactly 1 for a 0% yield.
+    """
+    yields, years = _broadcast(yields, years)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + yields) * ((1 + yields) ** years - 1) / (yields * years)
+
+    return np.where(yields == 0, 1.0, growth)
+
+
+def project_investments(annual_principals, annual_yields, years):
+    annual_principals, annual_yields, years = _broadcast(annual_principals, annual_yields, years)
+    total_principal = annual_principals * years
+    growth = calculate_growths_over_n_years(annual_yields, years)
+
+    return InvestmentProjectionBatch(
+        annual_principal=annual_principals,
+        annual_yield=annual_yields,
+        years=years,
+        total_principal=total_principal,
+        growth=growth,
+        total_return=total_principal * growth
+    )
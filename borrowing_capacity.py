@@ -0,0 +1,117 @@
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+from batch_results import _ColumnResult, calculate_annuity_mortgage_payments
+from mortgage import MONTHS_IN_YEAR
+
+DEFAULT_TABLE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "housing_cost_ratios.csv")
+SECOND_INCOME_SHARE = 0.9  # share of the lower of two incomes that counts towards the household income
+DEFAULT_YEARS = 30  # capacity is tested against a 30-year annuity
+
+
+class HousingCostRatioTable:
+    """
+    Percentage of gross household income that may go to gross housing costs, by income band
+    and interest rate band.
+
+    income_edges and rate_edges are the sorted lower bounds of the bands and ratios has one row
+    per income band and one column per rate band. Incomes and rates below the first edge use the
+    first band. Lookups are two np.searchsorted calls and a gather, for any number of applicants.
+    """
+    __slots__ = ("income_edges", "rate_edges", "ratios")
+
+    def __init__(self, income_edges, rate_edges, ratios):
+        self.income_edges = np.asarray(income_edges, dtype=np.float64)
+        self.rate_edges = np.asarray(rate_edges, dtype=np.float64)
+        self.ratios = np.asarray(ratios, dtype=np.float64)
+
+        if self.ratios.shape != (len(self.income_edges), len(self.rate_edges)):
+            raise ValueError("The ratio table needs one row per income band and one column per rate band.")
+        for edges in (self.income_edges, self.rate_edges):
+            if len(edges) == 0 or np.any(np.diff(edges) <= 0):
+                raise ValueError("Band edges must be non-empty and strictly increasing.")
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Read a table whose header is income_from followed by the rate band edges and whose rows
+        are an income band edge followed by its ratios. Lines starting with # are comments.
+        The rows are sorted here, so the file can list them in any order.
+        """
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = [row for row in csv.reader(file) if row and not row[0].startswith("#")]
+
+        header, body = rows[0], np.array(rows[1:], dtype=np.float64)
+        rate_edges = np.array(header[1:], dtype=np.float64)
+        body = body[np.argsort(body[:, 0])]
+        rate_order = np.argsort(rate_edges)
+
+        return cls(body[:, 0], rate_edges[rate_order], body[:, 1:][:, rate_order])
+
+    def ratios_for(self, incomes, interest_rates):
+        """Housing cost ratios (in percentage) for arrays of household incomes and annual rates (decimals)."""
+        income_indices = np.maximum(np.searchsorted(self.income_edges, incomes, side="right") - 1, 0)
+        rate_indices = np.maximum(np.searchsorted(self.rate_edges, interest_rates, side="right") - 1, 0)
+
+        return self.ratios[income_indices, rate_indices]
+
+
+@lru_cache(maxsize=8)
+def load_ratio_table(path=DEFAULT_TABLE):
+    return HousingCostRatioTable.from_csv(path)
+
+
+def household_incomes(incomes, partner_incomes=0):
+    """The higher income counts in full and the lower one for SECOND_INCOME_SHARE."""
+    incomes = np.asarray(incomes, dtype=np.float64)
+    partner_incomes = np.asarray(partner_incomes, dtype=np.float64)
+    if np.any(incomes < 0) or np.any(partner_incomes < 0):
+        raise ValueError("Incomes cannot be negative.")
+
+    return np.maximum(incomes, partner_incomes) + SECOND_INCOME_SHARE * np.minimum(incomes, partner_incomes)
+
+
+class BorrowingCapacity(_ColumnResult):
+    """
+    Maximum loan per applicant: household_income after weighing a second income, the
+    housing_cost_ratio that applies to it (percentage), the monthly_budget for gross mortgage
+    payments and the max_loan whose annuity payment equals that budget.
+    """
+    __slots__ = ("household_income", "interest_rate", "years", "housing_cost_ratio", "monthly_budget", "max_loan")
+
+
+def borrowing_capacity(incomes, interest_rates, years=DEFAULT_YEARS, partner_incomes=0, table=None):
+    """
+    Maximum annuity mortgage for arrays of gross annual incomes and annual interest rates (decimals).
+
+    The annuity payment is linear in the principal, so the loan that fits a monthly budget is
+    the budget divided by calculate_annuity_mortgage_payments for a principal of 1, which also
+    covers the 0% case.
+    """
+    table = load_ratio_table() if table is None else table
+    income = household_incomes(incomes, partner_incomes)
+    income, interest_rates, years = np.broadcast_arrays(income, np.asarray(interest_rates, dtype=np.float64),
+                                                        np.asarray(years, dtype=np.float64))
+
+    ratio = table.ratios_for(income, interest_rates)
+    monthly_budget = income * ratio / 100 / MONTHS_IN_YEAR
+    payment_per_euro = calculate_annuity_mortgage_payments(1.0, interest_rates, years).reshape(income.shape)
+
+    return BorrowingCapacity(household_income=income, interest_rate=interest_rates, years=years,
+                             housing_cost_ratio=ratio, monthly_budget=monthly_budget,
+                             max_loan=monthly_budget / payment_per_euro)
+
+
+def max_mortgage(income, interest_rate, years=DEFAULT_YEARS, partner_income=0, table=None):
+    """Scalar borrowing_capacity: the maximum loan for one household."""
+    return float(borrowing_capacity(income, interest_rate, years, partner_income, table).max_loan)
+
+
+def check_affordability(mortgage_amounts, incomes, interest_rates, years=DEFAULT_YEARS, partner_incomes=0,
+                        table=None):
+    """Whether each mortgage amount fits within the borrowing capacity of its applicant(s)."""
+    capacity = borrowing_capacity(incomes, interest_rates, years, partner_incomes, table)
+    return np.asarray(mortgage_amounts, dtype=np.float64) <= capacity.max_loan
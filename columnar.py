@@ -0,0 +1,228 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from schedules import Schedule
+
+MAGIC = b"FTCOL\x01"
+_FOOTER_SIZE = struct.Struct("<Q")
+_ALIGNMENT = 64  # every uncompressed column segment starts on a 64-byte boundary
+COMPRESSIONS = (None, "zlib")
+
+
+class ColumnarWriter:
+    """
+    Streaming writer of the columnar binary format.
+
+    A file is the magic bytes, then the appended chunks, then a JSON footer describing the columns
+    (name, dtype, compression), the byte range of every column segment per chunk and free-form
+    attrs, followed by the footer length and the magic bytes again. Chunks go to disk as soon as
+    they are appended, so a schedule or sweep never has to be held in memory as a whole; the file
+    only becomes readable once close() has written the footer.
+
+    schema maps column names to NumPy dtypes; when it is None it is taken from the first chunk.
+    Chunks whose columns would lose values when cast to the schema (floats into an integer column,
+    longer strings than the schema holds) are rejected with a ValueError.
+    compression maps column names to "zlib" for columns that should be compressed.
+    """
+
+    def __init__(self, path, schema=None, compression=None, attrs=None, level=6):
+        self.path = path
+        self.compression = dict(compression or {})
+        self.attrs = dict(attrs or {})
+        self.level = level
+        self.schema = None if schema is None else {name: np.dtype(dtype) for name, dtype in schema.items()}
+        self._chunks = []
+        self._file = None
+
+        # Validate before opening, so a bad argument never truncates an existing file
+        for name, method in self.compression.items():
+            if method not in COMPRESSIONS:
+                raise ValueError(f"Invalid compression '{method}' for column '{name}'. Must be 'zlib' or None.")
+            if self.schema is not None and name not in self.schema:
+                raise ValueError(f"Compression given for column '{name}', which is not in the schema.")
+
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def append(self, columns):
+        if self._file is None:
+            raise ValueError("Cannot append to a closed writer.")
+
+        if self.schema is None:
+            self.schema = {name: np.asarray(values).dtype for name, values in columns.items()}
+        if set(columns) != set(self.schema):
+            raise ValueError(f"Chunk columns {sorted(columns)} do not match the schema {sorted(self.schema)}")
+
+        arrays = {}
+        for name, dtype in self.schema.items():
+            values = np.asarray(columns[name])
+            # A later chunk must fit the schema, a silent cast would corrupt it on disk
+            if not np.can_cast(values.dtype, dtype, casting="same_kind"):
+                raise ValueError(f"Column '{name}' of dtype {values.dtype} cannot be stored as {dtype}.")
+            if dtype.kind in "SU" and values.dtype.itemsize > dtype.itemsize:
+                raise ValueError(f"Column '{name}' has values longer than its schema dtype {dtype} allows.")
+            arrays[name] = np.ascontiguousarray(values, dtype=dtype).reshape(-1)
+        rows = {len(array) for array in arrays.values()}
+        if len(rows) > 1:
+            raise ValueError("All columns of a chunk must have the same number of rows.")
+
+        segments = {}
+        for name, array in arrays.items():
+            data = array.tobytes()
+            if self.compression.get(name) == "zlib":
+                data = zlib.compress(data, self.level)
+            else:
+                self._file.write(b"\0" * (-self._file.tell() % _ALIGNMENT))
+
+            segments[name] = {"offset": self._file.tell(), "nbytes": len(data)}
+            self._file.write(data)
+
+        self._chunks.append({"rows": rows.pop() if rows else 0, "columns": segments})
+
+    def close(self):
+        if self._file is None:
+            return
+
+        footer = {
+            "columns": [{"name": name, "dtype": dtype.str, "compression": self.compression.get(name)}
+                        for name, dtype in (self.schema or {}).items()],
+            "chunks": self._chunks,
+            "attrs": self.attrs
+        }
+        data = json.dumps(footer).encode("utf-8")
+        self._file.write(data)
+        self._file.write(_FOOTER_SIZE.pack(len(data)))
+        self._file.write(MAGIC)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ColumnarReader:
+    """
+    Reader of the columnar binary format.
+
+    Only the footer is read eagerly. Uncompressed column segments are returned as read-only
+    np.memmap views, so the operating system pages data in as it is touched; compressed segments
+    are decompressed on access. column() of a multi-chunk file concatenates its chunks, use
+    iter_chunks() to stay chunk by chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not a columnar file.")
+
+            if file.seek(0, 2) < 2 * len(MAGIC) + _FOOTER_SIZE.size:
+                raise ValueError(f"'{path}' is incomplete: the writer was not closed.")
+            file.seek(-(len(MAGIC) + _FOOTER_SIZE.size), 2)
+            (footer_size,) = _FOOTER_SIZE.unpack(file.read(_FOOTER_SIZE.size))
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is incomplete: the writer was not closed.")
+
+            file.seek(-(len(MAGIC) + _FOOTER_SIZE.size + footer_size), 2)
+            footer = json.loads(file.read(footer_size).decode("utf-8"))
+
+        self.columns = {column["name"]: column for column in footer["columns"]}
+        self.dtypes = {name: np.dtype(column["dtype"]) for name, column in self.columns.items()}
+        self.chunks = footer["chunks"]
+        self.attrs = footer["attrs"]
+
+    def __len__(self):
+        return sum(chunk["rows"] for chunk in self.chunks)
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def _segment(self, chunk, name):
+        segment = chunk["columns"][name]
+        dtype = self.dtypes[name]
+
+        if self.columns[name]["compression"] == "zlib":
+            with open(self.path, "rb") as file:
+                file.seek(segment["offset"])
+                data = zlib.decompress(file.read(segment["nbytes"]))
+            array = np.frombuffer(data, dtype=dtype)
+        elif chunk["rows"] == 0:
+            array = np.empty(0, dtype=dtype)
+        else:
+            array = np.memmap(self.path, dtype=dtype, mode="r", offset=segment["offset"], shape=(chunk["rows"],))
+
+        return array
+
+    def chunk(self, index, names=None):
+        chunk = self.chunks[index]
+        return {name: self._segment(chunk, name) for name in (names or self.columns)}
+
+    def iter_chunks(self, names=None):
+        for index in range(len(self.chunks)):
+            yield self.chunk(index, names)
+
+    def column(self, name):
+        if name not in self.columns:
+            raise KeyError(f"Unknown column '{name}'")
+
+        segments = [self._segment(chunk, name) for chunk in self.chunks]
+        if len(segments) == 1:
+            return segments[0]
+        if not segments:
+            return np.empty(0, dtype=self.dtypes[name])
+        return np.concatenate(segments)
+
+    def read(self, names=None):
+        return {name: self.column(name) for name in (names or self.columns)}
+
+    def cube(self, name):
+        """A sweep column reshaped to the axes stored by write_sweep."""
+        shape = [len(values) for values in self.attrs["axes"].values()]
+        return self.column(name).reshape(shape)
+
+
+def write_schedule(path, schedule, attrs=None, compression=None):
+    """
+    Write a Schedule. A (loans, months) batch is stored flattened loan by loan, with the number of
+    loans in attrs so read_schedule can restore the 2-D shape.
+    """
+    loans = len(schedule) if schedule.payment.ndim == 2 else None
+    attrs = dict(attrs or {}, kind="schedule", months=schedule.months, loans=loans)
+    with ColumnarWriter(path, {name: np.float64 for name in Schedule.__slots__}, compression, attrs) as writer:
+        writer.append({name: np.ravel(values) for name, values in schedule.columns().items()})
+
+
+def read_schedule(path):
+    reader = ColumnarReader(path)
+    columns = reader.read(list(Schedule.__slots__))
+    if reader.attrs.get("loans") is not None:
+        columns = {name: values.reshape(reader.attrs["loans"], reader.attrs["months"])
+                   for name, values in columns.items()}
+    return Schedule(**columns)
+
+
+def write_batch(path, batch, attrs=None, compression=None, chunk_rows=1 << 20):
+    """Write a result batch (MortgageQuoteBatch, InvestmentProjectionBatch, ...) in chunks of chunk_rows."""
+    columns = batch.columns()
+    attrs = dict(attrs or {}, kind=type(batch).__name__)
+    with ColumnarWriter(path, {name: values.dtype for name, values in columns.items()}, compression, attrs) as writer:
+        for start in range(0, max(len(batch), 1), chunk_rows):
+            writer.append({name: values[start:start + chunk_rows] for name, values in columns.items()})
+
+
+def write_sweep(path, axes, columns, attrs=None, compression=None):
+    """
+    Write a sweep cube: `columns` are flat result columns over the cartesian product of `axes`
+    (as built by sweeps.make_grid), and the axis values are kept in attrs for ColumnarReader.cube.
+    """
+    axes = {name: np.asarray(values).tolist() for name, values in axes.items()}
+    attrs = dict(attrs or {}, kind="sweep", axes=axes)
+    with ColumnarWriter(path, None, compression, attrs) as writer:
+        writer.append(columns)
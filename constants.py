@@ -1,5 +1,18 @@
 INTEREST_DEDUCTION = 36.93  # in percentage
 
+# Maximum mortgage interest deduction rate per tax year (in percentage), phased down since 2020.
+# Years before the first entry use the first rate, years after the last entry use the last rate.
+INTEREST_DEDUCTION_RATES = {
+    2019: 49.0,
+    2020: 46.0,
+    2021: 43.0,
+    2022: 40.0,
+    2023: 36.93,
+    2024: 36.97,
+    2025: 37.48
+}
+MAX_DEDUCTION_YEARS = 30  # interest is deductible for at most 30 years per loan
+
 interest_rates = {
     "Variable": {
         "NHG": 5.25,
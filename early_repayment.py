@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+
+from constants import interest_rates
+from mortgage import MONTHS_IN_YEAR
+from portfolio_stats import RunningMoments, FixedHistogram
+from rate_history import compile_sheet, year_key_indices, portion_key_indices
+
+DEFAULT_PENALTY_EDGES = np.arange(0, 100001, 2500)
+
+
+def current_interest_rates(remaining_months, portions, nhg=None, sheet=interest_rates):
+    """
+    Rates (decimals) a loan would get today for its remaining fixed period: the rate-sheet
+    bucket that find_year_key gives for the remaining period rounded up to whole years, and the
+    loan-to-value bucket of the portion.
+    """
+    years = np.ceil(np.asarray(remaining_months, dtype=np.float64) / MONTHS_IN_YEAR)
+    return compile_sheet(sheet)[year_key_indices(years), portion_key_indices(portions, nhg)] / 100
+
+
+def calculate_penalties(balances, contract_rates, remaining_months, free_allowances=0, current_rates=None,
+                        portions=None, nhg=None):
+    """
+    Early-repayment penalties (boeterente) for arrays of loans.
+
+    The penalty is the present value of the monthly interest the lender loses on the part of the
+    balance above the free-repayment allowance, (contract rate - current rate) / 12 per month,
+    over the remaining fixed months, discounted at the current rate:
+
+        max(balance - free, 0) * max(r_c - r_m, 0) / 12 * (1 - (1 + i) ** -n) / i,  i = r_m / 12
+
+    and n instead of the annuity factor at a 0% current rate. current_rates default to the
+    current rate sheet for the remaining period and the given portions (loan-to-values).
+    """
+    if current_rates is None:
+        if portions is None:
+            raise ValueError("Either current_rates or portions (to look them up) is required.")
+        current_rates = current_interest_rates(remaining_months, portions, nhg)
+
+    balances, contract_rates, remaining_months, free_allowances, current_rates = np.broadcast_arrays(
+        *(np.asarray(value, dtype=np.float64) for value in (balances, contract_rates, remaining_months,
+                                                             free_allowances, current_rates)))
+
+    chargeable = np.maximum(balances - free_allowances, 0.0)
+    monthly_difference = np.maximum(contract_rates - current_rates, 0.0) / MONTHS_IN_YEAR
+    monthly_rate = current_rates / MONTHS_IN_YEAR
+    months = np.maximum(remaining_months, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_factor = -np.expm1(-months * np.log1p(monthly_rate)) / monthly_rate
+
+    return chargeable * monthly_difference * np.where(monthly_rate == 0, months, annuity_factor)
+
+
+def early_repayment_penalty(balance, contract_rate, remaining_months, free_allowance=0, portion=None,
+                            current_rate=None, nhg=False):
+    """Scalar calculate_penalties for one loan."""
+    return float(calculate_penalties(balance, contract_rate, remaining_months, free_allowance, current_rate,
+                                     portion if current_rate is None else None, nhg))
+
+
+def iter_penalty_chunks(balances, contract_rates, remaining_months, free_allowances=0, current_rates=None,
+                        portions=None, nhg=None, chunk_size=100000):
+    """
+    Penalties of a book, one chunk at a time. The inputs can be memory-mapped columns, so only a
+    chunk of inputs and penalties is in memory at once.
+    """
+    if current_rates is None and portions is None:
+        raise ValueError("Either current_rates or portions (to look them up) is required.")
+
+    inputs = {"balances": balances, "contract_rates": contract_rates, "remaining_months": remaining_months,
+              "free_allowances": free_allowances, "current_rates": current_rates, "portions": portions, "nhg": nhg}
+    rows = max(np.size(value) for value in inputs.values() if value is not None)
+
+    def rows_of(value, start, stop):
+        if value is None or np.ndim(value) == 0:
+            return value
+        return value[start:stop]
+
+    for start in range(0, rows, chunk_size):
+        stop = start + chunk_size
+        yield calculate_penalties(**{name: rows_of(value, start, stop) for name, value in inputs.items()})
+
+
+class PenaltySummary:
+    """Streamed statistics of a book's penalties: moments, a histogram and the number of loans charged."""
+    __slots__ = ("moments", "histogram", "charged")
+
+    def __init__(self, edges=DEFAULT_PENALTY_EDGES):
+        self.moments = RunningMoments()
+        self.histogram = FixedHistogram(edges)
+        self.charged = 0
+
+    def update(self, penalties):
+        self.moments.update(penalties)
+        self.histogram.update(penalties)
+        self.charged += int(np.count_nonzero(penalties > 0))
+        return self
+
+    def merge(self, other):
+        self.moments.merge(other.moments)
+        self.histogram.merge(other.histogram)
+        self.charged += other.charged
+        return self
+
+    @property
+    def total(self):
+        return self.moments.total
+
+
+def summarize_penalties(balances, contract_rates, remaining_months, free_allowances=0, current_rates=None,
+                        portions=None, nhg=None, chunk_size=100000, edges=DEFAULT_PENALTY_EDGES):
+    summary = PenaltySummary(edges)
+    for penalties in iter_penalty_chunks(balances, contract_rates, remaining_months, free_allowances, current_rates,
+                                         portions, nhg, chunk_size):
+        summary.update(penalties)
+    return summary
+
+
+if __name__ == "__main__":
+    loans = 1000000
+    rng = np.random.default_rng(0)
+    balances = rng.uniform(50000, 600000, loans)
+    book = {
+        "balances": balances,
+        "contract_rates": np.round(rng.uniform(0.02, 0.065, loans), 4),
+        "remaining_months": rng.integers(1, 241, loans),
+        "free_allowances": 0.1 * balances,
+        "portions": rng.uniform(0.3, 1.0, loans)
+    }
+
+    start = time.perf_counter()
+    summary = summarize_penalties(**book)
+    seconds = time.perf_counter() - start
+    print(f"{loans} loans in {seconds:.2f} s: {summary.charged} charged, total €{summary.total:,.2f}, "
+          f"mean €{summary.moments.mean:,.2f}, max €{summary.moments.maximum:,.2f}")
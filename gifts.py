@@ -1,3 +1,5 @@
+from results import GiftTaxResult
+
 # Constants
 HOME_ACQUISITION_EXEMPTION = 114318
 ANNUAL_PARENTAL_EXEMPTION = 6035
@@ -33,13 +35,19 @@ def gift_tax_net(gift_amount):
     return tax, net
 
 
+def gift_tax_result(gift_amount):
+    tax, net = gift_tax_net(gift_amount)
+
+    return GiftTaxResult(gift_amount, tax, net)
+
+
 def gift_calculations():
     gift_amount = float(input("Enter the gift amount: "))
-    tax, net = gift_tax_net(gift_amount)
+    result = gift_tax_result(gift_amount)
 
-    print(f"\nGift Amount: €{gift_amount:.2f}")
-    print(f"Estimated Gift Tax: €{tax:.2f}")
-    print(f"Net Amount After Tax: €{net:.2f}")
+    print(f"\nGift Amount: €{result.gift_amount:.2f}")
+    print(f"Estimated Gift Tax: €{result.tax:.2f}")
+    print(f"Net Amount After Tax: €{result.net:.2f}")
     print("\n")
 
 
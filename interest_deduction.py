@@ -0,0 +1,122 @@
+import numpy as np
+
+from constants import INTEREST_DEDUCTION_RATES, MAX_DEDUCTION_YEARS
+from mortgage import MONTHS_IN_YEAR
+from schedules import build_schedules
+
+
+class DeductionRateSchedule:
+    """
+    Interest deduction rate per calendar year.
+
+    rates maps a tax year to a percentage, like INTEREST_DEDUCTION_RATES. Years before the first
+    entry use the first rate and years after the last entry keep the last known rate.
+    """
+
+    def __init__(self, rates=None, max_years=MAX_DEDUCTION_YEARS):
+        rates = INTEREST_DEDUCTION_RATES if rates is None else rates
+        if not rates:
+            raise ValueError("A deduction rate schedule needs at least one year.")
+
+        years = sorted(rates)
+        self.years = np.array(years, dtype=np.int64)
+        self.rates = np.array([rates[year] for year in years], dtype=np.float64) / 100
+        self.max_years = max_years
+
+    def rates_for(self, calendar_years):
+        index = np.searchsorted(self.years, np.asarray(calendar_years), side="right") - 1
+        return self.rates[np.clip(index, 0, len(self.rates) - 1)]
+
+    def rate_for(self, calendar_year):
+        return float(self.rates_for(calendar_year))
+
+
+class YearlyDeductions:
+    """
+    Interest and tax return per calendar year.
+
+    The columns are (loans, years) arrays, or 1-D for a single loan, where column j is
+    calendar year first_year + j.
+    """
+    __slots__ = ("first_year", "interest", "deductible_interest", "tax_return")
+
+    def __init__(self, first_year, interest, deductible_interest, tax_return):
+        self.first_year = first_year
+        self.interest = interest
+        self.deductible_interest = deductible_interest
+        self.tax_return = tax_return
+
+    @property
+    def net_interest(self):
+        return self.interest - self.tax_return
+
+    @property
+    def total_tax_return(self):
+        return self.tax_return.sum(axis=-1)
+
+    def calendar_years(self):
+        return np.asarray(self.first_year)[..., None] + np.arange(self.interest.shape[-1])
+
+
+def bucket_by_calendar_year(monthly_amounts, start_months=1):
+    """
+    Sum monthly amounts into calendar-year buckets.
+
+    start_months is the calendar month (1-12) of each loan's first payment. The buckets are read
+    off a single cumulative sum at every year-end month, so the cost does not depend on how many
+    calendar years are involved.
+    """
+    monthly_amounts = np.asarray(monthly_amounts, dtype=np.float64)
+    scalar = monthly_amounts.ndim == 1
+    monthly_amounts = np.atleast_2d(monthly_amounts)
+    loans, months = monthly_amounts.shape
+
+    start_months = np.broadcast_to(np.asarray(start_months, dtype=np.int64), (loans,))
+    if np.any((start_months < 1) | (start_months > 12)):
+        raise ValueError("Invalid start month. Must be between 1 and 12.")
+
+    num_years = -(-(months + int(start_months.max(initial=1)) - 1) // MONTHS_IN_YEAR)
+    cumulative = np.cumsum(monthly_amounts, axis=1)
+
+    year_end = (MONTHS_IN_YEAR - start_months)[:, None] + MONTHS_IN_YEAR * np.arange(num_years)
+    totals = np.take_along_axis(cumulative, np.minimum(year_end, months - 1), axis=1)
+    buckets = np.diff(totals, axis=1, prepend=0.0)
+
+    return buckets[0] if scalar else buckets
+
+
+def calculate_yearly_deductions(monthly_interest, start_years, start_months=1, rate_schedule=None,
+                                deducted_months=0):
+    """
+    Year-by-year tax return on monthly interest.
+
+    Interest is only deductible during the first max_years of the loan; deducted_months lets a
+    loan carry over months already used by a previous loan. Each calendar year's interest is
+    taxed back at that year's deduction rate.
+    """
+    rate_schedule = rate_schedule or DeductionRateSchedule()
+
+    monthly_interest = np.asarray(monthly_interest, dtype=np.float64)
+    scalar = monthly_interest.ndim == 1
+    monthly_interest = np.atleast_2d(monthly_interest)
+    loans, months = monthly_interest.shape
+
+    remaining = rate_schedule.max_years * MONTHS_IN_YEAR - np.broadcast_to(np.asarray(deducted_months), (loans,))
+    deductible = np.where(np.arange(months) < remaining[:, None], monthly_interest, 0.0)
+
+    interest = bucket_by_calendar_year(monthly_interest, start_months)
+    deductible_interest = bucket_by_calendar_year(deductible, start_months)
+
+    start_years = np.broadcast_to(np.asarray(start_years, dtype=np.int64), (loans,))
+    calendar_years = start_years[:, None] + np.arange(interest.shape[1])
+    tax_return = deductible_interest * rate_schedule.rates_for(calendar_years)
+
+    if scalar:
+        return YearlyDeductions(int(start_years[0]), interest[0], deductible_interest[0], tax_return[0])
+    return YearlyDeductions(start_years, interest, deductible_interest, tax_return)
+
+
+def yearly_deductions(kind, mortgage_amounts, interest_rates, years, start_years, start_months=1, rate_schedule=None):
+    schedule = build_schedules(kind, mortgage_amounts, interest_rates, years)
+
+    return calculate_yearly_deductions(schedule.interest, start_years, start_months, rate_schedule)
@@ -1,4 +1,5 @@
 from helper_functions import decimal_to_percentage
+from results import InvestmentProjection
 
 
 def calculate_principal(x, n):
@@ -26,19 +27,25 @@ def calculate_monthly_required_to_reach_z(z, n, g):
     return z / (g * 12 * n)  # 12 because I have 12 months in a year
 
 
+def project_investment(x, y, n):
+    p = calculate_principal(x, n)
+    g = calculate_growth_over_n_years(y, n)  # the growth (in decimal)
+
+    return InvestmentProjection(x, y, n, p, g, p * g)
+
+
 def total_return():
     x = int(input("Annual Principal: "))  # the annual principal
     y = int(input("Annual Yield (percentage): ")) / 100  # the annual yield in percentage (10 means 10%)
     n = int(input("Number of Years: "))  # number of years
 
-    p = calculate_principal(x, n)
-    g = calculate_growth_over_n_years(y, n)  # the growth (in decimal)
-    t = int(p * g)  # for 10% yield and 10 years: x * 1.75
+    projection = project_investment(x, y, n)
+    t = int(projection.total_return)  # for 10% yield and 10 years: x * 1.75
 
     print(f"The total return after {n} years: €{t}")
-    print(f"The total principal after {n} years: €{p}")
-    print(f"The total profit after {n} years: €{int(t - p)}")
-    print(f"The total growth in percentage after {n} years: {decimal_to_percentage(g)}%")
+    print(f"The total principal after {n} years: €{projection.total_principal}")
+    print(f"The total profit after {n} years: €{int(t - projection.total_principal)}")
+    print(f"The total growth in percentage after {n} years: {decimal_to_percentage(projection.growth)}%")
 
     print("\n")
 
@@ -1,5 +1,6 @@
 from constants import interest_rates, INTEREST_DEDUCTION
 from gifts import gift_tax_net
+from results import MortgageQuote
 
 MONTHS_IN_YEAR = 12
 
@@ -38,12 +39,12 @@ def find_year_key(years):
         raise ValueError("Invalid year input. Must be a non-negative number.")
 
 
-def find_interest_rate(years, portion):
+def find_interest_rate(years, portion, rates=interest_rates):
     # Determine the correct portion key
     portion_key = find_portion_key(portion)
     year_key = find_year_key(int(years))
 
-    return interest_rates[year_key][portion_key]
+    return rates[year_key][portion_key]  # rates is the current sheet unless a historical one is passed
 
 
 def calculate_total_linear_interest(mortgage_amount, interest_rate, years):
@@ -83,20 +84,27 @@ def calculate_dutch_linear_mortgage(mortgage_amount, interest_rate, years):
     return initial_monthly_payment, final_monthly_payment, mortgage_amount, total_interest, total_tax_return
 
 
-def linear_mortgage(mortgage_amount, interest_rate, years):
+def quote_linear_mortgage(mortgage_amount, interest_rate, years):
     initial_payment, final_payment, mortgage_amount, total_interest, total_tax_return = calculate_dutch_linear_mortgage(
         mortgage_amount,
         interest_rate,
         years)
 
-    print(f"Initial monthly payment: €{initial_payment:.2f}")
-    print(f"Final monthly payment: €{final_payment:.2f}")
-    print(f"Monthly payment decrease: €{initial_payment - final_payment:.2f}")
-    print(f"Total interest paid : €{total_interest:.2f}")
-    print(f"Total Tax return : €{total_tax_return:.2f}")
-    print(f"Total Interest Net (after Tax return) : €{total_interest - total_tax_return:.2f}")
-    print(f"Total Gross amount paid over {years} years: €{mortgage_amount + total_interest:.2f}")
-    print(f"Total Net amount (after Tax return) paid over {years} years: €{mortgage_amount + total_interest - total_tax_return:.2f}")
+    return MortgageQuote("linear", mortgage_amount, interest_rate, years, initial_payment, final_payment,
+                         total_interest, total_tax_return, mortgage_amount + total_interest)
+
+
+def linear_mortgage(mortgage_amount, interest_rate, years):
+    quote = quote_linear_mortgage(mortgage_amount, interest_rate, years)
+
+    print(f"Initial monthly payment: €{quote.initial_payment:.2f}")
+    print(f"Final monthly payment: €{quote.final_payment:.2f}")
+    print(f"Monthly payment decrease: €{quote.payment_decrease:.2f}")
+    print(f"Total interest paid : €{quote.total_interest:.2f}")
+    print(f"Total Tax return : €{quote.total_tax_return:.2f}")
+    print(f"Total Interest Net (after Tax return) : €{quote.net_interest:.2f}")
+    print(f"Total Gross amount paid over {years} years: €{quote.total_paid:.2f}")
+    print(f"Total Net amount (after Tax return) paid over {years} years: €{quote.total_net_paid:.2f}")
 
 
 def calculate_annuity_mortgage_payment(principal, interest_rate, years):
@@ -127,19 +135,68 @@ def calculate_total_annuity_interest(total_paid, monthly_principal, mortgage_amo
     return total_interest, total_tax_return
 
 
-def annuity_mortgage(mortgage_amount, interest_rate, years):
+def quote_annuity_mortgage(mortgage_amount, interest_rate, years):
     monthly_payment = calculate_annuity_mortgage_payment(mortgage_amount, interest_rate, years)
-    print(
-        f"Monthly payment for a €{mortgage_amount} loan at {round(interest_rate * 100, 2)}% for {years} years: €{monthly_payment:.2f}")
 
     # Calculate total amount paid over the life of the loan
     total_paid = monthly_payment * years * MONTHS_IN_YEAR
     total_interest, total_tax_return = calculate_total_annuity_interest(total_paid, monthly_payment, mortgage_amount, interest_rate, years)
-    print(f"Total interest paid: €{total_interest:.2f}")
-    print(f"Total Tax return : €{total_tax_return:.2f}")
-    print(f"Total Interest Net (after Tax return) : €{total_interest - total_tax_return:.2f}")
-    print(f"Total Gross amount paid over {years} years: €{total_paid:.2f}")
-    print(f"Total Net amount (after Tax return) paid over {years} years: €{total_paid - total_tax_return:.2f}")
+
+    return MortgageQuote("annuity", mortgage_amount, interest_rate, years, monthly_payment, monthly_payment,
+                         total_interest, total_tax_return, total_paid)
+
+
+def annuity_mortgage(mortgage_amount, interest_rate, years):
+    quote = quote_annuity_mortgage(mortgage_amount, interest_rate, years)
+    print(
+        f"Monthly payment for a €{mortgage_amount} loan at {round(interest_rate * 100, 2)}% for {years} years: €{quote.initial_payment:.2f}")
+
+    print(f"Total interest paid: €{quote.total_interest:.2f}")
+    print(f"Total Tax return : €{quote.total_tax_return:.2f}")
+    print(f"Total Interest Net (after Tax return) : €{quote.net_interest:.2f}")
+    print(f"Total Gross amount paid over {years} years: €{quote.total_paid:.2f}")
+    print(f"Total Net amount (after Tax return) paid over {years} years: €{quote.total_net_paid:.2f}")
+
+
+def calculate_interest_only_mortgage(mortgage_amount, interest_rate, years):
+    # Only interest is paid every month; the full amount is repaid with the final payment
+    monthly_interest = mortgage_amount * interest_rate / MONTHS_IN_YEAR
+    total_interest = monthly_interest * years * MONTHS_IN_YEAR
+
+    return monthly_interest, total_interest, total_interest * (INTEREST_DEDUCTION / 100)
+
+
+def quote_interest_only_mortgage(mortgage_amount, interest_rate, years):
+    monthly_interest, total_interest, total_tax_return = calculate_interest_only_mortgage(mortgage_amount,
+                                                                                          interest_rate, years)
+
+    return MortgageQuote("interest_only", mortgage_amount, interest_rate, years, monthly_interest, monthly_interest,
+                         total_interest, total_tax_return, mortgage_amount + total_interest)
+
+
+def calculate_bank_savings_deposit(mortgage_amount, interest_rate, years):
+    """
+    Monthly deposit into the savings account of a bank-savings (bankspaar) mortgage.
+
+    The loan itself is interest-only; the deposits earn the mortgage rate and grow to exactly the
+    loan amount by the end of the term: D * ((1 + i) ** n - 1) / i = amount.
+    """
+    monthly_rate = interest_rate / MONTHS_IN_YEAR
+    num_payments = years * MONTHS_IN_YEAR
+
+    if monthly_rate == 0:
+        return mortgage_amount / num_payments
+    return mortgage_amount * monthly_rate / ((1 + monthly_rate) ** num_payments - 1)
+
+
+def quote_bank_savings_mortgage(mortgage_amount, interest_rate, years):
+    monthly_interest, total_interest, total_tax_return = calculate_interest_only_mortgage(mortgage_amount,
+                                                                                          interest_rate, years)
+    monthly_payment = monthly_interest + calculate_bank_savings_deposit(mortgage_amount, interest_rate, years)
+
+    # The interest earned on the savings repays part of the loan, so less than amount + interest is paid
+    return MortgageQuote("bank_savings", mortgage_amount, interest_rate, years, monthly_payment, monthly_payment,
+                         total_interest, total_tax_return, monthly_payment * years * MONTHS_IN_YEAR)
 
 
 def mortgage():
@@ -0,0 +1,174 @@
+import numpy as np
+
+from constants import INTEREST_DEDUCTION
+from mortgage import MONTHS_IN_YEAR, find_interest_rate, quote_linear_mortgage, quote_annuity_mortgage, \
+    quote_interest_only_mortgage
+from schedules import Schedule, SCHEDULE_ENGINES, build_schedules
+
+
+class LoanPart:
+    """
+    One part (leningdeel) of a mortgage.
+
+    interest_rate is a decimal; when it is None the rate is looked up for the part's fixed period
+    and the loan-to-value bucket of the whole mortgage. start_month lets a part start later than
+    the others, e.g. an extra part taken for a renovation.
+    """
+    __slots__ = ("kind", "amount", "years", "fixed_years", "interest_rate", "start_month")
+
+    def __init__(self, kind, amount, years=30, fixed_years=10, interest_rate=None, start_month=0):
+        if kind not in SCHEDULE_ENGINES:
+            raise ValueError(f"Invalid mortgage kind '{kind}'. Must be one of: {', '.join(SCHEDULE_ENGINES)}.")
+        if start_month < 0:
+            raise ValueError("start_month must be a non-negative number of months.")
+
+        self.kind = kind
+        self.amount = amount
+        self.years = years
+        self.fixed_years = fixed_years
+        self.interest_rate = interest_rate
+        self.start_month = start_month
+
+    def __repr__(self):
+        return (f"LoanPart({self.kind!r}, {self.amount!r}, years={self.years!r}, fixed_years={self.fixed_years!r}, "
+                f"interest_rate={self.interest_rate!r}, start_month={self.start_month!r})")
+
+
+PART_ENGINES = {
+    "linear": quote_linear_mortgage,
+    "annuity": quote_annuity_mortgage,
+    "interest_only": quote_interest_only_mortgage
+}
+
+
+class MultiPartMortgage:
+    """
+    A mortgage made of several LoanParts secured on one house.
+
+    house_price is only needed for parts without an explicit interest rate; nhg prices those
+    parts in the NHG bucket instead of by loan-to-value.
+    """
+
+    def __init__(self, parts, house_price=None, nhg=False):
+        if not parts:
+            raise ValueError("A mortgage needs at least one loan part.")
+
+        self.parts = list(parts)
+        self.house_price = house_price
+        self.nhg = nhg
+
+    @property
+    def total_amount(self):
+        return sum(part.amount for part in self.parts)
+
+    def portion(self):
+        if self.nhg:
+            return "NHG"
+        if self.house_price is None:
+            raise ValueError("house_price is required to look up interest rates by loan-to-value.")
+        return self.total_amount / self.house_price
+
+    def part_rates(self):
+        rates = []
+        for part in self.parts:
+            if part.interest_rate is None:
+                rates.append(round(find_interest_rate(part.fixed_years, self.portion()) / 100, 4))
+            else:
+                rates.append(part.interest_rate)
+        return rates
+
+    def quotes(self):
+        return [PART_ENGINES[part.kind](part.amount, rate, part.years)
+                for part, rate in zip(self.parts, self.part_rates())]
+
+    def schedule(self):
+        return price_portfolio([self])[0]
+
+
+def _portfolio_parts(mortgages):
+    """The parts of all mortgages as columns: kind, amount, rate, years, start month and owning mortgage."""
+    kinds, amounts, rates, years, starts, owners = [], [], [], [], [], []
+    for owner, mortgage in enumerate(mortgages):
+        for part, rate in zip(mortgage.parts, mortgage.part_rates()):
+            kinds.append(part.kind)
+            amounts.append(part.amount)
+            rates.append(rate)
+            years.append(part.years)
+            starts.append(part.start_month)
+            owners.append(owner)
+
+    return (np.array(kinds), np.array(amounts, dtype=np.float64), np.array(rates, dtype=np.float64),
+            np.array(years, dtype=np.float64), np.array(starts, dtype=np.int64), np.array(owners, dtype=np.int64))
+
+
+def _priced_parts(kinds, amounts, rates, years, chunk_size, months=None):
+    """Schedules of the parts, per repayment kind and chunk_size parts at a time, with the indices of those parts."""
+    for kind in SCHEDULE_ENGINES:
+        selected = np.flatnonzero(kinds == kind)
+        for start in range(0, len(selected), chunk_size):
+            parts = selected[start:start + chunk_size]
+            yield parts, build_schedules(kind, amounts[parts], rates[parts], years[parts], months)
+
+
+def price_portfolio(mortgages, chunk_size=1024):
+    """
+    Combined monthly schedules of a portfolio of MultiPartMortgages.
+
+    Parts are priced per repayment kind, chunk_size at a time, and summed into a (mortgages,
+    months) schedule at their start month with np.bincount over the flattened (mortgage, month)
+    index, so no Python loop runs over months or over single parts. Use price_portfolio_totals
+    when only the totals are needed: it never builds the monthly matrix.
+    """
+    mortgages = list(mortgages)
+    kinds, amounts, rates, years, starts, owners = _portfolio_parts(mortgages)
+
+    part_months = int((years * MONTHS_IN_YEAR).round().max(initial=0))
+    total_months = int((starts + (years * MONTHS_IN_YEAR).round().astype(np.int64)).max(initial=0))
+    combined = Schedule(*(np.zeros((len(mortgages), total_months)) for _ in Schedule.__slots__))
+    if not total_months:
+        return combined
+
+    offsets = np.arange(part_months)
+    for parts, part_schedules in _priced_parts(kinds, amounts, rates, years, chunk_size, part_months):
+        # Parts are in mortgage order, so a chunk only touches the rows first..last. Its padding past
+        # total_months is all zeros and can safely land in the last month.
+        first, last = owners[parts[0]], owners[parts[-1]] + 1
+        columns = np.minimum(starts[parts][:, None] + offsets, total_months - 1)
+        cell = ((owners[parts] - first)[:, None] * total_months + columns).reshape(-1)
+
+        for name in Schedule.__slots__:
+            getattr(combined, name)[first:last] += np.bincount(
+                cell, weights=getattr(part_schedules, name).reshape(-1),
+                minlength=(last - first) * total_months).reshape(last - first, total_months)
+
+    # A part that has not started yet is not outstanding, and a repaid part stays at zero,
+    # so the summed balance is exactly the combined outstanding debt per month.
+    return combined
+
+
+def price_portfolio_totals(mortgages, chunk_size=1024):
+    """
+    First payment, total interest, tax return and total paid per mortgage of a portfolio.
+
+    The totals of a combined schedule are the sums of its parts' totals, so parts are priced
+    chunk_size at a time and their totals summed per mortgage with np.bincount: memory depends
+    on chunk_size and the longest term, not on the size of the portfolio.
+    """
+    mortgages = list(mortgages)
+    kinds, amounts, rates, years, starts, owners = _portfolio_parts(mortgages)
+    totals = {name: np.zeros(len(mortgages)) for name in ("first_payment", "total_interest", "total_paid")}
+
+    for parts, part_schedules in _priced_parts(kinds, amounts, rates, years, chunk_size):
+        # Only parts that start right away pay in the first month
+        first = part_schedules.payment[:, 0] * (starts[parts] == 0) if part_schedules.months else 0.0
+        for name, values in (("first_payment", first), ("total_interest", part_schedules.total_interest),
+                             ("total_paid", part_schedules.total_paid)):
+            totals[name] += np.bincount(owners[parts], weights=np.broadcast_to(values, parts.shape),
+                                        minlength=len(mortgages))
+
+    return {
+        "first_payment": totals["first_payment"],
+        "total_interest": totals["total_interest"],
+        "total_tax_return": totals["total_interest"] * (INTEREST_DEDUCTION / 100),
+        "total_paid": totals["total_paid"]
+    }
@@ -0,0 +1,244 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from batch_results import MORTGAGE_QUOTE_ENGINES
+
+# Monthly payment, total interest and tax return, each with fixed histogram bins in euros
+DEFAULT_METRICS = {
+    "monthly_payment": np.arange(0, 10001, 250),
+    "total_interest": np.arange(0, 1000001, 25000),
+    "total_tax_return": np.arange(0, 400001, 10000)
+}
+
+
+class RunningMoments:
+    """
+    Count, total, mean, variance, min and max of a stream of values.
+
+    Chunks are folded in with the parallel form of Welford's algorithm (Chan et al.), so two
+    accumulators built on different chunks or workers merge into exactly what one accumulator
+    over all values would hold, without keeping the values.
+    """
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if not len(values):
+            return
+
+        chunk = RunningMoments()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(np.square(values - chunk.mean).sum())
+        chunk.minimum = float(values.min())
+        chunk.maximum = float(values.max())
+        self.merge(chunk)
+
+    def merge(self, other):
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def total(self):
+        return self.mean * self.count
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else float("nan")
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class FixedHistogram:
+    """Counts per fixed bin, plus values below the first edge and at or above the last edge."""
+    __slots__ = ("edges", "counts", "underflow", "overflow")
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        if len(self.edges) < 2 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("Histogram edges must be increasing and contain at least two values.")
+
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).reshape(-1)
+        # bins are [edge_i, edge_i+1), so the last edge itself counts as overflow
+        index = np.searchsorted(self.edges, values, side="right") - 1
+        self.underflow += int(np.count_nonzero(index < 0))
+        self.overflow += int(np.count_nonzero(index >= len(self.counts)))
+        inside = (index >= 0) & (index < len(self.counts))
+        self.counts += np.bincount(index[inside], minlength=len(self.counts))
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only histograms with the same edges can be merged.")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+    @property
+    def total(self):
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+def _metric_values(batch):
+    return {
+        "monthly_payment": batch.initial_payment,
+        "total_interest": batch.total_interest,
+        "total_tax_return": batch.total_tax_return
+    }
+
+
+class PortfolioAggregator:
+    """
+    Mergeable moments and histograms of monthly payment, total interest and tax return.
+
+    consume() takes one MortgageQuoteBatch at a time; memory depends on the number of histogram
+    bins, not on the number of loans seen.
+    """
+
+    def __init__(self, metrics=None):
+        metrics = DEFAULT_METRICS if metrics is None else metrics
+        self.moments = {name: RunningMoments() for name in metrics}
+        self.histograms = {name: FixedHistogram(edges) for name, edges in metrics.items()}
+
+    def consume(self, batch):
+        values = _metric_values(batch)
+        for name in self.moments:
+            self.moments[name].update(values[name])
+            self.histograms[name].update(values[name])
+        return self
+
+    def merge(self, other):
+        for name in self.moments:
+            self.moments[name].merge(other.moments[name])
+            self.histograms[name].merge(other.histograms[name])
+        return self
+
+    @property
+    def count(self):
+        return next(iter(self.moments.values())).count
+
+    def summary(self):
+        return {name: {"count": moments.count, "total": moments.total, "mean": moments.mean, "std": moments.std,
+                       "min": moments.minimum, "max": moments.maximum}
+                for name, moments in self.moments.items()}
+
+
+def iter_quote_chunks(kind, mortgage_amounts, interest_rates, years, chunk_size=100000):
+    """
+    Price a book chunk by chunk. The inputs can be memory-mapped columns, so only one chunk of
+    inputs and results is in memory at a time.
+    """
+    if kind not in MORTGAGE_QUOTE_ENGINES:
+        raise ValueError(f"Invalid mortgage kind '{kind}'. Must be one of: {', '.join(MORTGAGE_QUOTE_ENGINES)}.")
+
+    mortgage_amounts, interest_rates, years = np.broadcast_arrays(mortgage_amounts, interest_rates, years)
+    for start in range(0, len(mortgage_amounts), chunk_size):
+        stop = start + chunk_size
+        yield MORTGAGE_QUOTE_ENGINES[kind](mortgage_amounts[start:stop], interest_rates[start:stop], years[start:stop])
+
+
+def aggregate_portfolio(batches, metrics=None):
+    aggregator = PortfolioAggregator(metrics)
+    for batch in batches:
+        aggregator.consume(batch)
+    return aggregator
+
+
+def _chunk_source(values, start, stop):
+    """
+    What a worker needs for rows start:stop of an input: a scalar as is, a memory-mapped column as
+    (path, dtype, offset, rows) to map itself, and anything else as the rows themselves.
+    """
+    if np.ndim(values) == 0:
+        return values
+    if isinstance(values, np.memmap) and isinstance(values.base, mmap.mmap) and values.ndim == 1:
+        return values.filename, values.dtype.str, values.offset + start * values.dtype.itemsize, \
+            len(values[start:stop])
+    return np.asarray(values[start:stop])
+
+
+def _load_chunk(source):
+    if isinstance(source, tuple):
+        path, dtype, offset, rows = source
+        return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(rows,))
+    return source
+
+
+def _aggregate_chunk(kind, sources, metrics):
+    batch = MORTGAGE_QUOTE_ENGINES[kind](*np.broadcast_arrays(*(_load_chunk(source) for source in sources)))
+    return PortfolioAggregator(metrics).consume(batch)
+
+
+def aggregate_in_parallel(kind, mortgage_amounts, interest_rates, years, workers=None, chunk_size=100000,
+                          metrics=None):
+    """
+    Aggregate a book over a process pool: workers price one chunk at a time and only its accumulators come back.
+
+    Memory-mapped columns (such as ColumnarReader columns) reach the workers as a file range they
+    map themselves, other arrays as the rows of one chunk. At most two chunks per worker are in
+    flight, so memory stays bounded by chunk_size and workers whatever the size of the book.
+    """
+    if kind not in MORTGAGE_QUOTE_ENGINES:
+        raise ValueError(f"Invalid mortgage kind '{kind}'. Must be one of: {', '.join(MORTGAGE_QUOTE_ENGINES)}.")
+
+    columns = (mortgage_amounts, interest_rates, years)
+    shape = np.broadcast_shapes(*(np.shape(column) for column in columns))
+    if len(shape) != 1:
+        raise ValueError("The book must be one-dimensional columns or scalars.")
+    rows = shape[0]
+    workers = workers or os.cpu_count() or 1
+
+    aggregator = PortfolioAggregator(metrics)
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for start in range(0, rows, chunk_size):
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    aggregator.merge(future.result())
+            stop = min(start + chunk_size, rows)
+            sources = [_chunk_source(column, start, stop) for column in columns]
+            pending.add(pool.submit(_aggregate_chunk, kind, sources, metrics))
+
+        for future in pending:
+            aggregator.merge(future.result())
+
+    return aggregator
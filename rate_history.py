@@ -0,0 +1,114 @@
+import bisect
+import datetime
+
+import numpy as np
+
+from constants import interest_rates
+from mortgage import find_interest_rate
+
+YEAR_KEYS = ("Variable", "5", "10", "15", "20", "30")
+PORTION_KEYS = ("NHG", "≤65%", "≤85%", "≤90%", ">90%")
+_YEAR_EDGES = np.array([1, 5, 10, 15, 20])  # upper bounds of the find_year_key buckets
+_PORTION_EDGES = np.array([0.65, 0.85, 0.90])  # upper bounds of the find_portion_key buckets
+
+
+def year_key_indices(years):
+    """Vectorized find_year_key(int(years)): index into YEAR_KEYS for every duration."""
+    years = np.trunc(np.asarray(years, dtype=np.float64))
+    return np.searchsorted(_YEAR_EDGES, years, side="left")
+
+
+def portion_key_indices(portions, nhg=None):
+    """
+    Vectorized find_portion_key: index into PORTION_KEYS for every loan-to-value.
+
+    NHG loans are marked either with the string "NHG" in an object array, or with a boolean nhg mask.
+    """
+    portions = np.asarray(portions)
+    if portions.dtype == object or portions.dtype.kind in "US":
+        string_nhg = portions == "NHG"
+        portions = np.where(string_nhg, 1.0, portions.astype(object)).astype(np.float64)
+        nhg = string_nhg if nhg is None else (np.asarray(nhg, dtype=bool) | string_nhg)
+    else:
+        portions = portions.astype(np.float64)
+
+    nhg = np.zeros(portions.shape, dtype=bool) if nhg is None else np.broadcast_to(np.asarray(nhg, dtype=bool),
+                                                                                      portions.shape)
+    invalid = ~nhg & ~((portions > 0) & (portions <= 1.0))
+    if np.any(invalid):
+        raise ValueError("Invalid portion input. Must be 'NHG' or a float between 0 and 1.")
+
+    return np.where(nhg, 0, 1 + np.searchsorted(_PORTION_EDGES, portions, side="left"))
+
+
+def compile_sheet(sheet):
+    """A rate sheet as a (len(YEAR_KEYS), len(PORTION_KEYS)) array, in the order of the key tuples."""
+    return np.array([[sheet[year_key][portion_key] for portion_key in PORTION_KEYS] for year_key in YEAR_KEYS],
+                    dtype=np.float64)
+
+
+def _day_numbers(dates):
+    return np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+
+
+class RateSheetHistory:
+    """
+    Rate sheets indexed by the date they became effective.
+
+    The sheet in force on a date is the last one effective on or before it. Single lookups bisect
+    the sorted effective dates; rates_as_of resolves a whole batch of (date, duration, LTV) queries
+    with np.searchsorted over the dates and a gather from the compiled sheets.
+    """
+
+    def __init__(self, sheets=()):
+        self._dates = []
+        self._sheets = []
+        self._table = np.empty((0, len(YEAR_KEYS), len(PORTION_KEYS)))
+        for effective_from, sheet in sheets:
+            self.add(effective_from, sheet)
+
+    @classmethod
+    def from_current(cls, effective_from=datetime.date.min):
+        return cls([(effective_from, interest_rates)])
+
+    def add(self, effective_from, sheet):
+        day = int(_day_numbers(effective_from))
+        index = bisect.bisect_left(self._dates, day)
+        if index < len(self._dates) and self._dates[index] == day:
+            raise ValueError(f"A rate sheet effective from {effective_from} already exists.")
+
+        self._dates.insert(index, day)
+        self._sheets.insert(index, sheet)
+        self._table = np.insert(self._table, index, compile_sheet(sheet), axis=0)
+
+    def __len__(self):
+        return len(self._sheets)
+
+    @property
+    def effective_dates(self):
+        return np.array(self._dates, dtype="datetime64[D]")
+
+    def _index_as_of(self, date):
+        index = bisect.bisect_right(self._dates, int(_day_numbers(date))) - 1
+        if index < 0:
+            raise ValueError(f"No rate sheet is effective on {date}.")
+        return index
+
+    def sheet_as_of(self, date):
+        return self._sheets[self._index_as_of(date)]
+
+    def find_interest_rate(self, date, years, portion):
+        return find_interest_rate(years, portion, rates=self.sheet_as_of(date))
+
+    def rates_as_of(self, dates, years, portions, nhg=None):
+        """Interest rates (in percentage) for arrays of quote dates, durations and loan-to-values."""
+        sheet_indices = np.searchsorted(np.array(self._dates, dtype=np.int64), _day_numbers(dates), side="right") - 1
+        if np.any(sheet_indices < 0):
+            raise ValueError("Some quote dates are before the first rate sheet.")
+
+        year_indices = year_key_indices(years)
+        portion_indices = portion_key_indices(portions, nhg)
+        sheet_indices, year_indices, portion_indices = np.broadcast_arrays(sheet_indices, year_indices,
+                                                                           portion_indices)
+
+        return self._table[sheet_indices, year_indices, portion_indices]
@@ -0,0 +1,110 @@
+from functools import lru_cache
+
+import numpy as np
+
+from constants import INTEREST_DEDUCTION
+from investments import calculate_growth_over_n_years, calculate_monthly_required_to_reach_z
+from mortgage import MONTHS_IN_YEAR
+from results import InvestmentProjection
+from schedules import build_schedules
+
+
+class DiscountCurve:
+    """
+    Annual inflation or discount rates (decimals) by year: rates[0] applies during year 1,
+    rates[1] during year 2, and the last rate continues after the end of the list.
+    """
+    __slots__ = ("rates",)
+
+    def __init__(self, rates):
+        rates = tuple(float(rate) for rate in np.atleast_1d(rates))
+        if not rates:
+            raise ValueError("A discount curve needs at least one rate.")
+        if any(rate <= -1 for rate in rates):
+            raise ValueError("Discount rates must be greater than -100%.")
+        object.__setattr__(self, "rates", rates)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("DiscountCurve is immutable")
+
+    def __eq__(self, other):
+        return isinstance(other, DiscountCurve) and other.rates == self.rates
+
+    def __hash__(self):
+        return hash(self.rates)
+
+    def __repr__(self):
+        return f"DiscountCurve({list(self.rates)!r})"
+
+    def factors(self, months):
+        return discount_factors(self.rates, months)
+
+    def factor(self, years):
+        """Discount factor at the end of `years` years (array-friendly, whole months)."""
+        months = np.rint(np.asarray(years, dtype=np.float64) * MONTHS_IN_YEAR).astype(np.int64)
+        table = np.concatenate(([1.0], self.factors(int(months.max(initial=0)))))
+        return table[months]
+
+
+def _as_curve(curve):
+    return curve if isinstance(curve, DiscountCurve) else DiscountCurve(curve)
+
+
+@lru_cache(maxsize=64)
+def discount_factors(rates, months):
+    """
+    Discount factor at the end of each month 1..months for a tuple of annual rates, computed once
+    per (curve, length) and cached as a read-only array.
+    """
+    year_of_month = np.minimum(np.arange(months) // MONTHS_IN_YEAR, len(rates) - 1)
+    monthly_growth = (1 + np.asarray(rates)[year_of_month]) ** (1 / MONTHS_IN_YEAR)
+    factors = np.cumprod(1 / monthly_growth)
+    factors.flags.writeable = False
+    return factors
+
+
+def present_value(cash_flows, curve):
+    """
+    Present value of monthly cash flows (months on the last axis, first month paid at the end of
+    month 1): one dot product with the cached factors, for a single schedule or a whole portfolio.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    return cash_flows @ _as_curve(curve).factors(cash_flows.shape[-1])
+
+
+def to_real(amounts, years, curve):
+    """Nominal amounts paid after `years` expressed in today's euros."""
+    return np.asarray(amounts, dtype=np.float64) * _as_curve(curve).factor(years)
+
+
+def real_investment_projection(x, y, n, curve):
+    """
+    project_investment in today's euros: the final value is deflated over n years and each
+    annual contribution (made at the start of its year) is deflated to when it is paid in.
+    growth is then the real total return divided by the real principal.
+    """
+    curve = _as_curve(curve)
+    nominal_total_return = x * n * calculate_growth_over_n_years(y, n)
+    total_return = float(to_real(nominal_total_return, n, curve))
+    total_principal = float(np.sum(to_real(x, np.arange(n), curve)))
+
+    return InvestmentProjection(x, y, n, total_principal, total_return / total_principal, total_return)
+
+
+def real_monthly_required_to_reach_z(z, y, n, curve):
+    """find_how_much_to_invest for a target z in today's euros: the target is inflated to year n first."""
+    nominal_target = z / float(_as_curve(curve).factor(n))
+    return calculate_monthly_required_to_reach_z(nominal_target, n, calculate_growth_over_n_years(y, n))
+
+
+def mortgage_present_values(kind, mortgage_amounts, interest_rates, years, curve, deduction=INTEREST_DEDUCTION):
+    """
+    Present value of the payments, the tax return and the net payments of mortgages, from their
+    monthly schedules. Works on single loans or arrays of loans.
+    """
+    schedule = build_schedules(kind, mortgage_amounts, interest_rates, years)
+    factors = _as_curve(curve).factors(schedule.months)
+
+    payments = schedule.payment @ factors
+    tax_return = (schedule.interest @ factors) * (deduction / 100)
+    return {"payments": payments, "tax_return": tax_return, "net_payments": payments - tax_return}
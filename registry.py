@@ -0,0 +1,69 @@
+class Calculator:
+    """A menu entry: its label and the "module:function" that runs it, imported on first use."""
+    __slots__ = ("key", "label", "target", "_function")
+
+    def __init__(self, key, label, target):
+        module, _, function = target.partition(":")
+        if not module or not function:
+            raise ValueError(f"Invalid calculator target '{target}'. Must be 'module:function'.")
+
+        self.key = key
+        self.label = label
+        self.target = target
+        self._function = None
+
+    @property
+    def loaded(self):
+        return self._function is not None
+
+    def load(self):
+        if self._function is None:
+            module, _, function = self.target.partition(":")
+            # __import__ rather than importlib.import_module, so -X importtime reports the module
+            self._function = getattr(__import__(module, fromlist=[function]), function)
+        return self._function
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+
+class CalculatorRegistry:
+    """
+    Calculators declared by key, in menu order.
+
+    Registering only stores the target name, so building the menu imports nothing; a
+    calculator's module (and whatever it depends on) is imported the first time it is chosen.
+    """
+
+    def __init__(self):
+        self._calculators = {}
+
+    def register(self, key, label, target):
+        if key in self._calculators:
+            raise ValueError(f"A calculator is already registered under '{key}'.")
+        self._calculators[key] = Calculator(key, label, target)
+        return self._calculators[key]
+
+    def __contains__(self, key):
+        return key in self._calculators
+
+    def __getitem__(self, key):
+        return self._calculators[key]
+
+    def __iter__(self):
+        return iter(self._calculators.values())
+
+    def __len__(self):
+        return len(self._calculators)
+
+    def load(self, key):
+        return self._calculators[key].load()
+
+
+CALCULATORS = CalculatorRegistry()
+CALCULATORS.register("1", "Calculate return given annual principal, annual yield and number of years",
+                     "investments:total_return")
+CALCULATORS.register("2", "Calculate the required monthly invested to reach your desired amount, "
+                          "given the annual yield and number of years", "investments:find_how_much_to_invest")
+CALCULATORS.register("3", "Gift calculations", "gifts:gift_calculations")
+CALCULATORS.register("4", "Mortgage calculations", "mortgage:mortgage")
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import time
+
+import constants
+import gifts
+
+_MISSING = object()
+_MAX_VARIABLES = 500  # keys per IN (...) query, well below SQLite's variable limit
+
+
+def rate_table_version():
+    """
+    Short fingerprint of every table the calculators read: the interest rate sheet, the deduction
+    rates and the gift tax brackets. Changing any of them changes the version, so cached results
+    computed against an older table are never returned.
+    """
+    tables = {
+        "interest_rates": constants.interest_rates,
+        "interest_deduction": constants.INTEREST_DEDUCTION,
+        "interest_deduction_rates": {str(year): rate for year, rate in constants.INTEREST_DEDUCTION_RATES.items()},
+        "max_deduction_years": constants.MAX_DEDUCTION_YEARS,
+        "gift_tax": [gifts.HOME_ACQUISITION_EXEMPTION, gifts.ANNUAL_PARENTAL_EXEMPTION, gifts.FIRST_BRACKET_LIMIT,
+                     gifts.FIRST_BRACKET_RATE, gifts.SECOND_BRACKET_RATE]
+    }
+    payload = json.dumps(tables, sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if hasattr(value, "item") and not hasattr(value, "__len__"):  # NumPy scalar
+        return _normalize(value.item())
+    if isinstance(value, (int, float)):
+        return float(value)  # 200000 and 200000.0 are the same input
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in sorted(value.items())}
+    raise TypeError(f"Cannot build a cache key from a {type(value).__name__}")
+
+
+def cache_key(calculator, args, version=None):
+    payload = json.dumps([calculator, _normalize(list(args)), version or rate_table_version()],
+                         sort_keys=True, ensure_ascii=False)
+
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of calculator results shared by every process that opens the same file.
+
+    Entries are keyed by cache_key(calculator, inputs, rate table version) and stored as pickles
+    in SQLite. WAL journaling lets readers proceed while another process writes, and writers wait
+    up to `timeout` seconds for each other. When max_bytes is set, the least recently used
+    entries are evicted after every write that takes the cache over the limit.
+
+    Reads run in deferred (read-only) transactions. Their access times are recorded afterwards
+    in a separate write that is skipped when another process holds the write lock, so a busy
+    writer can make the LRU order slightly stale but never blocks or fails a read.
+    """
+
+    def __init__(self, path, max_bytes=None, version=None, timeout=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version or rate_table_version()
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._pid = None
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _process_connection(self):
+        # SQLite connections must not cross a fork, so every process opens its own
+        if self._connection is None or self._pid != os.getpid():
+            self._connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._pid = os.getpid()
+        return self._connection
+
+    def _connect(self, mode="IMMEDIATE"):
+        return _Transaction(self._process_connection(), mode)
+
+    def close(self):
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        return state
+
+    def key(self, calculator, *args):
+        return cache_key(calculator, args, self.version)
+
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        with self._connect("DEFERRED") as connection:
+            for start in range(0, len(keys), _MAX_VARIABLES):
+                chunk = keys[start:start + _MAX_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
+                rows = connection.execute(
+                    f"SELECT key, value FROM entries WHERE key IN ({placeholders})", chunk).fetchall()
+                found.update((key, pickle.loads(value)) for key, value in rows)
+
+        if found:
+            self._touch(found)
+
+        self.hits += len(found)
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    def _touch(self, keys):
+        """Best-effort update of access times: gives up at once if the write lock is taken."""
+        connection = self._process_connection()
+        connection.execute("PRAGMA busy_timeout = 0")
+        try:
+            with _Transaction(connection, "IMMEDIATE"):
+                now = time.time()
+                connection.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(now, key) for key in keys])
+        except sqlite3.OperationalError:
+            pass  # locked by a writer; the entries keep their previous access time
+        finally:
+            connection.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def put_many(self, items):
+        now = time.time()
+        rows = []
+        for key, value in dict(items).items():
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((key, blob, len(blob), now))
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed) VALUES (?, ?, ?, ?)", rows)
+            if self.max_bytes is not None:
+                self._evict(connection)
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def _evict(self, connection):
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        excess = total - self.max_bytes
+        if excess <= 0:
+            return
+
+        doomed = []
+        for key, size in connection.execute("SELECT key, size FROM entries ORDER BY accessed, key"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        connection.executemany("DELETE FROM entries WHERE key = ?", doomed)
+
+    def get_or_compute(self, calculator, function, *args):
+        key = self.key(calculator, *args)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = function(*args)
+            self.put(key, value)
+        return value
+
+    def map(self, calculator, function, inputs):
+        """
+        Cached results for a batch of argument tuples, in order.
+
+        Cached results are fetched in bulk. `function` is then called once with the list of
+        missing argument tuples, and must return their results in the same order, so a
+        vectorized calculator can fill all the misses at once.
+        """
+        inputs = [tuple(args) for args in inputs]
+        keys = [self.key(calculator, *args) for args in inputs]
+        found = self.get_many(keys)
+
+        missing = {}
+        for key, args in zip(keys, inputs):
+            if key not in found:
+                missing.setdefault(key, args)
+
+        if missing:
+            computed = dict(zip(missing, function(list(missing.values()))))
+            self.put_many(computed.items())
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def cached(self, calculator):
+        def decorator(function):
+            def wrapper(*args):
+                return self.get_or_compute(calculator, function, *args)
+            wrapper.__name__ = function.__name__
+            wrapper.__doc__ = function.__doc__
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._connect("DEFERRED") as connection:
+            entries, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": entries, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._connect() as connection:
+            connection.execute("DELETE FROM entries")
+
+
+class _Transaction:
+    """
+    Runs a block inside BEGIN IMMEDIATE ... COMMIT (or BEGIN DEFERRED for reads, which do not take
+    the write lock), rolling back on errors.
+    """
+
+    def __init__(self, connection, mode="IMMEDIATE"):
+        self.connection = connection
+        self.mode = mode
+
+    def __enter__(self):
+        self.connection.execute(f"BEGIN {self.mode}")
+        return self.connection
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
@@ -0,0 +1,95 @@
+class _Result:
+    """
+    Base for the small immutable result objects returned by the calculators.
+
+    Subclasses only list their fields in __slots__, so a result costs a few machine words
+    instead of a full instance dictionary, and can be hashed, compared and pickled.
+    """
+    __slots__ = ()
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes at most {len(self.__slots__)} arguments")
+
+        values = dict(zip(self.__slots__, args))
+        for name, value in kwargs.items():
+            if name not in self.__slots__:
+                raise TypeError(f"{type(self).__name__} got an unexpected field '{name}'")
+            if name in values:
+                raise TypeError(f"{type(self).__name__} got multiple values for field '{name}'")
+            values[name] = value
+
+        missing = [name for name in self.__slots__ if name not in values]
+        if missing:
+            raise TypeError(f"{type(self).__name__} is missing fields: {', '.join(missing)}")
+
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), self.astuple()
+
+    def astuple(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def asdict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash((type(self).__name__,) + self.astuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class MortgageQuote(_Result):
+    """
+    Outcome of pricing one mortgage.
+
+    kind is the repayment type ("linear", "annuity", ...). For an annuity the initial and final
+    payment are the same. total_paid is the gross amount paid to the bank over the whole term.
+    """
+    __slots__ = ("kind", "mortgage_amount", "interest_rate", "years", "initial_payment", "final_payment",
+                 "total_interest", "total_tax_return", "total_paid")
+
+    @property
+    def payment_decrease(self):
+        return self.initial_payment - self.final_payment
+
+    @property
+    def net_interest(self):
+        return self.total_interest - self.total_tax_return
+
+    @property
+    def total_net_paid(self):
+        return self.total_paid - self.total_tax_return
+
+
+class GiftTaxResult(_Result):
+    __slots__ = ("gift_amount", "tax", "net")
+
+
+class InvestmentProjection(_Result):
+    """
+    Outcome of investing annual_principal every year for `years` years at annual_yield (decimal).
+
+    growth is the average growth factor returned by calculate_growth_over_n_years, and
+    total_return is total_principal * growth.
+    """
+    __slots__ = ("annual_principal", "annual_yield", "years", "total_principal", "growth", "total_return")
+
+    @property
+    def profit(self):
+        return self.total_return - self.total_principal
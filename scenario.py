@@ -0,0 +1,169 @@
+from gifts import gift_tax_result
+from mortgage import find_interest_rate, quote_linear_mortgage, quote_annuity_mortgage
+
+_MISSING = object()
+
+
+class _Node:
+    __slots__ = ("name", "function", "dependencies", "dependents", "value", "version", "seen", "dirty")
+
+    def __init__(self, name, function=None, dependencies=()):
+        self.name = name
+        self.function = function
+        self.dependencies = dependencies
+        self.dependents = []
+        self.value = _MISSING
+        self.version = 0
+        self.seen = None
+        self.dirty = function is not None
+
+
+class DependencyGraph:
+    """
+    A small graph of memoized calculation steps.
+
+    Setting an input only marks the nodes downstream of it as dirty. Reading a node brings its
+    dependencies up to date first, and recomputes the node only when one of them actually
+    produced a different value, so an edit that does not change an intermediate result (for
+    example a gift change that keeps the same interest rate bucket) stops propagating there.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self.recompute_count = 0
+        self.recomputed = []
+
+    def add_input(self, name, value=_MISSING):
+        self._add(_Node(name))
+        if value is not _MISSING:
+            self.set(name, value)
+
+    def add_node(self, name, function, *dependencies):
+        for dependency in dependencies:
+            if dependency not in self._nodes:
+                raise KeyError(f"Unknown dependency '{dependency}' for node '{name}'")
+
+        node = _Node(name, function, tuple(self._nodes[dependency] for dependency in dependencies))
+        self._add(node)
+        for dependency in node.dependencies:
+            dependency.dependents.append(node)
+
+    def _add(self, node):
+        if node.name in self._nodes:
+            raise ValueError(f"Node '{node.name}' already exists")
+        self._nodes[node.name] = node
+
+    def set(self, name, value):
+        node = self._nodes[name]
+        if node.function is not None:
+            raise ValueError(f"'{name}' is a calculated node and cannot be set")
+
+        if node.value is not _MISSING and node.value == value:
+            return
+
+        node.value = value
+        node.version += 1
+        self._invalidate(node)
+
+    def update(self, **values):
+        self.recomputed = []
+        for name, value in values.items():
+            self.set(name, value)
+
+    def _invalidate(self, node):
+        stack = list(node.dependents)
+        while stack:
+            dependent = stack.pop()
+            if not dependent.dirty:
+                dependent.dirty = True
+                stack.extend(dependent.dependents)
+
+    def get(self, name):
+        node = self._nodes[name]
+        if node.function is None:
+            if node.value is _MISSING:
+                raise ValueError(f"Input '{name}' has not been set")
+            return node.value
+
+        if node.dirty:
+            self._refresh(node)
+        return node.value
+
+    def _refresh(self, node):
+        arguments = [self.get(dependency.name) for dependency in node.dependencies]
+        seen = tuple(dependency.version for dependency in node.dependencies)
+
+        if seen != node.seen:
+            value = node.function(*arguments)
+            self.recompute_count += 1
+            self.recomputed.append(node.name)
+
+            if node.value is _MISSING or value != node.value:
+                node.value = value
+                node.version += 1
+            node.seen = seen
+
+        node.dirty = False
+
+    def is_dirty(self, name):
+        return self._nodes[name].dirty
+
+
+def _mortgage_amount(house_price, own_participation, gift_tax):
+    return house_price - own_participation - gift_tax.net
+
+
+def _interest_rate(years, mortgage_amount, house_price):
+    return round(find_interest_rate(years, mortgage_amount / house_price) / 100, 4)  # divide by 100 since its percentage
+
+
+def _linear(mortgage_amount, interest_rate, years):
+    return quote_linear_mortgage(mortgage_amount, interest_rate, int(years))
+
+
+def _annuity(mortgage_amount, interest_rate, years):
+    return quote_annuity_mortgage(mortgage_amount, interest_rate, int(years))
+
+
+class MortgageScenario(DependencyGraph):
+    """
+    The mortgage() menu flow as a dependency graph:
+
+        gift -> gift_tax -> mortgage_amount -> interest_rate -> linear / annuity
+
+    Each step is memoized, so a what-if edit only reruns the steps downstream of the input that
+    changed. After an update, `recomputed` lists the nodes that were rerun while reading results.
+    """
+
+    def __init__(self, house_price, own_participation, gift, years):
+        super().__init__()
+        self.add_input("house_price", house_price)
+        self.add_input("own_participation", own_participation)
+        self.add_input("gift", gift)
+        self.add_input("years", years)
+
+        self.add_node("gift_tax", gift_tax_result, "gift")
+        self.add_node("mortgage_amount", _mortgage_amount, "house_price", "own_participation", "gift_tax")
+        self.add_node("interest_rate", _interest_rate, "years", "mortgage_amount", "house_price")
+        self.add_node("linear", _linear, "mortgage_amount", "interest_rate", "years")
+        self.add_node("annuity", _annuity, "mortgage_amount", "interest_rate", "years")
+
+    @property
+    def gift_tax(self):
+        return self.get("gift_tax")
+
+    @property
+    def mortgage_amount(self):
+        return self.get("mortgage_amount")
+
+    @property
+    def interest_rate(self):
+        return self.get("interest_rate")
+
+    @property
+    def linear(self):
+        return self.get("linear")
+
+    @property
+    def annuity(self):
+        return self.get("annuity")
@@ -0,0 +1,144 @@
+import numpy as np
+
+from constants import INTEREST_DEDUCTION
+from mortgage import MONTHS_IN_YEAR
+
+
+class Schedule:
+    """
+    Monthly cash-flow schedule of one or more loans.
+
+    Every column has the months on its last axis: a 1-D array for a single loan, or a
+    (loans, months) array for a batch, padded with zeros after each loan's final payment.
+    balance is the outstanding amount after that month's payment.
+    """
+    __slots__ = ("payment", "interest", "principal", "balance")
+
+    def __init__(self, payment, interest, principal, balance):
+        self.payment = payment
+        self.interest = interest
+        self.principal = principal
+        self.balance = balance
+
+    @property
+    def months(self):
+        return self.payment.shape[-1]
+
+    @property
+    def total_interest(self):
+        return self.interest.sum(axis=-1)
+
+    @property
+    def total_tax_return(self):
+        return self.total_interest * (INTEREST_DEDUCTION / 100)
+
+    @property
+    def total_paid(self):
+        return self.payment.sum(axis=-1)
+
+    def columns(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __getitem__(self, index):
+        return Schedule(*(getattr(self, name)[index] for name in self.__slots__))
+
+    def __len__(self):
+        return len(self.payment)
+
+
+def _prepare(mortgage_amounts, interest_rates, years, months):
+    mortgage_amounts, interest_rates, years = np.broadcast_arrays(
+        np.asarray(mortgage_amounts, dtype=np.float64),
+        np.asarray(interest_rates, dtype=np.float64),
+        np.asarray(years, dtype=np.float64))
+    scalar = mortgage_amounts.ndim == 0
+
+    mortgage_amounts = mortgage_amounts.reshape(-1, 1)
+    monthly_rates = interest_rates.reshape(-1, 1) / MONTHS_IN_YEAR
+    num_payments = (years.reshape(-1, 1) * MONTHS_IN_YEAR).round().astype(np.int64)
+
+    if months is None:
+        months = int(num_payments.max(initial=0))
+    month = np.arange(1, months + 1)
+    active = month <= num_payments
+
+    return scalar, mortgage_amounts, monthly_rates, num_payments, month, active
+
+
+def _finish(scalar, active, payment, interest, principal, balance):
+    columns = [np.where(active, column, 0.0) for column in (payment, interest, principal, balance)]
+    if scalar:
+        columns = [column[0] for column in columns]
+    return Schedule(*columns)
+
+
+def linear_schedules(mortgage_amounts, interest_rates, years, months=None):
+    """
+    Vectorized month-by-month schedule of linear mortgages, matching calculate_total_linear_interest.
+    """
+    scalar, amounts, monthly_rates, num_payments, month, active = _prepare(
+        mortgage_amounts, interest_rates, years, months)
+
+    monthly_principal = amounts / num_payments
+    opening_balance = amounts - monthly_principal * (month - 1)
+    interest = opening_balance * monthly_rates
+    principal = np.broadcast_to(monthly_principal, interest.shape)
+    balance = np.where(month == num_payments, 0.0, opening_balance - monthly_principal)
+
+    return _finish(scalar, active, principal + interest, interest, principal, balance)
+
+
+def annuity_schedules(mortgage_amounts, interest_rates, years, months=None):
+    """
+    Vectorized month-by-month schedule of annuity mortgages.
+
+    The balance after k payments has the closed form
+    amount * (1 + i) ** k - payment * ((1 + i) ** k - 1) / i, so no month is computed from the previous one.
+    """
+    scalar, amounts, monthly_rates, num_payments, month, active = _prepare(
+        mortgage_amounts, interest_rates, years, months)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        total_growth = (1 + monthly_rates) ** num_payments
+        payment = np.where(monthly_rates == 0, amounts / num_payments,
+                           amounts * monthly_rates * total_growth / (total_growth - 1))
+
+        opening_growth = (1 + monthly_rates) ** (month - 1)
+        opening_balance = np.where(monthly_rates == 0, amounts - payment * (month - 1),
+                                   amounts * opening_growth - payment * (opening_growth - 1) / monthly_rates)
+
+    interest = opening_balance * monthly_rates
+    principal = payment - interest
+    balance = np.where(month == num_payments, 0.0, opening_balance - principal)
+
+    return _finish(scalar, active, np.broadcast_to(payment, interest.shape), interest, principal, balance)
+
+
+def interest_only_schedules(mortgage_amounts, interest_rates, years, months=None):
+    """
+    Vectorized schedule of interest-only (aflossingsvrij) mortgages: interest every month and
+    the full amount repaid with the final payment.
+    """
+    scalar, amounts, monthly_rates, num_payments, month, active = _prepare(
+        mortgage_amounts, interest_rates, years, months)
+
+    last = month == num_payments
+    interest = np.broadcast_to(amounts * monthly_rates, active.shape)
+    principal = np.where(last, amounts, 0.0)
+    balance = np.where(last, 0.0, np.broadcast_to(amounts, active.shape))
+
+    return _finish(scalar, active, interest + principal, interest, principal, balance)
+
+
+SCHEDULE_ENGINES = {
+    "linear": linear_schedules,
+    "annuity": annuity_schedules,
+    "interest_only": interest_only_schedules
+}
+
+
+def build_schedules(kind, mortgage_amounts, interest_rates, years, months=None):
+    if kind not in SCHEDULE_ENGINES:
+        raise ValueError(f"Invalid mortgage kind '{kind}'. Must be one of: {', '.join(SCHEDULE_ENGINES)}.")
+
+    return SCHEDULE_ENGINES[kind](mortgage_amounts, interest_rates, years, months)
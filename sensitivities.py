@@ -0,0 +1,120 @@
+import numpy as np
+
+from batch_results import _ColumnResult
+from constants import INTEREST_DEDUCTION
+from mortgage import MONTHS_IN_YEAR
+
+_QUANTITIES = ("payment", "total_interest", "net_cost")
+_VARIABLES = ("rate", "principal", "years")
+
+
+class MortgageSensitivities(_ColumnResult):
+    """
+    Values and analytic first derivatives of mortgage outputs, as arrays over a portfolio.
+
+    payment is the first monthly payment, total_interest the gross interest over the term and
+    net_cost the total paid after the tax return (principal + total_interest * (1 - deduction)).
+    Each has a derivative with respect to the annual interest rate (as a decimal, so multiply by
+    0.0001 for one basis point), the principal and the duration in years (treated as continuous).
+    """
+    __slots__ = _QUANTITIES + tuple(f"d_{quantity}_d_{variable}" for quantity in _QUANTITIES
+                                    for variable in _VARIABLES)
+
+
+def _prepare(mortgage_amounts, interest_rates, years):
+    mortgage_amounts, interest_rates, years = np.broadcast_arrays(
+        np.asarray(mortgage_amounts, dtype=np.float64),
+        np.asarray(interest_rates, dtype=np.float64),
+        np.asarray(years, dtype=np.float64))
+    return mortgage_amounts, interest_rates / MONTHS_IN_YEAR, years * MONTHS_IN_YEAR
+
+
+def _with_net_cost(columns, deduction):
+    keep = 1 - deduction
+    columns["net_cost"] = columns["principal"] + columns["total_interest"] * keep
+    columns["d_net_cost_d_rate"] = columns["d_total_interest_d_rate"] * keep
+    columns["d_net_cost_d_principal"] = 1 + columns["d_total_interest_d_principal"] * keep
+    columns["d_net_cost_d_years"] = columns["d_total_interest_d_years"] * keep
+    del columns["principal"]
+
+    return MortgageSensitivities(**columns)
+
+
+def annuity_sensitivities(mortgage_amounts, interest_rates, years, deduction=INTEREST_DEDUCTION):
+    """
+    Sensitivities of annuity mortgages.
+
+    With monthly rate i, n payments and g = (1 + i) ** n the payment is P * i * g / (g - 1), so
+    dM/di = P * (g / (g - 1) - i * n * g / ((1 + i) * (g - 1) ** 2))
+    dM/dn = -P * i * g * ln(1 + i) / (g - 1) ** 2
+    and the 0% limits are P * (n + 1) / (2 * n) and -P / n ** 2. Total interest is n * M - P.
+    """
+    principal, monthly_rate, num_payments = _prepare(mortgage_amounts, interest_rates, years)
+    zero = monthly_rate == 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (1 + monthly_rate) ** num_payments
+        factor = np.where(zero, 1 / num_payments, monthly_rate * growth / (growth - 1))
+        d_factor_d_i = np.where(zero, (num_payments + 1) / (2 * num_payments),
+                                growth / (growth - 1)
+                                - monthly_rate * num_payments * growth / ((1 + monthly_rate) * (growth - 1) ** 2))
+        d_factor_d_n = np.where(zero, -1 / num_payments ** 2,
+                                -monthly_rate * growth * np.log1p(monthly_rate) / (growth - 1) ** 2)
+
+    payment = principal * factor
+    d_payment_d_rate = principal * d_factor_d_i / MONTHS_IN_YEAR
+    d_payment_d_years = principal * d_factor_d_n * MONTHS_IN_YEAR
+
+    return _with_net_cost({
+        "principal": principal,
+        "payment": payment,
+        "d_payment_d_rate": d_payment_d_rate,
+        "d_payment_d_principal": factor,
+        "d_payment_d_years": d_payment_d_years,
+        "total_interest": num_payments * payment - principal,
+        "d_total_interest_d_rate": num_payments * d_payment_d_rate,
+        "d_total_interest_d_principal": num_payments * factor - 1,
+        "d_total_interest_d_years": MONTHS_IN_YEAR * payment + num_payments * d_payment_d_years
+    }, deduction / 100)
+
+
+def linear_sensitivities(mortgage_amounts, interest_rates, years, deduction=INTEREST_DEDUCTION):
+    """
+    Sensitivities of linear mortgages.
+
+    The first payment is P / n + P * i and the total interest is P * i * (n + 1) / 2, both of which
+    are differentiated term by term.
+    """
+    principal, monthly_rate, num_payments = _prepare(mortgage_amounts, interest_rates, years)
+
+    return _with_net_cost({
+        "principal": principal,
+        "payment": principal / num_payments + principal * monthly_rate,
+        "d_payment_d_rate": principal / MONTHS_IN_YEAR,
+        "d_payment_d_principal": 1 / num_payments + monthly_rate,
+        "d_payment_d_years": -principal / num_payments ** 2 * MONTHS_IN_YEAR,
+        "total_interest": principal * monthly_rate * (num_payments + 1) / 2,
+        "d_total_interest_d_rate": principal * (num_payments + 1) / (2 * MONTHS_IN_YEAR),
+        "d_total_interest_d_principal": monthly_rate * (num_payments + 1) / 2,
+        "d_total_interest_d_years": principal * monthly_rate * MONTHS_IN_YEAR / 2
+    }, deduction / 100)
+
+
+SENSITIVITY_ENGINES = {
+    "linear": linear_sensitivities,
+    "annuity": annuity_sensitivities
+}
+
+
+def mortgage_sensitivities(kind, mortgage_amounts, interest_rates, years, deduction=INTEREST_DEDUCTION):
+    if kind not in SENSITIVITY_ENGINES:
+        raise ValueError(f"Invalid mortgage kind '{kind}'. Must be one of: {', '.join(SENSITIVITY_ENGINES)}.")
+
+    return SENSITIVITY_ENGINES[kind](mortgage_amounts, interest_rates, years, deduction)
+
+
+def rate_shock(sensitivities, basis_points):
+    """First-order change of payment, total interest and net cost for a parallel rate move."""
+    shift = basis_points / 10000
+
+    return {quantity: getattr(sensitivities, f"d_{quantity}_d_rate") * shift for quantity in _QUANTITIES}
@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from columnar import ColumnarReader, ColumnarWriter
+from result_cache import rate_table_version
+from sweeps import SWEEP_KERNELS, get_kernel
+
+MANIFEST = "manifest.json"
+DEFAULT_SHARD_ROWS = 1 << 18
+DEFAULT_STALE_AFTER = 3600.0  # seconds before a lock of a process we cannot check is considered abandoned
+
+
+def create_sweep(directory, kernel, axes, shard_rows=DEFAULT_SHARD_ROWS):
+    """
+    Describe a sweep over the cartesian product of `axes` (ordered like sweeps.make_grid) in a
+    manifest in `directory`, split into shards of shard_rows consecutive grid rows.
+
+    The shards only depend on the axes and shard_rows, so creating the same sweep again is a
+    no-op that keeps finished shards, while a different sweep in the same directory is refused.
+    """
+    kernel = get_kernel(kernel)
+    if kernel.name not in SWEEP_KERNELS:
+        raise ValueError("Sharded sweeps only run registered kernels, which every worker can look up by name.")
+    if list(axes) != list(kernel.inputs):
+        raise ValueError(f"The axes of a {kernel.name} sweep must be {', '.join(kernel.inputs)}, in that order.")
+
+    axes = {name: np.asarray(values, dtype=np.float64).reshape(-1).tolist() for name, values in axes.items()}
+    rows = int(np.prod([len(values) for values in axes.values()]))
+    manifest = {
+        "kernel": kernel.name,
+        "axes": axes,
+        "rows": rows,
+        "shard_rows": shard_rows,
+        "version": rate_table_version(),
+        "shards": [{"id": f"shard-{index:05d}", "start": start, "stop": min(start + shard_rows, rows)}
+                   for index, start in enumerate(range(0, rows, shard_rows))]
+    }
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, MANIFEST)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            existing = json.load(file)
+        if existing != manifest:
+            raise ValueError(f"{directory} already holds a different sweep.")
+        return ShardedSweep(directory)
+
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+    os.replace(temporary, path)
+
+    return ShardedSweep(directory)
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class ShardedSweep:
+    """
+    A sweep directory shared by any number of workers on one or more machines.
+
+    A shard is claimed by creating its lock file with O_CREAT | O_EXCL, which succeeds for exactly
+    one worker. Its results are written to a temporary file and renamed into place, so a shard is
+    done exactly when its result file exists; a worker that crashes leaves at most a lock and a
+    temporary file behind. Locks of dead processes on the same host, and locks older than
+    stale_after seconds, are broken so another worker can take the shard over. Opening the sweep
+    with rate tables other than the ones it was created with raises a ValueError.
+
+    Breaking a lock is not fully atomic across workers: a live lock taken in the instant between
+    another worker's check and its rename is put back, but if yet another lock appeared meanwhile
+    two workers can run the same shard. That costs only time, as both publish identical results
+    with a rename.
+    """
+
+    def __init__(self, directory, stale_after=DEFAULT_STALE_AFTER):
+        self.directory = directory
+        self.stale_after = stale_after
+        with open(os.path.join(directory, MANIFEST), encoding="utf-8") as file:
+            self.manifest = json.load(file)
+        if self.manifest["version"] != rate_table_version():
+            raise ValueError(f"{directory} was created with rate tables {self.manifest['version']}, but this worker "
+                             f"has {rate_table_version()}; its shards would not match.")
+        self.kernel = SWEEP_KERNELS[self.manifest["kernel"]]
+
+    @property
+    def shards(self):
+        return self.manifest["shards"]
+
+    def result_path(self, shard):
+        return os.path.join(self.directory, f"{shard['id']}.ftcol")
+
+    def lock_path(self, shard):
+        return os.path.join(self.directory, f"{shard['id']}.lock")
+
+    def is_done(self, shard):
+        return os.path.exists(self.result_path(shard))
+
+    def pending(self):
+        return [shard for shard in self.shards if not self.is_done(shard)]
+
+    def status(self):
+        done = sum(self.is_done(shard) for shard in self.shards)
+        locked = sum(os.path.exists(self.lock_path(shard)) for shard in self.shards if not self.is_done(shard))
+        return {"shards": len(self.shards), "done": done, "running": locked, "pending": len(self.shards) - done - locked}
+
+    def _stale_lock(self, lock_path):
+        """The os.stat of the lock if it is stale, else None. An unreadable lock is judged on its age alone."""
+        try:
+            status = os.stat(lock_path)
+        except OSError:
+            return None  # just released
+        try:
+            with open(lock_path, encoding="utf-8") as file:
+                owner = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            owner = None  # empty or half-written, by an owner that is still writing it or died doing so
+
+        if isinstance(owner, dict) and owner.get("host") == socket.gethostname() and \
+                not _process_alive(owner.get("pid", -1)):
+            return status
+        return status if time.time() - status.st_mtime > self.stale_after else None
+
+    def claim(self, shard):
+        """Try to take a shard. Returns False when it is done or another live worker holds it."""
+        if self.is_done(shard):
+            return False
+
+        lock_path = self.lock_path(shard)
+        for _ in range(2):
+            try:
+                descriptor = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                stale = self._stale_lock(lock_path)
+                if stale is None:
+                    return False
+                # Move the lock aside and make sure it is still the one judged stale: a worker that
+                # was slower to get here can otherwise break a lock just taken by a live worker
+                tombstone = f"{lock_path}.{uuid.uuid4().hex}.stale"
+                try:
+                    os.rename(lock_path, tombstone)
+                except FileNotFoundError:
+                    continue  # broken or released by someone else
+                broken = os.stat(tombstone)
+                if (broken.st_ino, broken.st_mtime_ns) != (stale.st_ino, stale.st_mtime_ns):
+                    try:
+                        os.link(tombstone, lock_path)
+                    except OSError:
+                        pass  # another lock was taken in between; the shard may then run twice
+                    os.remove(tombstone)
+                    return False
+                os.remove(tombstone)
+                continue
+
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({"host": socket.gethostname(), "pid": os.getpid(), "claimed": time.time()}, file)
+            if self.is_done(shard):  # finished by a worker whose lock we just broke
+                self.release(shard)
+                return False
+            return True
+
+        return False
+
+    def release(self, shard):
+        try:
+            os.remove(self.lock_path(shard))
+        except FileNotFoundError:
+            pass
+
+    def shard_inputs(self, shard):
+        """The grid rows of a shard, generated from the axes without building the whole grid."""
+        axes = [np.asarray(values, dtype=np.float64) for values in self.manifest["axes"].values()]
+        indices = np.unravel_index(np.arange(shard["start"], shard["stop"]), [len(values) for values in axes])
+
+        return {name: values[index] for name, values, index in zip(self.manifest["axes"], axes, indices)}
+
+    def run_shard(self, shard):
+        """Compute a claimed shard and publish its result file."""
+        outputs = self.kernel(self.shard_inputs(shard))
+        path = self.result_path(shard)
+        temporary = f"{path}.{socket.gethostname()}.{os.getpid()}.tmp"
+        attrs = {"kind": "sweep_shard", "shard": shard["id"], "start": shard["start"], "stop": shard["stop"]}
+
+        try:
+            with ColumnarWriter(temporary, attrs=attrs) as writer:
+                writer.append(outputs)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        finally:
+            self.release(shard)
+
+    def merge(self, path):
+        """
+        Assemble the shard results, in grid order, into one sweep file readable with
+        ColumnarReader.cube. Shards are copied one at a time, so the full sweep is never in memory.
+        """
+        missing = [shard["id"] for shard in self.pending()]
+        if missing:
+            raise ValueError(f"Cannot merge before every shard is done; {len(missing)} missing, first {missing[0]}.")
+
+        attrs = {"kind": "sweep", "kernel": self.manifest["kernel"], "axes": self.manifest["axes"]}
+        schema = {name: np.float64 for name in self.kernel.outputs}
+        with ColumnarWriter(path, schema, attrs=attrs) as writer:
+            for shard in self.shards:
+                for chunk in ColumnarReader(self.result_path(shard)).iter_chunks(list(self.kernel.outputs)):
+                    writer.append(chunk)
+
+        return ColumnarReader(path)
+
+
+def run_worker(directory, max_shards=None, stale_after=DEFAULT_STALE_AFTER):
+    """Claim and run pending shards until none are left (or max_shards are done). Returns their ids."""
+    sweep = ShardedSweep(directory, stale_after)
+    completed = []
+    for shard in sweep.pending():
+        if max_shards is not None and len(completed) >= max_shards:
+            break
+        if sweep.claim(shard):
+            sweep.run_shard(shard)
+            completed.append(shard["id"])
+
+    return completed
+
+
+def run_local(directory, processes=None, stale_after=DEFAULT_STALE_AFTER):
+    """Single-machine stand-in for a cluster: run `processes` independent workers on the same directory."""
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(run_worker, directory, None, stale_after) for _ in range(processes)]
+        return [future.result() for future in futures]
+
+
+def _axis(text):
+    """start:stop:count for an evenly spaced axis, or a comma-separated list of values."""
+    if ":" in text:
+        start, stop, count = text.split(":")
+        return np.linspace(float(start), float(stop), int(count))
+    return [float(value) for value in text.split(",")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a scenario sweep in shards on a shared directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="write the manifest of a new sweep")
+    create.add_argument("directory")
+    create.add_argument("kernel", choices=sorted(SWEEP_KERNELS))
+    create.add_argument("axes", nargs="+", help="one axis per kernel input, as start:stop:count or v1,v2,...")
+    create.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS)
+
+    work = commands.add_parser("work", help="claim and run pending shards")
+    work.add_argument("directory")
+    work.add_argument("--processes", type=int, default=1)
+
+    status = commands.add_parser("status", help="count finished, running and pending shards")
+    status.add_argument("directory")
+
+    merge = commands.add_parser("merge", help="assemble the finished shards into one sweep file")
+    merge.add_argument("directory")
+    merge.add_argument("output")
+
+    arguments = parser.parse_args()
+    if arguments.command == "create":
+        inputs = SWEEP_KERNELS[arguments.kernel].inputs
+        if len(arguments.axes) != len(inputs):
+            parser.error(f"{arguments.kernel} needs one axis for each of: {', '.join(inputs)}")
+        sweep = create_sweep(arguments.directory, arguments.kernel,
+                             {name: _axis(text) for name, text in zip(inputs, arguments.axes)}, arguments.shard_rows)
+        print(f"{len(sweep.shards)} shards of up to {arguments.shard_rows} rows")
+    elif arguments.command == "work":
+        completed = run_local(arguments.directory, arguments.processes) if arguments.processes > 1 else \
+            [run_worker(arguments.directory)]
+        print(f"completed {sum(len(ids) for ids in completed)} shards")
+    elif arguments.command == "status":
+        print(ShardedSweep(arguments.directory).status())
+    else:
+        reader = ShardedSweep(arguments.directory).merge(arguments.output)
+        print(f"merged {len(reader)} rows into {arguments.output}")
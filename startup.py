@@ -0,0 +1,102 @@
+import argparse
+import os
+import subprocess
+import sys
+
+# Modules a one-shot CLI query should never pay for
+HEAVY_MODULES = ("numpy", "sqlite3", "multiprocessing", "concurrent.futures")
+
+# What running each menu item imports: the CLI entry point plus the calculator's module
+QUERIES = {
+    "menu": "import main",
+    **{key: f"import main; main.CALCULATORS.load({key!r})" for key in ("1", "2", "3", "4")}
+}
+
+_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+class ImportTimeReport:
+    """
+    Parsed `python -X importtime` output of one statement: per module, the time spent importing
+    the module itself and including everything it imported (in microseconds), in import order.
+    """
+    __slots__ = ("statement", "modules", "self_us", "cumulative_us")
+
+    def __init__(self, statement, modules, self_us, cumulative_us):
+        self.statement = statement
+        self.modules = modules
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+
+    @property
+    def total_ms(self):
+        return sum(self.self_us.values()) / 1000
+
+    def loaded(self, module):
+        """Whether `module` or any of its submodules was imported."""
+        return any(name == module or name.startswith(module + ".") for name in self.modules)
+
+    def slowest(self, count=10):
+        return sorted(self.cumulative_us.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def parse_importtime(statement, output):
+    modules = []
+    self_us = {}
+    cumulative_us = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        modules.append(name)
+        self_us[name] = int(own)
+        cumulative_us[name] = int(cumulative)
+
+    return ImportTimeReport(statement, modules, self_us, cumulative_us)
+
+
+def measure_import_time(statement="import main", python=sys.executable):
+    """Run `statement` in a fresh interpreter with -X importtime, from the repository directory."""
+    environment = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    environment.pop("PYTHONPROFILEIMPORTTIME", None)
+    completed = subprocess.run([python, "-X", "importtime", "-c", statement], cwd=_DIRECTORY, env=environment,
+                               capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        raise RuntimeError(f"'{statement}' failed:\n{completed.stderr}")
+
+    return parse_importtime(statement, completed.stderr)
+
+
+def check_startup_budget(query="3", budget_ms=None, forbidden=HEAVY_MODULES, python=sys.executable):
+    """
+    Measure a menu query (a key of QUERIES or a statement) and list what breaks its budget: any
+    forbidden module that got imported, and the total import time when it exceeds budget_ms.
+    Returns the report and the list of violations (empty when within budget).
+    """
+    report = measure_import_time(QUERIES.get(query, query), python)
+    violations = [f"{module} was imported" for module in forbidden if report.loaded(module)]
+    if budget_ms is not None and report.total_ms > budget_ms:
+        violations.append(f"imports took {report.total_ms:.1f} ms, over the budget of {budget_ms:.1f} ms")
+
+    return report, violations
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report the import time of CLI queries and check their budget.")
+    parser.add_argument("queries", nargs="*", help=f"menu queries ({', '.join(QUERIES)}) or statements")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--top", type=int, default=5)
+    arguments = parser.parse_args()
+
+    failed = False
+    for query in arguments.queries or QUERIES:
+        report, violations = check_startup_budget(query, arguments.budget_ms)
+        print(f"{query}: {report.total_ms:.1f} ms over {len(report.modules)} modules")
+        for name, cumulative in report.slowest(arguments.top):
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+        for violation in violations:
+            print(f"  OVER BUDGET: {violation}")
+        failed |= bool(violations)
+
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,218 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from batch_results import quote_linear_mortgages, quote_annuity_mortgages, quote_interest_only_mortgages, \
+    quote_bank_savings_mortgages, project_investments
+
+MORTGAGE_INPUTS = ("mortgage_amount", "interest_rate", "years")
+MORTGAGE_OUTPUTS = ("initial_payment", "final_payment", "total_interest", "total_tax_return", "total_paid")
+INVESTMENT_INPUTS = ("annual_principal", "annual_yield", "years")
+INVESTMENT_OUTPUTS = ("total_principal", "growth", "total_return")
+
+
+class SweepKernel:
+    """A vectorized calculator that maps named float64 input columns to named float64 output columns."""
+    __slots__ = ("name", "function", "inputs", "outputs")
+
+    def __init__(self, name, function, inputs, outputs):
+        self.name = name
+        self.function = function
+        self.inputs = inputs
+        self.outputs = outputs
+
+    def __call__(self, columns):
+        batch = self.function(*(columns[name] for name in self.inputs))
+        return {name: getattr(batch, name) for name in self.outputs}
+
+
+SWEEP_KERNELS = {
+    "linear_mortgage": SweepKernel("linear_mortgage", quote_linear_mortgages, MORTGAGE_INPUTS, MORTGAGE_OUTPUTS),
+    "annuity_mortgage": SweepKernel("annuity_mortgage", quote_annuity_mortgages, MORTGAGE_INPUTS, MORTGAGE_OUTPUTS),
+    "interest_only_mortgage": SweepKernel("interest_only_mortgage", quote_interest_only_mortgages, MORTGAGE_INPUTS,
+                                          MORTGAGE_OUTPUTS),
+    "bank_savings_mortgage": SweepKernel("bank_savings_mortgage", quote_bank_savings_mortgages, MORTGAGE_INPUTS,
+                                         MORTGAGE_OUTPUTS),
+    "investment_projection": SweepKernel("investment_projection", project_investments, INVESTMENT_INPUTS,
+                                         INVESTMENT_OUTPUTS)
+}
+
+
+def get_kernel(kernel):
+    if isinstance(kernel, SweepKernel):
+        return kernel
+    if kernel not in SWEEP_KERNELS:
+        raise ValueError(f"Unknown sweep kernel '{kernel}'. Must be one of: {', '.join(SWEEP_KERNELS)}.")
+    return SWEEP_KERNELS[kernel]
+
+
+def make_grid(**axes):
+    """Cartesian product of the given axes, flattened into one float64 column per axis (last axis fastest)."""
+    values = [np.asarray(axis, dtype=np.float64) for axis in axes.values()]
+    mesh = np.meshgrid(*values, indexing="ij")
+
+    return {name: column.reshape(-1) for name, column in zip(axes, mesh)}
+
+
+def _chunks(rows, workers, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = max(1, -(-rows // (workers * 4)))
+    return [(start, min(start + chunk_size, rows)) for start in range(0, rows, chunk_size)]
+
+
+class SweepResult:
+    """
+    Output columns of a sweep.
+
+    With shared memory the columns are NumPy views on the shared blocks the workers wrote into;
+    call close() (or use the result as a context manager) once they are no longer needed, which
+    releases the blocks. Copy a column first if it has to outlive the result.
+    """
+
+    def __init__(self, columns, blocks=()):
+        self.columns = columns
+        self._blocks = list(blocks)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def close(self):
+        self.columns = {}
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Worker-side views on the shared blocks, attached once per process by _attach
+_shared_columns = {}
+_shared_blocks = []
+
+
+def _attach(layout):
+    _shared_columns.clear()
+    for block in _shared_blocks:
+        block.close()
+    _shared_blocks.clear()
+
+    for name, (block_name, rows) in layout.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _shared_blocks.append(block)
+        _shared_columns[name] = np.ndarray((rows,), dtype=np.float64, buffer=block.buf)
+
+
+def _run_shared_chunk(kernel, start, stop):
+    outputs = kernel({name: _shared_columns[name][start:stop] for name in kernel.inputs})
+    for name, values in outputs.items():
+        _shared_columns[name][start:stop] = values
+    return stop - start
+
+
+def _run_pickled_chunk(kernel, columns):
+    return kernel(columns)
+
+
+def _allocate(rows):
+    block = shared_memory.SharedMemory(create=True, size=max(1, rows * 8))
+    return block, np.ndarray((rows,), dtype=np.float64, buffer=block.buf)
+
+
+def run_sweep(kernel, inputs, workers=None, chunk_size=None, use_shared_memory=True):
+    """
+    Run a kernel (a registered name or any SweepKernel whose function can be pickled) over input
+    columns in a process pool.
+
+    With use_shared_memory the inputs and preallocated outputs live in multiprocessing.shared_memory
+    blocks; workers only receive (start, stop) row ranges and write their slice of every output in
+    place, so no result is pickled. Without it, each chunk's inputs and outputs travel through
+    pickling, which is kept as the baseline for benchmark_sweep.
+    """
+    kernel = get_kernel(kernel)
+    rows = len(inputs[kernel.inputs[0]])
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(rows, workers, chunk_size)
+
+    if not use_shared_memory:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(_run_pickled_chunk, kernel,
+                                   {name: np.asarray(inputs[name], dtype=np.float64)[start:stop]
+                                    for name in kernel.inputs})
+                       for start, stop in chunks]
+            parts = [future.result() for future in futures]
+        return SweepResult({name: np.concatenate([part[name] for part in parts]) if parts else np.empty(0)
+                            for name in kernel.outputs})
+
+    blocks = []
+    layout = {}
+    columns = {}
+    try:
+        for name in kernel.inputs + kernel.outputs:
+            block, columns[name] = _allocate(rows)
+            blocks.append(block)
+            layout[name] = (block.name, rows)
+            if name in kernel.inputs:
+                columns[name][:] = inputs[name]
+
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(layout,)) as pool:
+            futures = [pool.submit(_run_shared_chunk, kernel, start, stop) for start, stop in chunks]
+            for future in futures:
+                future.result()
+    except BaseException:
+        columns.clear()
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    # The input blocks are not part of the result, release them right away
+    for name, block in zip(kernel.inputs, blocks):
+        del columns[name]
+        block.close()
+        block.unlink()
+
+    return SweepResult(columns, blocks[len(kernel.inputs):])
+
+
+def benchmark_sweep(kernel, inputs, workers=None, chunk_size=None):
+    """Rows per second of the same sweep with and without shared-memory result buffers."""
+    kernel = get_kernel(kernel)
+    rows = len(inputs[kernel.inputs[0]])
+    report = {"kernel": kernel.name, "rows": rows}
+
+    for label, use_shared_memory in (("shared_memory", True), ("pickled", False)):
+        start = time.perf_counter()
+        result = run_sweep(kernel, inputs, workers, chunk_size, use_shared_memory)
+        seconds = time.perf_counter() - start
+        result.close()
+
+        report[f"{label}_seconds"] = seconds
+        report[f"{label}_rows_per_second"] = rows / seconds if seconds else float("inf")
+
+    return report
+
+
+if __name__ == "__main__":
+    mortgage_grid = make_grid(mortgage_amount=np.linspace(100000, 1000000, 200),
+                              interest_rate=np.linspace(0.01, 0.08, 100),
+                              years=np.arange(1, 31))
+    investment_grid = make_grid(annual_principal=np.linspace(1000, 20000, 200),
+                                annual_yield=np.linspace(0.0, 0.12, 100),
+                                years=np.arange(1, 31))
+
+    for name in SWEEP_KERNELS:
+        report = benchmark_sweep(name, investment_grid if name == "investment_projection" else mortgage_grid)
+        print(f"{name}: {report['rows']} rows, "
+              f"shared memory {report['shared_memory_rows_per_second']:.0f} rows/s, "
+              f"pickled {report['pickled_rows_per_second']:.0f} rows/s")
@@ -0,0 +1,187 @@
+import numpy as np
+
+from batch_results import _ColumnResult, calculate_annuity_mortgage_payments, calculate_gift_taxes
+from constants import INTEREST_DEDUCTION, interest_rates as current_interest_rates
+from mortgage import MONTHS_IN_YEAR
+from rate_history import compile_sheet, year_key_indices, portion_key_indices
+
+_BISECTION_STEPS = 40  # halves a one-year bracket down to well below a second
+
+
+class RentVsBuy(_ColumnResult):
+    """
+    Rent-versus-buy comparison over a grid of scenarios.
+
+    The per-year columns have shape scenarios + (horizon_years + 1,), for years 0..horizon_years:
+    buyer_wealth is the house value minus the outstanding mortgage; renter_wealth is what the
+    renter has after investing the money the buyer put into the house plus, every month, the
+    difference between the buyer's net mortgage payment and the rent (negative when renting is
+    more expensive); advantage is buyer_wealth - renter_wealth. buyer_cash_out and rent_paid are
+    the plain cumulative cash spent by each. break_even_years is the first time the buyer is
+    ahead, or NaN when that does not happen within the horizon.
+    """
+    __slots__ = ("years", "mortgage_amount", "interest_rate", "monthly_payment", "buyer_wealth", "renter_wealth",
+                 "advantage", "buyer_cash_out", "rent_paid", "break_even_years")
+
+
+def _monthly(annual_rate):
+    return (1 + annual_rate) ** (1 / MONTHS_IN_YEAR) - 1
+
+
+def _mix(u, a, k):
+    """
+    sum(a ** (j - 1) * u ** (k - j) for j in 1..k), the future value at growth u of a stream that
+    grows by a, for real k >= 0. It reduces to (u ** k - 1) / (u - 1) for a = 1.
+    """
+    close = np.isclose(u, a, rtol=0, atol=1e-12)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        general = (u ** k - a ** k) / (u - a)
+    return np.where(close, k * a ** np.maximum(k - 1, 0), general)
+
+
+class _Scenarios:
+    """Broadcast, flattened scenario inputs and the monthly quantities derived from them."""
+
+    def __init__(self, house_price, own_participation, gift, years, monthly_rent, house_growth, rent_growth,
+                 investment_yield, purchase_costs, interest_rate, deduction):
+        # interest_rate and deduction are axes like any other input; a missing rate is looked up below
+        lookup_rate = interest_rate is None
+        arrays = np.broadcast_arrays(*(np.asarray(value, dtype=np.float64) for value in (
+            house_price, own_participation, gift, years, monthly_rent, house_growth, rent_growth, investment_yield,
+            purchase_costs, np.nan if lookup_rate else interest_rate, deduction)))
+        self.shape = arrays[0].shape
+        (self.house_price, own_participation, gift, self.years, self.rent, house_growth, rent_growth,
+         investment_yield, purchase_costs, interest_rate, deduction) = [array.reshape(-1) for array in arrays]
+
+        gift_net = gift - calculate_gift_taxes(gift)
+        self.mortgage_amount = self.house_price - own_participation - gift_net
+        if lookup_rate:
+            sheet = compile_sheet(current_interest_rates)
+            rates = sheet[year_key_indices(self.years), portion_key_indices(self.mortgage_amount / self.house_price)]
+            interest_rate = np.round(rates / 100, 4)
+        self.interest_rate = interest_rate
+
+        self.upfront = own_participation + gift_net + purchase_costs * self.house_price
+        self.payment = calculate_annuity_mortgage_payments(self.mortgage_amount, self.interest_rate, self.years)
+        self.num_payments = self.years * MONTHS_IN_YEAR
+        self.loan_growth = 1 + self.interest_rate / MONTHS_IN_YEAR
+        self.house_growth = 1 + _monthly(house_growth)
+        self.rent_growth = 1 + _monthly(rent_growth)
+        self.investment_growth = 1 + _monthly(investment_yield)
+        self.deduction = deduction / 100
+
+    def evaluate(self, months):
+        """Wealth and cumulative cash of both sides after `months` (real, broadcast per scenario)."""
+        def column(values):
+            return values[:, None] if np.ndim(months) == 2 else values
+
+        loan_growth = column(self.loan_growth)
+        investment_growth = column(self.investment_growth)
+        payment = column(self.payment)
+        amount = column(self.mortgage_amount)
+        monthly_rate = loan_growth - 1
+        paid_months = np.minimum(months, column(self.num_payments))
+
+        balance = amount * loan_growth ** paid_months - payment * _mix(loan_growth, 1.0, paid_months)
+        balance = np.where(paid_months >= column(self.num_payments), 0.0, balance)
+
+        # interest in month j is (i * L - M) * (1 + i) ** (j - 1) + M, summed with investment growth
+        def net_outflow(growth):
+            interest = (monthly_rate * amount - payment) * _mix(growth, loan_growth, paid_months) + \
+                       payment * _mix(growth, 1.0, paid_months)
+            return (payment * _mix(growth, 1.0, paid_months) - column(self.deduction) * interest) * \
+                growth ** (months - paid_months)
+
+        rent_paid = column(self.rent) * _mix(1.0, column(self.rent_growth), months)
+        invested_rent = column(self.rent) * _mix(investment_growth, column(self.rent_growth), months)
+
+        buyer_wealth = column(self.house_price) * column(self.house_growth) ** months - balance
+        renter_wealth = column(self.upfront) * investment_growth ** months + net_outflow(investment_growth) - \
+            invested_rent
+
+        return {
+            "buyer_wealth": buyer_wealth,
+            "renter_wealth": renter_wealth,
+            "buyer_cash_out": column(self.upfront) + net_outflow(1.0),
+            "rent_paid": rent_paid
+        }
+
+    def advantage(self, months):
+        values = self.evaluate(months)
+        return values["buyer_wealth"] - values["renter_wealth"]
+
+
+def compare_rent_vs_buy(house_price, own_participation, gift, years, monthly_rent, horizon_years=30,
+                        house_growth=0.03, rent_growth=0.03, investment_yield=0.05, purchase_costs=0.02,
+                        interest_rate=None, deduction=INTEREST_DEDUCTION):
+    """
+    Compare buying with an annuity mortgage against renting, for every combination of the
+    (broadcastable) inputs.
+
+    The mortgage amount follows mortgage(): house price minus own participation minus the gift
+    after gift tax. interest_rate defaults to the current rate sheet for the duration and
+    loan-to-value. Growth rates and the investment yield are annual decimals compounded monthly.
+    The renter is assumed to receive the same net gift and invest it.
+
+    Everything is evaluated in closed form (geometric series of the annuity interest, the growing
+    rent and the investment growth), so every year of every scenario is one array expression.
+    Break-even points are bracketed on that yearly grid and refined by a vectorized bisection.
+    """
+    scenarios = _Scenarios(house_price, own_participation, gift, years, monthly_rent, house_growth, rent_growth,
+                           investment_yield, purchase_costs, interest_rate, deduction)
+
+    horizon = np.arange(horizon_years + 1)
+    months = np.broadcast_to(horizon * MONTHS_IN_YEAR, (len(scenarios.house_price), len(horizon))).astype(np.float64)
+    values = scenarios.evaluate(months)
+    advantage = values["buyer_wealth"] - values["renter_wealth"]
+
+    break_even = _break_even_years(scenarios, advantage)
+
+    def reshape(array):
+        return array.reshape(scenarios.shape + array.shape[1:])
+
+    return RentVsBuy(
+        years=horizon,
+        mortgage_amount=reshape(scenarios.mortgage_amount),
+        interest_rate=reshape(np.array(scenarios.interest_rate)),
+        monthly_payment=reshape(scenarios.payment),
+        buyer_wealth=reshape(values["buyer_wealth"]),
+        renter_wealth=reshape(values["renter_wealth"]),
+        advantage=reshape(advantage),
+        buyer_cash_out=reshape(values["buyer_cash_out"]),
+        rent_paid=reshape(values["rent_paid"]),
+        break_even_years=reshape(break_even)
+    )
+
+
+def _break_even_years(scenarios, advantage):
+    ahead = advantage > 0
+    found = ahead.any(axis=1)
+    first = np.argmax(ahead, axis=1)
+
+    result = np.full(len(first), np.nan)
+    result[found & (first == 0)] = 0.0
+
+    refine = found & (first > 0)
+    if not refine.any():
+        return result
+
+    # the buyer falls behind at the start of the bracket and is ahead at its end
+    low = (first[refine] - 1) * float(MONTHS_IN_YEAR)
+    high = first[refine] * float(MONTHS_IN_YEAR)
+    subset = _subset(scenarios, refine)
+    for _ in range(_BISECTION_STEPS):
+        middle = (low + high) / 2
+        ahead_at_middle = subset.advantage(middle) > 0
+        high = np.where(ahead_at_middle, middle, high)
+        low = np.where(ahead_at_middle, low, middle)
+
+    result[refine] = high / MONTHS_IN_YEAR
+    return result
+
+
+def _subset(scenarios, mask):
+    subset = object.__new__(_Scenarios)
+    for name, value in vars(scenarios).items():
+        subset.__dict__[name] = value[mask] if isinstance(value, np.ndarray) and value.shape == mask.shape else value
+    return subset
@@ -0,0 +1,90 @@
+import asyncio
+import unittest
+
+from async_quotes import AsyncQuoteClient, benchmark
+from gifts import gift_tax_result
+from investments import project_investment
+from mortgage import quote_linear_mortgage, quote_annuity_mortgage
+
+
+class TestAsyncQuotes(unittest.TestCase):
+
+    def test_results_match_scalar_calculators(self):
+        """Test that every caller gets the same result as the scalar calculator"""
+        async def run():
+            async with AsyncQuoteClient(window=0.01) as client:
+                results = await asyncio.gather(
+                    client.linear_mortgage(200000, 0.04, 30),
+                    client.annuity_mortgage(250000, 0.035, 20),
+                    client.annuity_mortgage(100000, 0.0, 10),
+                    client.gift_tax(150000),
+                    client.investment(1000, 0.05, 10))
+            return results, client.batches
+
+        (linear, annuity, zero_rate, gift, investment), batches = asyncio.run(run())
+
+        self.assertEqual(linear.kind, "linear")
+        self.assertAlmostEqual(linear.total_interest, quote_linear_mortgage(200000, 0.04, 30).total_interest)
+        self.assertAlmostEqual(annuity.initial_payment, quote_annuity_mortgage(250000, 0.035, 20).initial_payment)
+        self.assertAlmostEqual(zero_rate.initial_payment, 100000 / 120)
+        self.assertAlmostEqual(gift.tax, gift_tax_result(150000).tax)
+        self.assertAlmostEqual(investment.total_return, project_investment(1000, 0.05, 10).total_return)
+        self.assertEqual(batches, 4)  # one per quote type
+
+    def test_calls_are_micro_batched(self):
+        """Test that concurrent calls share batches and max_batch dispatches early"""
+        async def run():
+            async with AsyncQuoteClient(window=0.05, max_batch=100) as client:
+                results = await asyncio.gather(*(client.gift_tax(100000 + index) for index in range(250)))
+            return results, client.batches, client.quotes
+
+        results, batches, quotes = asyncio.run(run())
+        self.assertEqual(batches, 3)
+        self.assertEqual(quotes, 250)
+        self.assertEqual([result.gift_amount for result in results], [100000 + index for index in range(250)])
+
+    def test_bad_calls_fail_alone(self):
+        """Test that a bad argument raises in its own caller while the rest of the batch is priced"""
+        async def run():
+            async with AsyncQuoteClient(window=0.01) as client:
+                outcomes = await asyncio.gather(client.gift_tax("lots"), client.gift_tax(5000),
+                                                return_exceptions=True)
+                with self.assertRaises(ValueError):
+                    client.quote("balloon_mortgage", 1, 2, 3)
+                with self.assertRaises(TypeError):
+                    client.quote("gift_tax", 1, 2)
+                with self.assertRaises(TypeError):
+                    client.quote("gift_tax", None)
+            return outcomes, client.quotes
+
+        (bad, good), quotes = asyncio.run(run())
+        self.assertIsInstance(bad, ValueError)
+        self.assertEqual(good.gift_amount, 5000)
+        self.assertAlmostEqual(good.tax, gift_tax_result(5000).tax)
+        self.assertEqual(quotes, 1)
+
+        with self.assertRaises(ValueError):
+            AsyncQuoteClient(backend="gpu")
+
+    def test_process_backend(self):
+        """Test that batches priced in a process pool resolve the same results"""
+        async def run():
+            async with AsyncQuoteClient(backend="process", workers=2) as client:
+                return await asyncio.gather(*(client.annuity_mortgage(200000, rate / 100, 30) for rate in range(1, 6)))
+
+        results = asyncio.run(run())
+        for rate, result in zip(range(1, 6), results):
+            self.assertAlmostEqual(result.total_paid, quote_annuity_mortgage(200000, rate / 100, 30).total_paid)
+
+    def test_benchmark_report(self):
+        """Test that the benchmark reports throughput and latency percentiles"""
+        report = asyncio.run(benchmark(requests=500, concurrency=50, window=0.001))
+
+        self.assertEqual(report["requests"], 500)
+        self.assertGreater(report["quotes_per_second"], 0)
+        self.assertGreaterEqual(report["p99_ms"], report["p50_ms"])
+        self.assertGreater(report["mean_batch_size"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
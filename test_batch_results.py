@@ -0,0 +1,151 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from batch_results import (
+    MortgageQuoteBatch,
+    GiftTaxBatch,
+    calculate_annuity_mortgage_payments,
+    calculate_growths_over_n_years,
+    quote_linear_mortgages,
+    quote_annuity_mortgages,
+    quote_interest_only_mortgages,
+    quote_bank_savings_mortgages,
+    quote_mortgages,
+    gift_tax_results,
+    project_investments
+)
+from gifts import gift_tax_result
+from investments import project_investment, calculate_growth_over_n_years
+from mortgage import (
+    quote_linear_mortgage,
+    quote_annuity_mortgage,
+    quote_interest_only_mortgage,
+    quote_bank_savings_mortgage,
+    calculate_annuity_mortgage_payment
+)
+from results import MortgageQuote, GiftTaxResult
+
+
+class TestBatchResults(unittest.TestCase):
+
+    def test_linear_batch_matches_scalar(self):
+        """Test that the vectorized linear quotes match the loop-based scalar quotes"""
+        amounts = [200000, 350000, 1000]
+        rates = [0.05, 0.0412, 0.0]
+        years = [10, 30, 1]
+        batch = quote_linear_mortgages(amounts, rates, years)
+
+        self.assertEqual(len(batch), 3)
+        for i, quote in enumerate(batch):
+            expected = quote_linear_mortgage(amounts[i], rates[i], years[i])
+            self.assertEqual(quote.kind, "linear")
+            for name in MortgageQuote.__slots__[1:]:
+                self.assertAlmostEqual(getattr(quote, name), getattr(expected, name), places=4)
+
+    def test_annuity_batch_matches_scalar(self):
+        """Test that the vectorized annuity quotes match the loop-based scalar quotes"""
+        amounts = [200000, 350000, 1000]
+        rates = [0.05, 0.0412, 0.0]
+        years = [10, 30, 1]
+        batch = quote_annuity_mortgages(amounts, rates, years)
+
+        for i, quote in enumerate(batch):
+            expected = quote_annuity_mortgage(amounts[i], rates[i], years[i])
+            self.assertEqual(quote.kind, "annuity")
+            for name in MortgageQuote.__slots__[1:]:
+                self.assertAlmostEqual(getattr(quote, name), getattr(expected, name), places=4)
+
+        payments = calculate_annuity_mortgage_payments(200000, [0.0, 0.05], 10)
+        self.assertAlmostEqual(payments[0], calculate_annuity_mortgage_payment(200000, 0.0, 10))
+        self.assertAlmostEqual(payments[1], calculate_annuity_mortgage_payment(200000, 0.05, 10))
+
+    def test_legacy_batches_match_scalar(self):
+        """Test that the interest-only and bank-savings batches match their scalar quotes"""
+        amounts = [200000, 350000, 1000]
+        rates = [0.05, 0.0412, 0.0]
+        years = [10, 30, 1]
+
+        for batch_engine, scalar_engine in ((quote_interest_only_mortgages, quote_interest_only_mortgage),
+                                            (quote_bank_savings_mortgages, quote_bank_savings_mortgage)):
+            batch = batch_engine(amounts, rates, years)
+            for i, (amount, rate, duration) in enumerate(zip(amounts, rates, years)):
+                quote = scalar_engine(amount, rate, duration)
+                self.assertEqual(batch[i].kind, quote.kind)
+                for name in ("initial_payment", "final_payment", "total_interest", "total_tax_return", "total_paid"):
+                    self.assertAlmostEqual(getattr(batch, name)[i], getattr(quote, name), places=6)
+
+    def test_mixed_book(self):
+        """Test that a book of mixed kinds is quoted in one pass in its original order"""
+        kinds = ["annuity", "bank_savings", "linear", "interest_only", "annuity"]
+        amounts = [100000, 200000, 300000, 400000, 500000]
+        batch = quote_mortgages(kinds, amounts, 0.04, 30)
+
+        self.assertEqual(list(batch.kind), kinds)
+        expected = {"linear": quote_linear_mortgage, "annuity": quote_annuity_mortgage,
+                    "interest_only": quote_interest_only_mortgage, "bank_savings": quote_bank_savings_mortgage}
+        for i, (kind, amount) in enumerate(zip(kinds, amounts)):
+            quote = expected[kind](amount, 0.04, 30)
+            self.assertEqual(batch[i].years, 30)
+            self.assertAlmostEqual(batch.total_paid[i], quote.total_paid, places=6)
+            self.assertAlmostEqual(batch.initial_payment[i], quote.initial_payment, places=6)
+
+        with self.assertRaises(ValueError):
+            quote_mortgages(["annuity", "balloon"], 100000, 0.04, 30)
+
+    def test_gift_and_investment_batches_match_scalar(self):
+        """Test the gift tax and investment batches against their scalar counterparts"""
+        gifts = [0, 120353, 150000, 258995, 300000]
+        for result, gift in zip(gift_tax_results(gifts), gifts):
+            expected = gift_tax_result(gift)
+            self.assertAlmostEqual(result.tax, expected.tax, places=6)
+            self.assertAlmostEqual(result.net, expected.net, places=6)
+
+        projections = project_investments(1000, [0.0, 0.05, 0.1], [5, 10, 30])
+        for projection, (y, n) in zip(projections, [(0.0, 5), (0.05, 10), (0.1, 30)]):
+            expected = project_investment(1000, y, n)
+            self.assertEqual(projection.years, n)
+            self.assertAlmostEqual(projection.growth, expected.growth, places=9)
+            self.assertAlmostEqual(projection.total_return, expected.total_return, places=6)
+
+        growths = calculate_growths_over_n_years([0.0, 0.07], [1, 20])
+        self.assertAlmostEqual(growths[1], calculate_growth_over_n_years(0.07, 20))
+
+    def test_slicing_round_trip_and_immutability(self):
+        """Test slicing, concatenation, conversion from scalar results and read-only columns"""
+        batch = quote_annuity_mortgages(np.linspace(100000, 500000, 10), 0.04, 30)
+
+        head = batch[:4]
+        self.assertIsInstance(head, MortgageQuoteBatch)
+        self.assertEqual(len(head), 4)
+        self.assertEqual(len(batch[batch.mortgage_amount > 300000]), 5)
+        self.assertEqual(len(MortgageQuoteBatch.concatenate([head, batch[4:]])), 10)
+
+        rebuilt = MortgageQuoteBatch.from_results(list(batch))
+        np.testing.assert_array_equal(rebuilt.total_interest, batch.total_interest)
+
+        with self.assertRaises(ValueError):
+            batch.total_interest[0] = 0
+        with self.assertRaises(AttributeError):
+            batch.total_interest = None
+
+        copy = pickle.loads(pickle.dumps(batch))
+        np.testing.assert_array_equal(copy.total_paid, batch.total_paid)
+
+    def test_column_validation(self):
+        """Test that mismatched or missing columns are rejected"""
+        with self.assertRaises(ValueError):
+            GiftTaxBatch(gift_amount=[1, 2], tax=[0], net=[1, 2])
+        with self.assertRaises(TypeError):
+            GiftTaxBatch(gift_amount=[1], tax=[0])
+
+    def test_memory_footprint(self):
+        """Test that a batch is far smaller than the equivalent list of tuples"""
+        batch = gift_tax_results(np.arange(10000, dtype=float))
+        self.assertEqual(batch.nbytes, 3 * 8 * 10000)
+        self.assertEqual(batch[5], GiftTaxResult(5.0, 0.0, 5.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
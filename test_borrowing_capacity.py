@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from borrowing_capacity import (
+    BorrowingCapacity,
+    HousingCostRatioTable,
+    load_ratio_table,
+    household_incomes,
+    borrowing_capacity,
+    max_mortgage,
+    check_affordability,
+    SECOND_INCOME_SHARE
+)
+from mortgage import calculate_annuity_mortgage_payment
+
+
+class TestBorrowingCapacity(unittest.TestCase):
+
+    def setUp(self):
+        self.table = load_ratio_table()
+
+    def test_table_lookup(self):
+        """Test that incomes and rates fall in the band starting at or below them"""
+        self.assertEqual(float(self.table.ratios_for(60000, 0.04)), 27.5)
+        self.assertEqual(float(self.table.ratios_for(59999.99, 0.04)), 26.5)
+        self.assertEqual(float(self.table.ratios_for(60000, 0.0399)), 26.5)
+        self.assertEqual(float(self.table.ratios_for(500000, 0.09)), 33.5)
+        self.assertEqual(float(self.table.ratios_for(-5, -0.01)), 15.0)
+
+        np.testing.assert_array_equal(self.table.ratios_for([20000, 120000], [0.0, 0.06]), [17.0, 33.5])
+
+    def test_table_from_csv(self):
+        """Test that rows and columns are sorted when compiled and malformed tables are rejected"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ratios.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("# comment\nincome_from,0.03,0.00\n50000,30,25\n0,20,15\n")
+            table = HousingCostRatioTable.from_csv(path)
+
+        np.testing.assert_array_equal(table.income_edges, [0, 50000])
+        np.testing.assert_array_equal(table.rate_edges, [0.0, 0.03])
+        np.testing.assert_array_equal(table.ratios, [[15, 20], [25, 30]])
+
+        with self.assertRaises(ValueError):
+            HousingCostRatioTable([0, 1], [0.0], [[1.0]])
+        with self.assertRaises(ValueError):
+            HousingCostRatioTable([1, 0], [0.0], [[1.0], [2.0]])
+
+    def test_household_incomes(self):
+        """Test that the lower of two incomes is weighed"""
+        self.assertEqual(float(household_incomes(50000)), 50000)
+        self.assertAlmostEqual(float(household_incomes(30000, 50000)), 50000 + SECOND_INCOME_SHARE * 30000)
+        with self.assertRaises(ValueError):
+            household_incomes(-1)
+
+    def test_max_loan_inverts_annuity(self):
+        """Test that the annuity payment of the maximum loan equals the monthly budget"""
+        loan = max_mortgage(60000, 0.04)
+        self.assertAlmostEqual(calculate_annuity_mortgage_payment(loan, 0.04, 30), 60000 * 0.275 / 12)
+
+        self.assertAlmostEqual(max_mortgage(60000, 0.0, years=20), 60000 * 0.245 / 12 * 240)
+        self.assertGreater(max_mortgage(60000, 0.04, partner_income=30000), loan)
+
+    def test_portfolio_is_vectorized(self):
+        """Test that a portfolio gives the same capacities as applicant by applicant"""
+        rng = np.random.default_rng(5)
+        incomes = rng.uniform(10000, 150000, 300)
+        partners = rng.choice([0, 25000, 60000], 300)
+        rates = np.round(rng.uniform(0.0, 0.07, 300), 4)
+        years = rng.choice([20, 30], 300)
+
+        capacity = borrowing_capacity(incomes, rates, years, partners)
+        expected = [max_mortgage(*row) for row in zip(incomes, rates, years, partners)]
+        np.testing.assert_allclose(capacity.max_loan, expected)
+        self.assertEqual(capacity.housing_cost_ratio.shape, (300,))
+
+        affordable = check_affordability(capacity.max_loan * 0.99, incomes, rates, years, partners)
+        self.assertTrue(affordable.all())
+        self.assertFalse(check_affordability(capacity.max_loan * 1.01, incomes, rates, years, partners).any())
+
+    def test_capacity_is_an_immutable_record(self):
+        """Test that capacities compare by their columns, print their fields and cannot be changed"""
+        capacity = borrowing_capacity([40000, 80000], [0.03, np.nan])
+        again = borrowing_capacity([40000, 80000], [0.03, np.nan])
+
+        self.assertEqual(capacity, again)
+        self.assertNotEqual(capacity, borrowing_capacity([40000, 80000], [0.03, 0.04]))
+        self.assertIn("max_loan=array(", repr(capacity))
+        self.assertEqual(list(capacity.columns()), list(BorrowingCapacity.__slots__))
+        with self.assertRaises(AttributeError):
+            capacity.max_loan = np.zeros(2)
+        with self.assertRaises(TypeError):
+            hash(capacity)
+        with self.assertRaises(TypeError):
+            BorrowingCapacity(household_income=capacity.household_income)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+
+from batch_results import quote_annuity_mortgages, MortgageQuoteBatch
+from columnar import (
+    ColumnarWriter,
+    ColumnarReader,
+    write_schedule,
+    read_schedule,
+    write_batch,
+    write_sweep
+)
+from schedules import annuity_schedules
+from sweeps import make_grid
+
+
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "data.ftcol")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_streaming_chunks_round_trip(self):
+        """Test that appended chunks are read back per chunk and as whole columns"""
+        with ColumnarWriter(self.path, {"month": np.int32, "amount": np.float64},
+                            compression={"amount": "zlib"}, attrs={"source": "test"}) as writer:
+            writer.append({"month": np.arange(3), "amount": [1.0, 2.0, 3.0]})
+            writer.append({"month": np.arange(3, 5), "amount": [4.0, 5.0]})
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(len(reader), 5)
+        self.assertEqual(reader.attrs, {"source": "test"})
+        self.assertEqual(reader.dtypes["month"], np.dtype(np.int32))
+        np.testing.assert_array_equal(reader.column("month"), np.arange(5))
+        np.testing.assert_array_equal(reader.column("amount"), [1, 2, 3, 4, 5])
+        self.assertEqual([len(chunk["amount"]) for chunk in reader.iter_chunks()], [3, 2])
+
+    def test_uncompressed_columns_are_memory_mapped(self):
+        """Test that single-chunk uncompressed columns are read-only memory-mapped views"""
+        with ColumnarWriter(self.path) as writer:
+            writer.append({"value": np.linspace(0, 1, 1000)})
+
+        value = ColumnarReader(self.path).column("value")
+        self.assertIsInstance(value, np.memmap)
+        self.assertFalse(value.flags.writeable)
+        self.assertEqual(value.ctypes.data % 8, 0)
+        np.testing.assert_array_equal(value, np.linspace(0, 1, 1000))
+
+    def test_schedule_round_trip(self):
+        """Test that single and batched schedules survive a round trip"""
+        schedule = annuity_schedules([200000, 300000], [0.04, 0.05], [20, 30])
+        write_schedule(self.path, schedule, compression={"balance": "zlib"})
+        restored = read_schedule(self.path)
+        self.assertEqual(restored.payment.shape, (2, 360))
+        np.testing.assert_array_equal(restored.balance, schedule.balance)
+
+        write_schedule(self.path, schedule[0])
+        np.testing.assert_array_equal(read_schedule(self.path).interest, schedule[0].interest)
+
+    def test_batch_and_sweep(self):
+        """Test result batches in several chunks and sweep cubes with their axes"""
+        batch = quote_annuity_mortgages(np.linspace(100000, 500000, 10), 0.04, 30)
+        write_batch(self.path, batch, chunk_rows=4)
+        reader = ColumnarReader(self.path)
+        self.assertEqual(len(reader.chunks), 3)
+        self.assertEqual(reader.attrs["kind"], "MortgageQuoteBatch")
+        restored = MortgageQuoteBatch(**reader.read())
+        self.assertEqual(list(restored), list(batch))
+
+        axes = {"mortgage_amount": [100000, 200000], "interest_rate": [0.03, 0.04, 0.05], "years": [10, 30]}
+        grid = make_grid(**axes)
+        write_sweep(self.path, axes, {"total_interest": grid["mortgage_amount"] * grid["interest_rate"]})
+        cube = ColumnarReader(self.path).cube("total_interest")
+        self.assertEqual(cube.shape, (2, 3, 2))
+        self.assertAlmostEqual(cube[1, 2, 0], 200000 * 0.05)
+
+    def test_invalid_files(self):
+        """Test that unclosed files, foreign files and bad schemas are rejected"""
+        writer = ColumnarWriter(self.path)
+        writer._file.flush()
+        with self.assertRaises(ValueError):
+            ColumnarReader(self.path)
+        writer.append({"a": [1.0]})
+        writer._file.flush()
+        with self.assertRaises(ValueError):
+            ColumnarReader(self.path)
+        with self.assertRaises(ValueError):
+            writer.append({"b": [1.0]})
+        with self.assertRaises(ValueError):
+            writer.append({"a": [1.0, 2.0], "b": [1.0]})
+        writer.close()
+
+        with open(self.path, "wb") as file:
+            file.write(b"not a columnar file at all")
+        with self.assertRaises(ValueError):
+            ColumnarReader(self.path)
+        with self.assertRaises(ValueError):
+            ColumnarWriter(self.path, compression={"a": "lz4"})
+        with self.assertRaises(ValueError):
+            ColumnarWriter(self.path, schema={"a": np.float64}, compression={"b": "zlib"})
+
+    def test_invalid_arguments_keep_existing_file(self):
+        """Test that a rejected writer neither truncates the target nor leaves it open"""
+        with ColumnarWriter(self.path) as writer:
+            writer.append({"a": np.arange(10.0)})
+        size = os.path.getsize(self.path)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", ResourceWarning)
+            with self.assertRaises(ValueError):
+                ColumnarWriter(self.path, compression={"a": "lz4"})
+
+        self.assertEqual(os.path.getsize(self.path), size)
+        np.testing.assert_array_equal(ColumnarReader(self.path).column("a"), np.arange(10.0))
+
+    def test_lossy_chunks_are_rejected(self):
+        """Test that a later chunk that does not fit the schema of the first one is refused"""
+        with ColumnarWriter(self.path) as writer:
+            writer.append({"label": np.array(["ab", "cd"]), "count": np.array([1, 2])})
+            with self.assertRaises(ValueError):
+                writer.append({"label": np.array(["abcdef"]), "count": np.array([3])})
+            with self.assertRaises(ValueError):
+                writer.append({"label": np.array(["ef", "gh"]), "count": np.array([2.75, 1e30])})
+            writer.append({"label": np.array(["e", "fg"]), "count": np.array([3, 4], dtype=np.int32)})
+
+        reader = ColumnarReader(self.path)
+        self.assertEqual(reader.column("label").tolist(), ["ab", "cd", "e", "fg"])
+        np.testing.assert_array_equal(reader.column("count"), [1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
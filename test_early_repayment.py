@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from constants import interest_rates
+from early_repayment import (
+    current_interest_rates,
+    calculate_penalties,
+    early_repayment_penalty,
+    iter_penalty_chunks,
+    summarize_penalties,
+    PenaltySummary
+)
+
+
+class TestEarlyRepayment(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        self.balances = rng.uniform(50000, 500000, 1000)
+        self.contract_rates = np.round(rng.uniform(0.02, 0.06, 1000), 4)
+        self.remaining_months = rng.integers(1, 181, 1000)
+        self.portions = rng.uniform(0.4, 1.0, 1000)
+
+    def test_current_rates_from_sheet(self):
+        """Test that the remaining period and portion select the rate-sheet entry"""
+        rates = current_interest_rates([12, 13, 60, 61, 240], 0.8)
+        expected = [interest_rates[key]["≤85%"] / 100 for key in ("Variable", "5", "5", "10", "20")]
+        np.testing.assert_allclose(rates, expected)
+        self.assertAlmostEqual(float(current_interest_rates(120, "NHG")), interest_rates["10"]["NHG"] / 100)
+
+    def test_penalty_matches_discounted_sum(self):
+        """Test the closed form against the month-by-month present value"""
+        balance, free, contract, current, months = 250000, 25000, 0.05, 0.03, 84
+        monthly_loss = (balance - free) * (contract - current) / 12
+        expected = sum(monthly_loss / (1 + current / 12) ** month for month in range(1, months + 1))
+
+        self.assertAlmostEqual(early_repayment_penalty(balance, contract, months, free, current_rate=current),
+                               expected, places=6)
+        self.assertAlmostEqual(early_repayment_penalty(balance, contract, months, free, current_rate=0.0),
+                               (balance - free) * contract / 12 * months, places=6)
+
+    def test_no_penalty_cases(self):
+        """Test that no penalty is due when rates rose, within the allowance or after the fixed period"""
+        penalties = calculate_penalties([200000, 200000, 200000, 200000], [0.03, 0.05, 0.05, 0.05],
+                                        [60, 60, 60, 0], [0, 250000, 0, 0], current_rates=[0.04, 0.03, 0.05, 0.03])
+        np.testing.assert_array_equal(penalties, [0, 0, 0, 0])
+
+        self.assertGreater(early_repayment_penalty(200000, 0.06, 60, portion=0.8), 0)
+        with self.assertRaises(ValueError):
+            calculate_penalties(200000, 0.05, 60)
+
+    def test_streaming_matches_full_book(self):
+        """Test that chunked penalties and their summary match the whole book at once"""
+        full = calculate_penalties(self.balances, self.contract_rates, self.remaining_months,
+                                   0.1 * self.balances, portions=self.portions)
+        chunks = list(iter_penalty_chunks(self.balances, self.contract_rates, self.remaining_months,
+                                          0.1 * self.balances, portions=self.portions, chunk_size=300))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [300, 300, 300, 100])
+        np.testing.assert_allclose(np.concatenate(chunks), full)
+
+        summary = summarize_penalties(self.balances, self.contract_rates, self.remaining_months,
+                                      0.1 * self.balances, portions=self.portions, chunk_size=250)
+        self.assertAlmostEqual(summary.total / full.sum(), 1.0)
+        self.assertEqual(summary.charged, int(np.count_nonzero(full > 0)))
+        self.assertEqual(summary.histogram.total, 1000)
+        self.assertEqual(summary.moments.maximum, full.max())
+
+    def test_summaries_merge(self):
+        """Test that summaries of separate parts of a book merge to the whole"""
+        first = PenaltySummary().update(calculate_penalties(self.balances[:400], 0.05, 60, current_rates=0.03))
+        second = PenaltySummary().update(calculate_penalties(self.balances[400:], 0.05, 60, current_rates=0.03))
+        whole = summarize_penalties(self.balances, 0.05, 60, current_rates=0.03)
+
+        first.merge(second)
+        self.assertEqual(first.charged, whole.charged)
+        self.assertAlmostEqual(first.total / whole.total, 1.0)
+        np.testing.assert_array_equal(first.histogram.counts, whole.histogram.counts)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+from constants import INTEREST_DEDUCTION, INTEREST_DEDUCTION_RATES
+from interest_deduction import (
+    DeductionRateSchedule,
+    bucket_by_calendar_year,
+    calculate_yearly_deductions,
+    yearly_deductions
+)
+from mortgage import calculate_total_linear_interest
+from schedules import linear_schedules
+
+
+class TestInterestDeduction(unittest.TestCase):
+
+    def test_rate_schedule_lookup(self):
+        """Test per-year rates including years outside the table"""
+        schedule = DeductionRateSchedule()
+        self.assertAlmostEqual(schedule.rate_for(2021), 0.43)
+        self.assertAlmostEqual(schedule.rate_for(2010), INTEREST_DEDUCTION_RATES[2019] / 100)
+        self.assertAlmostEqual(schedule.rate_for(2040), INTEREST_DEDUCTION_RATES[2025] / 100)
+        np.testing.assert_allclose(schedule.rates_for([2022, 2023]), [0.40, 0.3693])
+
+        with self.assertRaises(ValueError):
+            DeductionRateSchedule({})
+
+    def test_bucket_by_calendar_year(self):
+        """Test that months are summed into the right calendar years"""
+        monthly = np.ones(24)
+        np.testing.assert_array_equal(bucket_by_calendar_year(monthly, 1), [12, 12])
+        np.testing.assert_array_equal(bucket_by_calendar_year(monthly, 10), [3, 12, 9])
+
+        buckets = bucket_by_calendar_year(np.ones((2, 24)), [1, 7])
+        np.testing.assert_array_equal(buckets, [[12, 12, 0], [6, 12, 6]])
+
+        with self.assertRaises(ValueError):
+            bucket_by_calendar_year(monthly, 13)
+
+    def test_flat_rate_matches_existing_loop(self):
+        """Test that a flat schedule gives the same total as the existing interest loop"""
+        flat = DeductionRateSchedule({2000: INTEREST_DEDUCTION})
+        deductions = yearly_deductions("linear", 200000, 0.05, 10, 2024, 3, rate_schedule=flat)
+        total_interest, total_tax_return = calculate_total_linear_interest(200000, 0.05, 10)
+
+        self.assertEqual(deductions.first_year, 2024)
+        self.assertEqual(len(deductions.interest), 11)
+        self.assertAlmostEqual(deductions.interest.sum(), total_interest, places=4)
+        self.assertAlmostEqual(deductions.total_tax_return, total_tax_return, places=4)
+
+    def test_phase_down_and_thirty_year_cap(self):
+        """Test that each year uses its own rate and interest after 30 years is not deductible"""
+        schedule = linear_schedules(300000, 0.04, 35)
+        deductions = calculate_yearly_deductions(schedule.interest, 2020)
+
+        rates = DeductionRateSchedule().rates_for(deductions.calendar_years())
+        self.assertAlmostEqual(deductions.tax_return[0], deductions.interest[0] * 0.46)
+        self.assertAlmostEqual(deductions.tax_return[2], deductions.interest[2] * 0.40)
+        np.testing.assert_allclose(deductions.tax_return[:30], deductions.interest[:30] * rates[:30])
+        np.testing.assert_array_equal(deductions.tax_return[30:], 0)
+        self.assertGreater(deductions.net_interest[31], 0)
+
+        # Months already deducted on a previous loan shorten the deductible window
+        carried = calculate_yearly_deductions(schedule.interest, 2020, deducted_months=25 * 12)
+        np.testing.assert_array_equal(carried.deductible_interest[5:], 0)
+
+    def test_portfolio_batch(self):
+        """Test that a batch gives the same rows as single-loan calls"""
+        deductions = yearly_deductions("annuity", [200000, 400000], [0.04, 0.05], [30, 20], [2022, 2024], [1, 6])
+        single = yearly_deductions("annuity", 400000, 0.05, 20, 2024, 6)
+
+        self.assertEqual(deductions.interest.shape[0], 2)
+        np.testing.assert_allclose(deductions.tax_return[1, :len(single.tax_return)], single.tax_return)
+        np.testing.assert_array_equal(deductions.calendar_years()[1, :2], [2024, 2025])
+
+
+if __name__ == '__main__':
+    unittest.main()
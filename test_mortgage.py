@@ -12,7 +12,13 @@ from mortgage import (
     linear_mortgage,
     calculate_annuity_mortgage_payment,
     calculate_total_annuity_interest,
-    annuity_mortgage
+    annuity_mortgage,
+    quote_linear_mortgage,
+    quote_annuity_mortgage,
+    calculate_interest_only_mortgage,
+    quote_interest_only_mortgage,
+    calculate_bank_savings_deposit,
+    quote_bank_savings_mortgage
 )
 from constants import interest_rates, INTEREST_DEDUCTION
 
@@ -196,6 +202,53 @@ class TestMortgage(unittest.TestCase):
         self.assertIn("Total Gross amount paid over 10 years: €", output)
         self.assertIn("Total Net amount (after Tax return) paid over 10 years: €", output)
         
+    def test_quote_mortgages(self):
+        """Test that the quote objects carry the same numbers as the tuple-based functions"""
+        initial_payment, final_payment, principal, total_interest, total_tax_return = (
+            calculate_dutch_linear_mortgage(200000, 0.05, 10)
+        )
+        quote = quote_linear_mortgage(200000, 0.05, 10)
+        self.assertEqual(quote.kind, "linear")
+        self.assertEqual(quote.initial_payment, initial_payment)
+        self.assertEqual(quote.final_payment, final_payment)
+        self.assertEqual(quote.total_interest, total_interest)
+        self.assertEqual(quote.total_paid, principal + total_interest)
+
+        quote = quote_annuity_mortgage(200000, 0.05, 10)
+        self.assertEqual(quote.initial_payment, calculate_annuity_mortgage_payment(200000, 0.05, 10))
+        self.assertEqual(quote.initial_payment, quote.final_payment)
+        self.assertAlmostEqual(quote.total_paid, quote.mortgage_amount + quote.total_interest, places=6)
+
+    def test_interest_only_mortgage(self):
+        """Test the interest-only engine against its month-by-month definition"""
+        monthly_interest, total_interest, total_tax_return = calculate_interest_only_mortgage(200000, 0.05, 10)
+        self.assertAlmostEqual(monthly_interest, 200000 * 0.05 / 12)
+        self.assertAlmostEqual(total_interest, sum(200000 * 0.05 / 12 for _ in range(120)))
+        self.assertAlmostEqual(total_tax_return, total_interest * INTEREST_DEDUCTION / 100)
+
+        quote = quote_interest_only_mortgage(200000, 0.05, 10)
+        self.assertEqual(quote.kind, "interest_only")
+        self.assertEqual(quote.initial_payment, quote.final_payment)
+        self.assertAlmostEqual(quote.total_paid, 200000 + total_interest)
+        self.assertEqual(quote_interest_only_mortgage(200000, 0.0, 10).total_interest, 0)
+
+    def test_bank_savings_mortgage(self):
+        """Test that the savings deposits repay the loan and the payment equals the annuity"""
+        deposit = calculate_bank_savings_deposit(200000, 0.04, 30)
+        savings = 0
+        for _ in range(360):
+            savings = savings * (1 + 0.04 / 12) + deposit
+        self.assertAlmostEqual(savings, 200000, places=6)
+        self.assertAlmostEqual(calculate_bank_savings_deposit(120000, 0.0, 10), 1000)
+
+        quote = quote_bank_savings_mortgage(200000, 0.04, 30)
+        self.assertEqual(quote.kind, "bank_savings")
+        self.assertAlmostEqual(quote.initial_payment, calculate_annuity_mortgage_payment(200000, 0.04, 30))
+        self.assertAlmostEqual(quote.total_interest, quote_interest_only_mortgage(200000, 0.04, 30).total_interest)
+        self.assertAlmostEqual(quote.total_tax_return, quote.total_interest * INTEREST_DEDUCTION / 100)
+        self.assertAlmostEqual(quote.total_paid, quote.initial_payment * 360)
+        self.assertLess(quote.total_paid, 200000 + quote.total_interest)
+
     def test_edge_cases(self):
         """Test edge cases and boundary conditions"""
         # Test with very small mortgage amount
@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+from mortgage import find_interest_rate, quote_linear_mortgage, quote_annuity_mortgage
+from multi_part import LoanPart, MultiPartMortgage, price_portfolio, price_portfolio_totals
+from schedules import annuity_schedules, linear_schedules, interest_only_schedules
+
+
+class TestMultiPart(unittest.TestCase):
+
+    def setUp(self):
+        self.mortgage = MultiPartMortgage([
+            LoanPart("annuity", 200000, years=30, fixed_years=10),
+            LoanPart("linear", 100000, years=20, fixed_years=5),
+            LoanPart("interest_only", 50000, years=30, fixed_years=30, interest_rate=0.05)
+        ], house_price=400000)
+
+    def test_part_rates_use_rate_table(self):
+        """Test that parts without a rate are priced by their fixed period and the total loan-to-value"""
+        rates = self.mortgage.part_rates()
+        portion = 350000 / 400000
+        self.assertEqual(rates[0], round(find_interest_rate(10, portion) / 100, 4))
+        self.assertEqual(rates[1], round(find_interest_rate(5, portion) / 100, 4))
+        self.assertEqual(rates[2], 0.05)
+
+        self.assertEqual(MultiPartMortgage([LoanPart("annuity", 1000)], nhg=True).part_rates(),
+                         [round(find_interest_rate(10, "NHG") / 100, 4)])
+        with self.assertRaises(ValueError):
+            MultiPartMortgage([LoanPart("annuity", 1000)]).part_rates()
+
+    def test_quotes_use_mortgage_engines(self):
+        """Test that each part is quoted by the matching mortgage.py engine"""
+        quotes = self.mortgage.quotes()
+        rates = self.mortgage.part_rates()
+        self.assertEqual(quotes[0], quote_annuity_mortgage(200000, rates[0], 30))
+        self.assertEqual(quotes[1], quote_linear_mortgage(100000, rates[1], 20))
+        self.assertAlmostEqual(quotes[2].total_interest, 50000 * 0.05 * 30, places=6)
+
+    def test_combined_schedule_is_sum_of_parts(self):
+        """Test that the combined schedule adds the per-part schedules month by month"""
+        rates = self.mortgage.part_rates()
+        schedule = self.mortgage.schedule()
+
+        expected = annuity_schedules(200000, rates[0], 30).payment.copy()
+        expected[:240] += linear_schedules(100000, rates[1], 20).payment
+        expected += interest_only_schedules(50000, 0.05, 30).payment
+
+        np.testing.assert_allclose(schedule.payment, expected)
+        self.assertAlmostEqual(schedule.principal.sum(), 350000, places=4)
+        self.assertAlmostEqual(schedule.balance[-1], 0, places=6)
+
+    def test_late_start_alignment(self):
+        """Test that a part starting later is shifted to its start month"""
+        mortgage = MultiPartMortgage([
+            LoanPart("linear", 12000, years=1, interest_rate=0.0),
+            LoanPart("linear", 12000, years=1, interest_rate=0.0, start_month=6)
+        ])
+        schedule = mortgage.schedule()
+        self.assertEqual(schedule.months, 18)
+        np.testing.assert_allclose(schedule.payment[:6], 1000)
+        np.testing.assert_allclose(schedule.payment[6:12], 2000)
+        np.testing.assert_allclose(schedule.payment[12:], 1000)
+
+        with self.assertRaises(ValueError):
+            LoanPart("linear", 1000, start_month=-1)
+
+    def test_portfolio_batch(self):
+        """Test that a portfolio batch gives the same rows as pricing each mortgage alone"""
+        other = MultiPartMortgage([LoanPart("annuity", 150000, years=10, interest_rate=0.04)])
+        schedule = price_portfolio([self.mortgage, other])
+
+        self.assertEqual(schedule.payment.shape, (2, 360))
+        np.testing.assert_allclose(schedule[0].payment, self.mortgage.schedule().payment)
+        np.testing.assert_allclose(schedule[1].payment[:120], annuity_schedules(150000, 0.04, 10).payment)
+
+        totals = price_portfolio_totals([self.mortgage, other])
+        self.assertAlmostEqual(totals["total_interest"][1], quote_annuity_mortgage(150000, 0.04, 10).total_interest,
+                               places=4)
+        self.assertAlmostEqual(totals["first_payment"][0], schedule.payment[0, 0])
+
+    def test_chunked_totals_match_schedules(self):
+        """Test that totals priced in small chunks equal the totals of the combined schedules"""
+        rng = np.random.default_rng(3)
+        kinds = ["linear", "annuity", "interest_only"]
+        mortgages = [MultiPartMortgage([LoanPart(kinds[(index + offset) % 3], float(rng.uniform(10000, 300000)),
+                                                 years=int(rng.choice([10, 20, 30])),
+                                                 interest_rate=float(rng.uniform(0.0, 0.06)),
+                                                 start_month=int(rng.choice([0, 0, 24])))
+                                        for offset in range(1 + index % 3)])
+                     for index in range(40)]
+
+        schedule = price_portfolio(mortgages)
+        totals = price_portfolio_totals(mortgages, chunk_size=7)
+        np.testing.assert_allclose(totals["first_payment"], schedule.payment[:, 0])
+        np.testing.assert_allclose(totals["total_interest"], schedule.total_interest)
+        np.testing.assert_allclose(totals["total_tax_return"], schedule.total_tax_return)
+        np.testing.assert_allclose(totals["total_paid"], schedule.total_paid)
+
+
+if __name__ == '__main__':
+    unittest.main()
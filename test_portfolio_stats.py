@@ -0,0 +1,151 @@
+import os
+import pickle
+import tempfile
+import unittest
+
+import numpy as np
+
+from batch_results import quote_annuity_mortgages, quote_linear_mortgages
+from columnar import ColumnarWriter, ColumnarReader
+from portfolio_stats import (
+    RunningMoments,
+    FixedHistogram,
+    PortfolioAggregator,
+    iter_quote_chunks,
+    aggregate_portfolio,
+    aggregate_in_parallel,
+    _chunk_source
+)
+
+
+class TestPortfolioStats(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.amounts = rng.uniform(50000, 600000, 2500)
+        self.rates = rng.uniform(0.01, 0.06, 2500)
+        self.years = rng.choice([10, 20, 30], 2500)
+
+    def test_running_moments(self):
+        """Test that chunked and merged moments match the moments of all values"""
+        values = np.random.default_rng(1).normal(1000, 250, 1001)
+        moments = RunningMoments()
+        for chunk in np.array_split(values, 7):
+            moments.update(chunk)
+        moments.update([])
+
+        self.assertEqual(moments.count, 1001)
+        self.assertAlmostEqual(moments.mean, values.mean())
+        self.assertAlmostEqual(moments.variance, values.var())
+        self.assertAlmostEqual(moments.total, values.sum(), places=6)
+        self.assertEqual(moments.minimum, values.min())
+        self.assertEqual(moments.maximum, values.max())
+
+        left, right = RunningMoments(), RunningMoments()
+        left.update(values[:300])
+        right.update(values[300:])
+        left.merge(right)
+        self.assertAlmostEqual(left.std, values.std())
+        self.assertTrue(np.isnan(RunningMoments().variance))
+
+    def test_fixed_histogram(self):
+        """Test bin counts, under- and overflow and merging"""
+        histogram = FixedHistogram([0, 10, 20])
+        histogram.update([-1, 0, 5, 10, 19.9, 20, 25])
+        np.testing.assert_array_equal(histogram.counts, [2, 2])
+        self.assertEqual(histogram.underflow, 1)
+        self.assertEqual(histogram.overflow, 2)
+
+        other = FixedHistogram([0, 10, 20])
+        other.update([15])
+        histogram.merge(other)
+        np.testing.assert_array_equal(histogram.counts, [2, 3])
+        self.assertEqual(histogram.total, 8)
+
+        with self.assertRaises(ValueError):
+            histogram.merge(FixedHistogram([0, 5, 20]))
+        with self.assertRaises(ValueError):
+            FixedHistogram([10, 0])
+
+    def test_streaming_matches_full_batch(self):
+        """Test that aggregating chunks gives the statistics of the whole book"""
+        aggregator = aggregate_portfolio(iter_quote_chunks("annuity", self.amounts, self.rates, self.years, 300))
+        quotes = quote_annuity_mortgages(self.amounts, self.rates, self.years)
+
+        self.assertEqual(aggregator.count, 2500)
+        summary = aggregator.summary()
+        self.assertAlmostEqual(summary["monthly_payment"]["mean"], quotes.initial_payment.mean())
+        self.assertAlmostEqual(summary["total_interest"]["total"] / quotes.total_interest.sum(), 1.0)
+        self.assertAlmostEqual(summary["total_tax_return"]["max"], quotes.total_tax_return.max())
+        self.assertEqual(aggregator.histograms["total_interest"].total, 2500)
+
+        expected, _ = np.histogram(quotes.initial_payment, bins=aggregator.histograms["monthly_payment"].edges)
+        np.testing.assert_array_equal(aggregator.histograms["monthly_payment"].counts, expected)
+
+    def test_merge_and_pickle(self):
+        """Test that partial aggregators survive pickling and merge to the full result"""
+        first = PortfolioAggregator().consume(quote_linear_mortgages(self.amounts[:1000], self.rates[:1000],
+                                                                     self.years[:1000]))
+        second = PortfolioAggregator().consume(quote_linear_mortgages(self.amounts[1000:], self.rates[1000:],
+                                                                      self.years[1000:]))
+        merged = pickle.loads(pickle.dumps(first)).merge(pickle.loads(pickle.dumps(second)))
+        whole = PortfolioAggregator().consume(quote_linear_mortgages(self.amounts, self.rates, self.years))
+
+        for name, stats in whole.summary().items():
+            for key, value in stats.items():
+                self.assertAlmostEqual(merged.summary()[name][key] / value, 1.0)
+            np.testing.assert_array_equal(merged.histograms[name].counts, whole.histograms[name].counts)
+
+    def test_parallel_aggregation(self):
+        """Test that worker partials combine to the sequential result"""
+        sequential = aggregate_portfolio(iter_quote_chunks("linear", self.amounts, self.rates, self.years, 500))
+        parallel = aggregate_in_parallel("linear", self.amounts, self.rates, self.years, workers=2, chunk_size=400)
+
+        self.assertEqual(parallel.count, 2500)
+        self.assertAlmostEqual(parallel.summary()["total_interest"]["mean"],
+                               sequential.summary()["total_interest"]["mean"])
+        np.testing.assert_array_equal(parallel.histograms["total_tax_return"].counts,
+                                      sequential.histograms["total_tax_return"].counts)
+
+    def test_parallel_aggregation_broadcasts_scalars(self):
+        """Test that scalar inputs are broadcast over every chunk"""
+        sequential = aggregate_portfolio(iter_quote_chunks("annuity", self.amounts, 0.04, 30, 500))
+        parallel = aggregate_in_parallel("annuity", self.amounts, 0.04, 30, workers=3, chunk_size=300)
+
+        self.assertEqual(parallel.count, 2500)
+        self.assertAlmostEqual(parallel.summary()["monthly_payment"]["total"] /
+                               sequential.summary()["monthly_payment"]["total"], 1.0)
+
+    def test_parallel_aggregation_of_memory_mapped_book(self):
+        """Test that workers map columnar files themselves instead of receiving their rows"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "book.ftcol")
+            with ColumnarWriter(path) as writer:
+                writer.append({"amount": self.amounts, "rate": self.rates})
+            reader = ColumnarReader(path)
+            amounts, rates = reader.column("amount"), reader.column("rate")
+
+            source = _chunk_source(amounts, 1000, 1500)
+            self.assertIsInstance(source, tuple)
+            self.assertEqual(source[3], 500)
+
+            parallel = aggregate_in_parallel("annuity", amounts, rates, self.years, workers=2, chunk_size=300)
+            del amounts, rates
+
+        sequential = aggregate_portfolio(iter_quote_chunks("annuity", self.amounts, self.rates, self.years, 500))
+        self.assertEqual(parallel.count, 2500)
+        self.assertAlmostEqual(parallel.summary()["total_interest"]["total"] /
+                               sequential.summary()["total_interest"]["total"], 1.0)
+        np.testing.assert_array_equal(parallel.histograms["monthly_payment"].counts,
+                                      sequential.histograms["monthly_payment"].counts)
+
+    def test_invalid_kind(self):
+        """Test that unknown mortgage kinds are rejected"""
+        with self.assertRaises(ValueError):
+            next(iter_quote_chunks("balloon", self.amounts, self.rates, self.years))
+        with self.assertRaises(ValueError):
+            aggregate_in_parallel("balloon", self.amounts, self.rates, self.years, workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import datetime
+import unittest
+
+import numpy as np
+
+from constants import interest_rates
+from mortgage import find_interest_rate, find_year_key, find_portion_key
+from rate_history import (
+    RateSheetHistory,
+    YEAR_KEYS,
+    PORTION_KEYS,
+    year_key_indices,
+    portion_key_indices
+)
+
+
+def _shifted(sheet, shift):
+    return {year_key: {portion_key: rate + shift for portion_key, rate in rates.items()}
+            for year_key, rates in sheet.items()}
+
+
+class TestRateHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.history = RateSheetHistory([
+            (datetime.date(2024, 1, 1), _shifted(interest_rates, 1.0)),
+            (datetime.date(2025, 1, 1), interest_rates),
+            (datetime.date(2024, 7, 1), _shifted(interest_rates, 0.5))
+        ])
+
+    def test_bucket_indices_match_scalar_keys(self):
+        """Test that the vectorized buckets agree with find_year_key and find_portion_key"""
+        years = [0.5, 1, 3, 5, 7, 10, 12, 15, 18, 20, 25, 30]
+        np.testing.assert_array_equal(year_key_indices(years),
+                                      [YEAR_KEYS.index(find_year_key(int(year))) for year in years])
+
+        portions = [0.5, 0.65, 0.7, 0.85, 0.87, 0.90, 0.95, 1.0]
+        np.testing.assert_array_equal(portion_key_indices(portions),
+                                      [PORTION_KEYS.index(find_portion_key(portion)) for portion in portions])
+        np.testing.assert_array_equal(portion_key_indices(np.array(["NHG", 0.5], dtype=object)), [0, 1])
+        self.assertEqual(int(portion_key_indices("NHG")), 0)
+        np.testing.assert_array_equal(portion_key_indices([2.0, 0.5], nhg=[True, False]), [0, 1])
+
+        with self.assertRaises(ValueError):
+            portion_key_indices([0.5, 1.1])
+
+    def test_as_of_lookup(self):
+        """Test that each date resolves to the last sheet effective on or before it"""
+        self.assertEqual(len(self.history), 3)
+        self.assertEqual(self.history.find_interest_rate(datetime.date(2024, 3, 1), 10, 0.7),
+                         interest_rates["10"]["≤85%"] + 1.0)
+        self.assertEqual(self.history.find_interest_rate(datetime.date(2024, 7, 1), 10, 0.7),
+                         interest_rates["10"]["≤85%"] + 0.5)
+        self.assertEqual(self.history.find_interest_rate("2026-05-01", 30, "NHG"), interest_rates["30"]["NHG"])
+
+        with self.assertRaises(ValueError):
+            self.history.sheet_as_of(datetime.date(2023, 12, 31))
+        with self.assertRaises(ValueError):
+            self.history.add(datetime.date(2024, 1, 1), interest_rates)
+
+    def test_find_interest_rate_accepts_a_sheet(self):
+        """Test that find_interest_rate uses the given sheet and defaults to the current one"""
+        sheet = self.history.sheet_as_of(datetime.date(2024, 2, 1))
+        self.assertEqual(find_interest_rate(5, 0.7, rates=sheet), interest_rates["5"]["≤85%"] + 1.0)
+        self.assertEqual(find_interest_rate(5, 0.7), interest_rates["5"]["≤85%"])
+
+    def test_vectorized_batch_matches_scalar_lookups(self):
+        """Test that one vectorized pass gives the same rates as scalar lookups"""
+        rng = np.random.default_rng(7)
+        days = rng.integers(0, 900, 500)
+        dates = np.datetime64("2024-01-01") + days
+        years = rng.integers(1, 31, 500)
+        portions = rng.uniform(0.01, 1.0, 500)
+
+        rates = self.history.rates_as_of(dates, years, portions)
+        for date, year, portion, rate in zip(dates.astype(object), years, portions, rates):
+            self.assertEqual(rate, self.history.find_interest_rate(date, int(year), float(portion)))
+
+        current = RateSheetHistory.from_current()
+        self.assertEqual(current.rates_as_of("2020-01-01", 10, 0.7), interest_rates["10"]["≤85%"])
+        with self.assertRaises(ValueError):
+            self.history.rates_as_of(["2020-01-01"], [10], [0.5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+import numpy as np
+
+from investments import project_investment, calculate_growth_over_n_years, calculate_monthly_required_to_reach_z
+from mortgage import quote_annuity_mortgage
+from real_terms import (
+    DiscountCurve,
+    discount_factors,
+    present_value,
+    to_real,
+    real_investment_projection,
+    real_monthly_required_to_reach_z,
+    mortgage_present_values
+)
+from schedules import annuity_schedules
+
+
+class TestRealTerms(unittest.TestCase):
+
+    def test_discount_factors(self):
+        """Test monthly factors for flat and year-by-year curves"""
+        flat = DiscountCurve(0.02)
+        self.assertAlmostEqual(float(flat.factor(1)), 1 / 1.02)
+        self.assertAlmostEqual(float(flat.factor(10)), 1.02 ** -10)
+        self.assertEqual(float(flat.factor(0)), 1.0)
+
+        curve = DiscountCurve([0.05, 0.03])
+        self.assertAlmostEqual(float(curve.factor(3)), 1 / (1.05 * 1.03 * 1.03))
+        np.testing.assert_allclose(curve.factor([1, 2]), [1 / 1.05, 1 / (1.05 * 1.03)])
+
+        with self.assertRaises(ValueError):
+            DiscountCurve([])
+        with self.assertRaises(ValueError):
+            DiscountCurve(-1.5)
+
+    def test_factors_are_cached(self):
+        """Test that factors are computed once per curve and cannot be modified"""
+        discount_factors.cache_clear()
+        curve = DiscountCurve(0.025)
+        first = curve.factors(360)
+        second = DiscountCurve(0.025).factors(360)
+        self.assertIs(first, second)
+        self.assertEqual(discount_factors.cache_info().hits, 1)
+        self.assertFalse(first.flags.writeable)
+
+    def test_present_value_of_schedules(self):
+        """Test single and portfolio present values as one dot product"""
+        # Discounting an annuity at its own rate gives back the principal
+        schedule = annuity_schedules(300000, 0.04, 30)
+        self.assertAlmostEqual(present_value(schedule.payment, (1 + 0.04 / 12) ** 12 - 1), 300000, places=4)
+
+        portfolio = annuity_schedules([100000, 200000], [0.03, 0.05], [30, 20])
+        values = present_value(portfolio.payment, 0.02)
+        self.assertEqual(values.shape, (2,))
+        self.assertAlmostEqual(values[1], present_value(portfolio[1].payment, 0.02))
+
+        present = mortgage_present_values("annuity", 300000, 0.04, 30, 0.0)
+        quote = quote_annuity_mortgage(300000, 0.04, 30)
+        self.assertAlmostEqual(float(present["payments"]), quote.total_paid, places=4)
+        self.assertAlmostEqual(float(present["tax_return"]), quote.total_tax_return, places=4)
+
+    def test_real_investments(self):
+        """Test the real-terms versions of the investment calculators"""
+        nominal = project_investment(1000, 0.07, 10)
+        real = real_investment_projection(1000, 0.07, 10, 0.0)
+        self.assertAlmostEqual(real.total_return, nominal.total_return, places=6)
+        self.assertAlmostEqual(real.total_principal, nominal.total_principal, places=6)
+
+        real = real_investment_projection(1000, 0.07, 10, 0.03)
+        self.assertAlmostEqual(real.total_return, nominal.total_return / 1.03 ** 10, places=6)
+        self.assertLess(real.profit, nominal.profit)
+        self.assertAlmostEqual(float(to_real(1030, 1, 0.03)), 1000)
+
+        monthly = real_monthly_required_to_reach_z(10000, 0.07, 10, 0.02)
+        expected = calculate_monthly_required_to_reach_z(10000 * 1.02 ** 10, 10, calculate_growth_over_n_years(0.07, 10))
+        self.assertAlmostEqual(monthly, expected, places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import sys
+import unittest
+
+from registry import Calculator, CalculatorRegistry, CALCULATORS
+
+
+class TestRegistry(unittest.TestCase):
+
+    def test_menu_entries(self):
+        """Test that the menu items are registered in order with their targets"""
+        self.assertEqual([calculator.key for calculator in CALCULATORS], ["1", "2", "3", "4"])
+        self.assertEqual(CALCULATORS["3"].label, "Gift calculations")
+        self.assertEqual(CALCULATORS["4"].target, "mortgage:mortgage")
+        self.assertIn("2", CALCULATORS)
+        self.assertNotIn("5", CALCULATORS)
+
+    def test_lazy_import(self):
+        """Test that registering does not import and the first use does"""
+        sys.modules.pop("colorsys", None)
+        registry = CalculatorRegistry()
+        calculator = registry.register("hls", "Convert to HLS", "colorsys:rgb_to_hls")
+
+        self.assertNotIn("colorsys", sys.modules)
+        self.assertFalse(calculator.loaded)
+        self.assertEqual(calculator(1.0, 0.0, 0.0), (0.0, 0.5, 1.0))
+        self.assertIn("colorsys", sys.modules)
+        self.assertTrue(calculator.loaded)
+        self.assertIs(registry.load("hls"), sys.modules["colorsys"].rgb_to_hls)
+
+    def test_invalid_registrations(self):
+        """Test malformed targets, duplicate keys and missing modules"""
+        registry = CalculatorRegistry()
+        registry.register("1", "One", "json:dumps")
+        with self.assertRaises(ValueError):
+            registry.register("1", "Again", "json:loads")
+        with self.assertRaises(ValueError):
+            Calculator("2", "No function", "json")
+
+        with self.assertRaises(ImportError):
+            Calculator("3", "Missing", "no_such_module:run").load()
+        with self.assertRaises(AttributeError):
+            Calculator("4", "Missing", "json:no_such_function").load()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from mortgage import quote_annuity_mortgage
+from result_cache import ResultCache, cache_key, rate_table_version
+
+
+def _worker(path, start):
+    cache = ResultCache(path)
+    for amount in range(start, start + 20):
+        cache.get_or_compute("annuity", quote_annuity_mortgage, amount * 1000, 0.04, 30)
+    cache.close()
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "results.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache_key_is_stable_and_normalized(self):
+        """Test that equivalent inputs share a key and other calculators or versions do not"""
+        self.assertEqual(cache_key("annuity", (200000, 0.05, 10)), cache_key("annuity", (200000.0, 0.05, 10.0)))
+        self.assertNotEqual(cache_key("annuity", (200000, 0.05, 10)), cache_key("linear", (200000, 0.05, 10)))
+        self.assertNotEqual(cache_key("annuity", (1,), "v1"), cache_key("annuity", (1,), "v2"))
+        self.assertEqual(len(rate_table_version()), 16)
+
+        with self.assertRaises(TypeError):
+            cache_key("annuity", (object(),))
+
+    def test_get_or_compute_reuses_results_across_instances(self):
+        """Test that a result computed once is returned by a later cache on the same file"""
+        calls = []
+
+        def calculator(*args):
+            calls.append(args)
+            return quote_annuity_mortgage(*args)
+
+        with ResultCache(self.path) as cache:
+            first = cache.get_or_compute("annuity", calculator, 200000, 0.05, 10)
+
+        with ResultCache(self.path) as cache:
+            second = cache.get_or_compute("annuity", calculator, 200000, 0.05, 10)
+            self.assertEqual(cache.stats()["hits"], 1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+
+        with ResultCache(self.path, version="other") as cache:
+            cache.get_or_compute("annuity", calculator, 200000, 0.05, 10)
+        self.assertEqual(len(calls), 2)
+
+    def test_bulk_map_only_computes_misses(self):
+        """Test that map fetches hits in bulk and computes all misses in one call"""
+        batches = []
+
+        def calculator(inputs):
+            batches.append(inputs)
+            return [amount * 2 for (amount,) in inputs]
+
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.map("double", calculator, [(1,), (2,), (1,)]), [2, 4, 2])
+            self.assertEqual(cache.map("double", calculator, [(2,), (3,)]), [4, 6])
+
+        self.assertEqual(batches, [[(1,), (2,)], [(3,)]])
+
+    def test_size_based_eviction(self):
+        """Test that the least recently used entries are evicted beyond max_bytes"""
+        with ResultCache(self.path, max_bytes=3000) as cache:
+            for i in range(10):
+                cache.put(cache.key("blob", i), b"x" * 500)
+            self.assertIsNotNone(cache.get(cache.key("blob", 5)))
+            cache.put(cache.key("blob", 10), b"x" * 500)
+
+            stats = cache.stats()
+            self.assertLessEqual(stats["bytes"], 3000)
+            self.assertIsNotNone(cache.get(cache.key("blob", 5)))
+            self.assertIsNone(cache.get(cache.key("blob", 0)))
+
+    def test_reads_are_not_blocked_by_a_writer(self):
+        """Test that get returns while another connection holds the write lock"""
+        with ResultCache(self.path, timeout=0.5) as cache:
+            key = cache.key("annuity", 200000, 0.04, 30)
+            cache.put(key, "quote")
+            accessed = cache._process_connection().execute(
+                "SELECT accessed FROM entries WHERE key = ?", (key,)).fetchone()[0]
+
+            writer = sqlite3.connect(self.path, isolation_level=None)
+            writer.execute("BEGIN IMMEDIATE")
+            try:
+                start = time.perf_counter()
+                self.assertEqual(cache.get(key), "quote")
+                self.assertLess(time.perf_counter() - start, 0.5)
+            finally:
+                writer.execute("ROLLBACK")
+                writer.close()
+
+            # the access time could not be recorded while the writer held the lock
+            self.assertEqual(cache._process_connection().execute(
+                "SELECT accessed FROM entries WHERE key = ?", (key,)).fetchone()[0], accessed)
+            cache.get(key)
+            self.assertGreaterEqual(cache._process_connection().execute(
+                "SELECT accessed FROM entries WHERE key = ?", (key,)).fetchone()[0], accessed)
+
+    def test_concurrent_processes(self):
+        """Test that several processes can read and write the same cache file"""
+        processes = [multiprocessing.Process(target=_worker, args=(self.path, start)) for start in (100, 110, 120)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+
+        with ResultCache(self.path) as cache:
+            self.assertEqual(cache.stats()["entries"], 40)
+            self.assertEqual(cache.get(cache.key("annuity", 115000, 0.04, 30)),
+                             quote_annuity_mortgage(115000, 0.04, 30))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import pickle
+import unittest
+
+from results import MortgageQuote, GiftTaxResult, InvestmentProjection
+
+
+class TestResults(unittest.TestCase):
+
+    def setUp(self):
+        self.quote = MortgageQuote("linear", 200000, 0.05, 10, 2500.0, 1673.61, 50416.67, 18618.88, 250416.67)
+
+    def test_fields_and_derived_values(self):
+        """Test that fields are stored and derived properties are computed from them"""
+        self.assertEqual(self.quote.kind, "linear")
+        self.assertEqual(self.quote.years, 10)
+        self.assertAlmostEqual(self.quote.payment_decrease, 2500.0 - 1673.61)
+        self.assertAlmostEqual(self.quote.net_interest, 50416.67 - 18618.88)
+        self.assertAlmostEqual(self.quote.total_net_paid, 250416.67 - 18618.88)
+
+        projection = InvestmentProjection(1000, 0.1, 5, 5000, 1.343, 6715.0)
+        self.assertAlmostEqual(projection.profit, 1715.0)
+
+    def test_keyword_construction(self):
+        """Test construction with keywords and validation of missing or unknown fields"""
+        result = GiftTaxResult(gift_amount=150000, tax=2964.7, net=147035.3)
+        self.assertEqual(result, GiftTaxResult(150000, 2964.7, 147035.3))
+
+        with self.assertRaises(TypeError):
+            GiftTaxResult(150000, 2964.7)
+        with self.assertRaises(TypeError):
+            GiftTaxResult(150000, 2964.7, 147035.3, rate=0.1)
+        with self.assertRaises(TypeError):
+            GiftTaxResult(150000, 2964.7, 147035.3, gift_amount=1)
+
+    def test_immutable_and_slotted(self):
+        """Test that results cannot be modified and carry no instance dictionary"""
+        with self.assertRaises(AttributeError):
+            self.quote.total_interest = 0
+        with self.assertRaises(AttributeError):
+            del self.quote.kind
+        self.assertFalse(hasattr(self.quote, "__dict__"))
+
+    def test_equality_hash_and_pickle(self):
+        """Test that results compare by value, can be hashed and survive pickling"""
+        copy = pickle.loads(pickle.dumps(self.quote))
+        self.assertEqual(copy, self.quote)
+        self.assertEqual(hash(copy), hash(self.quote))
+        self.assertNotEqual(GiftTaxResult(0, 0, 0), (0, 0, 0))
+        self.assertEqual(self.quote.asdict()["mortgage_amount"], 200000)
+        self.assertEqual(GiftTaxResult(0, 0, 0).astuple(), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
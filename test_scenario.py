@@ -0,0 +1,84 @@
+import unittest
+
+from gifts import gift_tax_net
+from mortgage import find_interest_rate, quote_linear_mortgage, quote_annuity_mortgage
+from scenario import DependencyGraph, MortgageScenario
+
+
+class TestScenario(unittest.TestCase):
+
+    def test_matches_mortgage_flow(self):
+        """Test that the scenario reproduces the steps of the mortgage() menu flow"""
+        scenario = MortgageScenario(400000, 50000, 150000, 30)
+
+        gift_tax, gift_net = gift_tax_net(150000)
+        mortgage_amount = 400000 - 50000 - gift_net
+        interest_rate = round(find_interest_rate(30, mortgage_amount / 400000) / 100, 4)
+
+        self.assertEqual(scenario.gift_tax.tax, gift_tax)
+        self.assertEqual(scenario.mortgage_amount, mortgage_amount)
+        self.assertEqual(scenario.interest_rate, interest_rate)
+        self.assertEqual(scenario.linear, quote_linear_mortgage(mortgage_amount, interest_rate, 30))
+        self.assertEqual(scenario.annuity, quote_annuity_mortgage(mortgage_amount, interest_rate, 30))
+        self.assertEqual(scenario.recompute_count, 5)
+
+    def test_only_downstream_nodes_recompute(self):
+        """Test that an update reruns only the nodes that depend on the changed input"""
+        scenario = MortgageScenario(400000, 50000, 150000, 30)
+        scenario.annuity
+        scenario.linear
+
+        # Same inputs: nothing to do
+        scenario.update(gift=150000)
+        scenario.annuity
+        self.assertEqual(scenario.recomputed, [])
+
+        # Own participation skips the gift tax step
+        scenario.update(own_participation=60000)
+        scenario.annuity
+        self.assertNotIn("gift_tax", scenario.recomputed)
+        self.assertIn("mortgage_amount", scenario.recomputed)
+        self.assertIn("annuity", scenario.recomputed)
+        self.assertNotIn("linear", scenario.recomputed)  # not read yet
+        self.assertTrue(scenario.is_dirty("linear"))
+
+        scenario.linear
+        self.assertIn("linear", scenario.recomputed)
+
+    def test_unchanged_intermediate_stops_propagation(self):
+        """Test that changing the duration leaves the upstream steps untouched"""
+        scenario = MortgageScenario(400000, 50000, 100000, 30)
+        scenario.annuity
+
+        # The duration only feeds the rate lookup and the quotes, so the gift and amount steps are kept
+        scenario.update(years=25)
+        scenario.annuity
+        self.assertEqual(scenario.recomputed, ["interest_rate", "annuity"])
+
+    def test_generic_graph(self):
+        """Test the generic graph with a diamond and early cut-off"""
+        graph = DependencyGraph()
+        graph.add_input("x", 3)
+        graph.add_node("parity", lambda x: x % 2, "x")
+        graph.add_node("label", lambda parity: "odd" if parity else "even", "parity")
+
+        self.assertEqual(graph.get("label"), "odd")
+        graph.update(x=5)
+        self.assertEqual(graph.get("label"), "odd")
+        self.assertEqual(graph.recomputed, ["parity"])
+
+        with self.assertRaises(ValueError):
+            graph.set("parity", 1)
+        with self.assertRaises(KeyError):
+            graph.add_node("bad", lambda y: y, "y")
+        with self.assertRaises(ValueError):
+            graph.add_input("x")
+
+        graph.add_input("y")
+        graph.add_node("double", lambda y: 2 * y, "y")
+        with self.assertRaises(ValueError):
+            graph.get("double")
+
+
+if __name__ == '__main__':
+    unittest.main()
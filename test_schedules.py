@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from mortgage import calculate_total_linear_interest, quote_annuity_mortgage
+from schedules import linear_schedules, annuity_schedules, interest_only_schedules, build_schedules
+
+
+class TestSchedules(unittest.TestCase):
+
+    def test_linear_schedule_matches_loop(self):
+        """Test that the linear schedule reproduces the month-by-month interest loop"""
+        schedule = linear_schedules(200000, 0.05, 10)
+        total_interest, total_tax_return = calculate_total_linear_interest(200000, 0.05, 10)
+
+        self.assertEqual(schedule.months, 120)
+        self.assertAlmostEqual(schedule.total_interest, total_interest, places=6)
+        self.assertAlmostEqual(schedule.total_tax_return, total_tax_return, places=6)
+        self.assertAlmostEqual(schedule.principal.sum(), 200000, places=6)
+        self.assertEqual(schedule.balance[-1], 0)
+
+    def test_annuity_schedule_matches_quote(self):
+        """Test that the annuity schedule has a constant payment and pays off the loan"""
+        for rate in (0.0, 0.042):
+            schedule = annuity_schedules(300000, rate, 30)
+            quote = quote_annuity_mortgage(300000, rate, 30)
+
+            np.testing.assert_allclose(schedule.payment, quote.initial_payment)
+            self.assertAlmostEqual(schedule.total_interest, quote.total_interest, places=4)
+            self.assertAlmostEqual(schedule.principal.sum(), 300000, places=4)
+            self.assertAlmostEqual(schedule.balance[-2], schedule.principal[-1], places=4)
+
+    def test_interest_only_schedule(self):
+        """Test that an interest-only loan pays interest monthly and the full amount at the end"""
+        schedule = interest_only_schedules(100000, 0.06, 2)
+        np.testing.assert_allclose(schedule.interest, 500.0)
+        self.assertEqual(schedule.principal[-1], 100000)
+        self.assertEqual(schedule.principal[:-1].sum(), 0)
+        self.assertEqual(schedule.balance[-2], 100000)
+
+    def test_batch_schedules_are_padded(self):
+        """Test that batches of different terms are padded with zeros after the last payment"""
+        schedule = build_schedules("annuity", [100000, 200000], [0.04, 0.05], [10, 30])
+        self.assertEqual(schedule.payment.shape, (2, 360))
+        self.assertTrue(np.all(schedule.payment[0, 120:] == 0))
+        self.assertTrue(np.all(schedule.payment[1] > 0))
+        self.assertAlmostEqual(schedule[0].principal.sum(), 100000, places=4)
+
+        with self.assertRaises(ValueError):
+            build_schedules("balloon", 1, 0.01, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from batch_results import calculate_annuity_mortgage_payments
+from constants import INTEREST_DEDUCTION
+from mortgage import quote_linear_mortgage, quote_annuity_mortgage
+from sensitivities import (
+    annuity_sensitivities,
+    linear_sensitivities,
+    mortgage_sensitivities,
+    rate_shock
+)
+
+
+def _annuity_values(principal, rate, years):
+    payment = calculate_annuity_mortgage_payments(principal, rate, years)
+    total_interest = payment * years * 12 - principal
+    return payment, total_interest, principal + total_interest * (1 - INTEREST_DEDUCTION / 100)
+
+
+def _linear_values(principal, rate, years):
+    n = years * 12
+    total_interest = principal * rate / 12 * (n + 1) / 2
+    return principal / n + principal * rate / 12, total_interest, principal + total_interest * (1 - INTEREST_DEDUCTION / 100)
+
+
+class TestSensitivities(unittest.TestCase):
+
+    def setUp(self):
+        self.principals = np.array([150000.0, 300000.0, 500000.0])
+        self.rates = np.array([0.03, 0.045, 0.06])
+        self.years = np.array([10.0, 20.0, 30.0])
+
+    def assert_matches_finite_differences(self, sensitivities, values):
+        steps = {"rate": 1e-6, "principal": 1.0, "years": 1e-4}
+        for variable, step in steps.items():
+            up = dict(principal=self.principals, rate=self.rates, years=self.years)
+            down = dict(up)
+            up[variable] = up[variable] + step
+            down[variable] = down[variable] - step
+
+            for quantity, high, low in zip(("payment", "total_interest", "net_cost"), values(**up), values(**down)):
+                numeric = (high - low) / (2 * step)
+                np.testing.assert_allclose(getattr(sensitivities, f"d_{quantity}_d_{variable}"), numeric,
+                                           rtol=1e-5, atol=1e-6, err_msg=f"d_{quantity}_d_{variable}")
+
+    def test_annuity_derivatives(self):
+        """Test annuity derivatives against central finite differences"""
+        sensitivities = annuity_sensitivities(self.principals, self.rates, self.years)
+        self.assert_matches_finite_differences(sensitivities, _annuity_values)
+
+        quote = quote_annuity_mortgage(300000, 0.045, 20)
+        self.assertAlmostEqual(sensitivities.payment[1], quote.initial_payment, places=6)
+        self.assertAlmostEqual(sensitivities.net_cost[1], quote.total_net_paid, places=4)
+
+    def test_linear_derivatives(self):
+        """Test linear derivatives against central finite differences"""
+        sensitivities = linear_sensitivities(self.principals, self.rates, self.years)
+        self.assert_matches_finite_differences(sensitivities, _linear_values)
+
+        quote = quote_linear_mortgage(150000, 0.03, 10)
+        self.assertAlmostEqual(sensitivities.payment[0], quote.initial_payment, places=6)
+        self.assertAlmostEqual(sensitivities.total_interest[0], quote.total_interest, places=4)
+
+    def test_zero_rate_limit(self):
+        """Test that the 0% rate derivatives are the limits of the general formula"""
+        at_zero = annuity_sensitivities(200000, 0.0, 30)
+        near_zero = annuity_sensitivities(200000, 1e-6, 30)
+        self.assertAlmostEqual(float(at_zero.payment), 200000 / 360)
+        np.testing.assert_allclose(at_zero.d_payment_d_rate, near_zero.d_payment_d_rate, rtol=1e-4)
+        np.testing.assert_allclose(at_zero.d_payment_d_years, near_zero.d_payment_d_years, rtol=1e-4)
+
+    def test_rate_shock_and_dispatch(self):
+        """Test the first-order rate shock and the kind dispatcher"""
+        sensitivities = mortgage_sensitivities("annuity", 300000, 0.04, 30)
+        shock = rate_shock(sensitivities, 25)
+        exact = (_annuity_values(300000, 0.0425, 30)[0] - _annuity_values(300000, 0.04, 30)[0])[0]
+        self.assertAlmostEqual(float(shock["payment"]), float(exact), delta=abs(exact) * 0.02)
+
+        with self.assertRaises(ValueError):
+            mortgage_sensitivities("balloon", 1, 0.01, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import json
+import os
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from sharded_sweeps import create_sweep, ShardedSweep, run_worker, run_local
+from sweeps import SWEEP_KERNELS, make_grid
+
+
+class TestShardedSweeps(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.sweep_directory = os.path.join(self.directory.name, "sweep")
+        self.axes = {
+            "mortgage_amount": np.linspace(100000, 500000, 9),
+            "interest_rate": np.linspace(0.01, 0.06, 6),
+            "years": [10, 20, 30]
+        }
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected(self):
+        return SWEEP_KERNELS["annuity_mortgage"](make_grid(**self.axes))
+
+    def test_manifest_is_deterministic(self):
+        """Test that shards follow from the axes and that a different sweep is refused"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=50)
+        self.assertEqual(sweep.manifest["rows"], 162)
+        self.assertEqual([(shard["start"], shard["stop"]) for shard in sweep.shards],
+                         [(0, 50), (50, 100), (100, 150), (150, 162)])
+
+        again = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=50)
+        self.assertEqual(again.manifest, sweep.manifest)
+        with self.assertRaises(ValueError):
+            create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=40)
+        with self.assertRaises(ValueError):
+            create_sweep(os.path.join(self.directory.name, "other"), "investment_projection", self.axes)
+
+        grid = make_grid(**self.axes)
+        inputs = sweep.shard_inputs(sweep.shards[1])
+        for name in self.axes:
+            np.testing.assert_array_equal(inputs[name], grid[name][50:100])
+
+    def test_claims_are_exclusive(self):
+        """Test that a live lock blocks a claim and a finished shard cannot be claimed"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=100)
+        shard = sweep.shards[0]
+
+        self.assertTrue(sweep.claim(shard))
+        self.assertFalse(sweep.claim(shard))
+        self.assertEqual(sweep.status(), {"shards": 2, "done": 0, "running": 1, "pending": 1})
+
+        sweep.run_shard(shard)
+        self.assertFalse(os.path.exists(sweep.lock_path(shard)))
+        self.assertFalse(sweep.claim(shard))
+        self.assertEqual(len(sweep.pending()), 1)
+
+    def test_resume_after_crash(self):
+        """Test that locks of dead or silent workers are broken and leftovers are ignored"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=50)
+        dead, silent = sweep.shards[0], sweep.shards[1]
+
+        with open(sweep.lock_path(dead), "w", encoding="utf-8") as file:
+            json.dump({"host": socket.gethostname(), "pid": 2 ** 22 + 12345, "claimed": time.time()}, file)
+        with open(sweep.result_path(dead) + ".crashed.tmp", "wb") as file:
+            file.write(b"partial")
+        with open(sweep.lock_path(silent), "w", encoding="utf-8") as file:
+            json.dump({"host": "elsewhere", "pid": 1, "claimed": 0}, file)
+        os.utime(sweep.lock_path(silent), (time.time() - 7200, time.time() - 7200))
+
+        self.assertEqual(run_worker(self.sweep_directory, max_shards=1), ["shard-00000"])
+        completed = run_worker(self.sweep_directory)
+        self.assertEqual(completed, ["shard-00001", "shard-00002", "shard-00003"])
+
+        reader = ShardedSweep(self.sweep_directory).merge(os.path.join(self.directory.name, "merged.ftcol"))
+        np.testing.assert_allclose(reader.column("total_interest"), self.expected()["total_interest"])
+
+    def test_recent_foreign_lock_is_respected(self):
+        """Test that a recent lock from another host is left alone"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=100)
+        with open(sweep.lock_path(sweep.shards[0]), "w", encoding="utf-8") as file:
+            json.dump({"host": "elsewhere", "pid": 1, "claimed": time.time()}, file)
+
+        self.assertEqual(run_worker(self.sweep_directory), ["shard-00001"])
+        with self.assertRaises(ValueError):
+            sweep.merge(os.path.join(self.directory.name, "merged.ftcol"))
+
+    def test_unreadable_locks_are_judged_on_age(self):
+        """Test that an empty lock is broken once it is old and respected while it is recent"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=100)
+        old, recent = sweep.shards
+        for shard in (old, recent):
+            open(sweep.lock_path(shard), "w", encoding="utf-8").close()
+        os.utime(sweep.lock_path(old), (time.time() - 7200, time.time() - 7200))
+
+        self.assertTrue(sweep.claim(old))
+        self.assertFalse(sweep.claim(recent))
+        sweep.release(old)
+
+    def test_late_breaker_restores_a_live_lock(self):
+        """Test that a lock taken after the staleness check is put back instead of broken"""
+        sweep = create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=100)
+        shard = sweep.shards[0]
+        lock_path = sweep.lock_path(shard)
+
+        with open(lock_path, "w", encoding="utf-8") as file:
+            json.dump({"host": "elsewhere", "pid": 1, "claimed": 0}, file)
+        os.utime(lock_path, (time.time() - 7200, time.time() - 7200))
+        stale = sweep._stale_lock(lock_path)
+        self.assertIsNotNone(stale)
+
+        # Another worker breaks the stale lock and takes the shard before this one renames it
+        self.assertTrue(ShardedSweep(self.sweep_directory).claim(shard))
+        with open(lock_path, encoding="utf-8") as file:
+            live = file.read()
+
+        sweep._stale_lock = lambda path: stale
+        self.assertFalse(sweep.claim(shard))
+        with open(lock_path, encoding="utf-8") as file:
+            self.assertEqual(file.read(), live)
+        self.assertEqual([name for name in os.listdir(self.sweep_directory) if name.endswith(".stale")], [])
+
+    def test_workers_with_other_rate_tables_are_refused(self):
+        """Test that a worker whose rate tables differ from the sweep's cannot open it"""
+        create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=100)
+
+        with patch("sharded_sweeps.rate_table_version", return_value="other-tables"):
+            with self.assertRaises(ValueError):
+                ShardedSweep(self.sweep_directory)
+            with self.assertRaises(ValueError):
+                run_worker(self.sweep_directory)
+
+        self.assertEqual(len(ShardedSweep(self.sweep_directory).pending()), 2)
+
+    def test_local_workers_and_merge(self):
+        """Test that several processes split the shards and the merge matches an in-memory sweep"""
+        create_sweep(self.sweep_directory, "annuity_mortgage", self.axes, shard_rows=20)
+        completed = run_local(self.sweep_directory, processes=3)
+
+        ids = sorted(shard for worker in completed for shard in worker)
+        self.assertEqual(ids, [f"shard-{index:05d}" for index in range(9)])
+
+        reader = ShardedSweep(self.sweep_directory).merge(os.path.join(self.directory.name, "merged.ftcol"))
+        expected = self.expected()
+        self.assertEqual(len(reader), 162)
+        for name, values in expected.items():
+            np.testing.assert_allclose(reader.column(name), values)
+        self.assertEqual(reader.cube("initial_payment").shape, (9, 6, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
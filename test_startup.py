@@ -0,0 +1,53 @@
+import unittest
+
+from startup import parse_importtime, measure_import_time, check_startup_budget, QUERIES
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       150 |        150 |   _io
+import time:        40 |         40 |     encodings.aliases
+import time:       900 |        940 |   encodings
+import time:      2100 |       2100 | registry
+"""
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_parse_importtime(self):
+        """Test parsing of -X importtime output"""
+        report = parse_importtime("import main", SAMPLE)
+
+        self.assertEqual(report.modules, ["_io", "encodings.aliases", "encodings", "registry"])
+        self.assertEqual(report.cumulative_us["encodings"], 940)
+        self.assertAlmostEqual(report.total_ms, 3.19)
+        self.assertEqual(report.slowest(1), [("registry", 2100)])
+        self.assertTrue(report.loaded("encodings"))
+        self.assertFalse(report.loaded("numpy"))
+
+    def test_gift_query_stays_light(self):
+        """Test that a gift-tax query imports neither NumPy nor the other heavy modules"""
+        report, violations = check_startup_budget("3")
+
+        self.assertEqual(violations, [])
+        self.assertTrue(report.loaded("gifts"))
+        self.assertFalse(report.loaded("mortgage"))
+        self.assertFalse(report.loaded("numpy"))
+
+    def test_every_menu_item_stays_light(self):
+        """Test that no menu item pulls in NumPy"""
+        for query in QUERIES:
+            report = measure_import_time(QUERIES[query])
+            self.assertFalse(report.loaded("numpy"), query)
+
+    def test_violations_are_reported(self):
+        """Test that forbidden modules and an exceeded budget are reported"""
+        _, violations = check_startup_budget("import batch_results", budget_ms=0.001)
+
+        self.assertIn("numpy was imported", violations)
+        self.assertTrue(any("over the budget" in violation for violation in violations))
+
+        with self.assertRaises(RuntimeError):
+            measure_import_time("import no_such_module")
+
+
+if __name__ == '__main__':
+    unittest.main()
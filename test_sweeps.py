@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from batch_results import quote_annuity_mortgages, project_investments
+from sweeps import SWEEP_KERNELS, SweepKernel, make_grid, run_sweep, benchmark_sweep, get_kernel
+
+
+class TestSweeps(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = make_grid(mortgage_amount=[100000, 250000, 400000],
+                              interest_rate=[0.0, 0.03, 0.05],
+                              years=[10, 20, 30])
+
+    def test_make_grid(self):
+        """Test that the grid is the full cartesian product with the last axis varying fastest"""
+        self.assertEqual(len(self.grid["years"]), 27)
+        np.testing.assert_array_equal(self.grid["years"][:3], [10, 20, 30])
+        np.testing.assert_array_equal(self.grid["mortgage_amount"][:9], 100000)
+
+    def test_shared_memory_sweep_matches_direct_call(self):
+        """Test that workers writing into shared memory produce the vectorized results"""
+        expected = quote_annuity_mortgages(self.grid["mortgage_amount"], self.grid["interest_rate"],
+                                           self.grid["years"])
+
+        with run_sweep("annuity_mortgage", self.grid, workers=2, chunk_size=5) as result:
+            self.assertEqual(len(result), 27)
+            for name in SWEEP_KERNELS["annuity_mortgage"].outputs:
+                np.testing.assert_allclose(result[name], getattr(expected, name))
+            total_interest = result["total_interest"].copy()
+
+        np.testing.assert_allclose(total_interest, expected.total_interest)
+
+    def test_pickled_sweep_matches_shared_memory(self):
+        """Test that the pickling baseline gives the same columns"""
+        inputs = make_grid(annual_principal=[1000, 5000], annual_yield=[0.0, 0.07], years=[1, 10, 30])
+        expected = project_investments(inputs["annual_principal"], inputs["annual_yield"], inputs["years"])
+
+        result = run_sweep("investment_projection", inputs, workers=2, use_shared_memory=False)
+        np.testing.assert_allclose(result["total_return"], expected.total_return)
+
+        with run_sweep("investment_projection", inputs, workers=2) as shared:
+            np.testing.assert_allclose(shared["total_return"], result["total_return"])
+
+    def test_unregistered_kernel(self):
+        """Test that a kernel object that is not in SWEEP_KERNELS runs in the workers"""
+        kernel = SweepKernel("custom", quote_annuity_mortgages, ("mortgage_amount", "interest_rate", "years"),
+                             ("total_paid",))
+        expected = quote_annuity_mortgages(self.grid["mortgage_amount"], self.grid["interest_rate"],
+                                           self.grid["years"]).total_paid
+
+        for use_shared_memory in (True, False):
+            with run_sweep(kernel, self.grid, workers=2, use_shared_memory=use_shared_memory) as result:
+                np.testing.assert_allclose(result["total_paid"], expected)
+
+    def test_benchmark_report(self):
+        """Test that the benchmark reports throughput for both modes"""
+        report = benchmark_sweep("linear_mortgage", self.grid, workers=2)
+        self.assertEqual(report["rows"], 27)
+        self.assertGreater(report["shared_memory_rows_per_second"], 0)
+        self.assertGreater(report["pickled_rows_per_second"], 0)
+
+        with self.assertRaises(ValueError):
+            get_kernel("bullet_loan")
+
+
+if __name__ == '__main__':
+    unittest.main()
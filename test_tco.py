@@ -0,0 +1,101 @@
+import unittest
+
+import numpy as np
+
+from constants import INTEREST_DEDUCTION
+from gifts import gift_tax_net
+from mortgage import calculate_annuity_mortgage_payment, find_interest_rate
+from tco import compare_rent_vs_buy
+
+
+def _simulate(house_price, own_participation, gift, years, rent, horizon_years, house_growth, rent_growth,
+              investment_yield, purchase_costs, interest_rate):
+    """Month-by-month reference simulation of the comparison"""
+    monthly = lambda annual: (1 + annual) ** (1 / 12) - 1
+    gift_net = gift_tax_net(gift)[1]
+    amount = house_price - own_participation - gift_net
+    payment = calculate_annuity_mortgage_payment(amount, interest_rate, years)
+
+    balance = amount
+    portfolio = own_participation + gift_net + purchase_costs * house_price
+    house = house_price
+    advantages = [house - balance - portfolio]
+    for month in range(1, horizon_years * 12 + 1):
+        outflow = 0.0
+        if month <= years * 12:
+            interest = balance * interest_rate / 12
+            outflow = payment - interest * INTEREST_DEDUCTION / 100
+            balance -= payment - interest
+        current_rent = rent * (1 + monthly(rent_growth)) ** (month - 1)
+        portfolio = portfolio * (1 + monthly(investment_yield)) + outflow - current_rent
+        house *= 1 + monthly(house_growth)
+        if month % 12 == 0:
+            advantages.append(house - max(balance, 0) - portfolio)
+    return np.array(advantages)
+
+
+class TestTco(unittest.TestCase):
+
+    def test_closed_form_matches_monthly_simulation(self):
+        """Test the closed-form yearly wealth comparison against a month-by-month simulation"""
+        for interest_rate in (0.0, 0.042):
+            result = compare_rent_vs_buy(400000, 40000, 150000, 20, 1600, horizon_years=25, interest_rate=interest_rate)
+            expected = _simulate(400000, 40000, 150000, 20, 1600, 25, 0.03, 0.03, 0.05, 0.02, interest_rate)
+            np.testing.assert_allclose(result.advantage, expected, rtol=1e-8, atol=1e-4)
+
+    def test_default_rate_and_mortgage_amount(self):
+        """Test that the mortgage amount and default rate follow the mortgage() flow"""
+        result = compare_rent_vs_buy(400000, 40000, 150000, 30, 1600)
+        amount = 400000 - 40000 - gift_tax_net(150000)[1]
+        self.assertAlmostEqual(float(result.mortgage_amount), amount)
+        self.assertEqual(float(result.interest_rate), round(find_interest_rate(30, amount / 400000) / 100, 4))
+        self.assertAlmostEqual(float(result.monthly_payment),
+                               calculate_annuity_mortgage_payment(amount, float(result.interest_rate), 30))
+        self.assertAlmostEqual(result.rent_paid[1], 1600 * 12 * (1 + (1.03 ** (1 / 12) - 1) * 5.5), delta=5)
+
+    def test_break_even_on_scenario_grid(self):
+        """Test break-even years over a grid of rents and house price growth"""
+        rents = np.array([[500.0], [1800.0], [4000.0]])
+        growth = np.array([0.0, 0.05])
+        result = compare_rent_vs_buy(400000, 80000, 0, 30, rents, house_growth=growth, interest_rate=0.04)
+
+        self.assertEqual(result.advantage.shape, (3, 2, 31))
+        np.testing.assert_allclose(result.advantage[..., 0], -0.02 * 400000)  # only the purchase costs
+        self.assertTrue(np.isnan(result.break_even_years[0, 0]))  # cheap rent, flat prices: never
+        self.assertLess(result.break_even_years[2, 1], result.break_even_years[1, 0])
+
+        for index in np.ndindex(3, 2):
+            break_even = result.break_even_years[index]
+            if np.isnan(break_even):
+                self.assertTrue(np.all(result.advantage[index] <= 0))
+                continue
+            single = compare_rent_vs_buy(400000, 80000, 0, 30, rents[index[0], 0], horizon_years=1,
+                                         house_growth=growth[index[1]], interest_rate=0.04)
+            self.assertAlmostEqual(float(single.break_even_years), break_even)
+            self.assertGreater(break_even, 0)
+            self.assertGreater(result.advantage[index][int(np.ceil(break_even))], 0)
+
+    def test_rate_and_deduction_as_grid_axes(self):
+        """Test that interest rates and deductions broadcast with the other scenario inputs"""
+        rents = np.array([500.0, 4000.0])
+        rates = np.array([[0.03], [0.06]])
+        result = compare_rent_vs_buy(400000, 80000, 0, 30, rents, interest_rate=rates)
+
+        self.assertEqual(result.advantage.shape, (2, 2, 31))
+        np.testing.assert_array_equal(result.interest_rate, [[0.03, 0.03], [0.06, 0.06]])
+        for index in np.ndindex(2, 2):
+            single = compare_rent_vs_buy(400000, 80000, 0, 30, rents[index[1]], interest_rate=rates[index[0], 0])
+            np.testing.assert_allclose(result.advantage[index], single.advantage)
+            self.assertAlmostEqual(float(result.monthly_payment[index]), float(single.monthly_payment))
+
+        deductions = np.array([0.0, INTEREST_DEDUCTION])
+        result = compare_rent_vs_buy(400000, 80000, 0, 30, 1800, interest_rate=0.04, deduction=deductions)
+        self.assertEqual(result.advantage.shape, (2, 31))
+        for index, deduction in enumerate(deductions):
+            single = compare_rent_vs_buy(400000, 80000, 0, 30, 1800, interest_rate=0.04, deduction=deduction)
+            np.testing.assert_allclose(result.advantage[index], single.advantage)
+            np.testing.assert_allclose(result.break_even_years[index], single.break_even_years)
+
+
+if __name__ == '__main__':
+    unittest.main()
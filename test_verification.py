@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from gifts import HOME_ACQUISITION_EXEMPTION, ANNUAL_PARENTAL_EXEMPTION, FIRST_BRACKET_LIMIT
+from batch_results import calculate_gift_taxes
+from verification import CHECKS, DifferentialCheck, run_check, run_all
+
+
+class TestVerification(unittest.TestCase):
+
+    def test_fast_paths_match_references(self):
+        """Test that every vectorized path agrees with its reference loop"""
+        reports = run_all(samples=2000, seed=3, chunk_size=700)
+
+        self.assertEqual(set(reports), set(CHECKS))
+        for report in reports.values():
+            self.assertTrue(report.passed, report)
+            self.assertGreater(report.samples, 2000)
+            self.assertGreater(report.reference_seconds, 0)
+            self.assertGreater(report.speedup, 0)
+
+    def test_edge_cases_are_covered(self):
+        """Test that zero rates, one-year terms and bracket boundaries are always checked"""
+        mortgages = CHECKS["linear_interest"].edge_cases()
+        self.assertIn(0.0, mortgages["interest_rate"])
+        self.assertIn(1, mortgages["years"])
+
+        exemptions = HOME_ACQUISITION_EXEMPTION + ANNUAL_PARENTAL_EXEMPTION
+        gifts = CHECKS["gift_tax"].edge_cases()["gift_amount"]
+        for boundary in (exemptions, exemptions + FIRST_BRACKET_LIMIT):
+            np.testing.assert_allclose(gifts[np.argmin(np.abs(gifts - boundary))], boundary)
+
+        self.assertIn(0.0, CHECKS["growth"].edge_cases()["annual_yield"])
+
+    def test_mismatches_are_reported(self):
+        """Test that a fast path with a bracket bug is caught at the boundary"""
+        gift_tax = CHECKS["gift_tax"]
+        broken = DifferentialCheck("broken_gift_tax", gift_tax.generate, gift_tax.edge_cases, gift_tax.reference,
+                                   lambda gift: (calculate_gift_taxes(gift) + (gift > 200000) * 0.01,), ("tax",),
+                                   rtol=0.0, atol=1e-4)
+        report = run_check(broken, samples=1000)
+
+        self.assertFalse(report.passed)
+        self.assertGreater(report.mismatches, 0)
+        self.assertGreater(report.worst_case["gift_amount"], 200000)
+        self.assertIn("MISMATCHES", repr(report))
+        with self.assertRaises(AttributeError):
+            report.mismatches = 0
+
+    def test_chunks_are_drawn_lazily(self):
+        """Test that each chunk of samples is only generated once the previous one is checked"""
+        growth = CHECKS["growth"]
+        events = []
+
+        def generate(rng, size):
+            events.append("generate")
+            return growth.generate(rng, size)
+
+        def fast(*columns):
+            events.append("fast")
+            return growth.fast(*columns)
+
+        lazy = DifferentialCheck("lazy_growth", generate, growth.edge_cases, growth.reference, fast, growth.outputs,
+                                 growth.rtol, growth.atol)
+        report = run_check(lazy, samples=250, chunk_size=100)
+
+        self.assertTrue(report.passed)
+        self.assertEqual(events, ["fast"] + ["generate", "fast"] * 3)
+
+    def test_reports_are_deterministic(self):
+        """Test that the same seed draws the same inputs"""
+        first = run_check("growth", samples=500, seed=11)
+        second = run_check("growth", samples=500, seed=11)
+        self.assertEqual(first.max_abs_error, second.max_abs_error)
+        self.assertEqual(first.worst_case, second.worst_case)
+
+        with self.assertRaises(ValueError):
+            run_check("unknown")
+
+
+if __name__ == '__main__':
+    unittest.main()
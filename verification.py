@@ -0,0 +1,206 @@
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from batch_results import quote_linear_mortgages, quote_annuity_mortgages, calculate_gift_taxes, \
+    calculate_growths_over_n_years
+from gifts import calculate_gift_tax, HOME_ACQUISITION_EXEMPTION, ANNUAL_PARENTAL_EXEMPTION, FIRST_BRACKET_LIMIT
+from investments import calculate_growth_over_n_years
+from mortgage import calculate_total_linear_interest, calculate_total_annuity_interest, \
+    calculate_annuity_mortgage_payment, MONTHS_IN_YEAR
+from results import _Result
+
+# Rates and yields are drawn on the 0.01% grid the rate sheet and the prompts work with
+_RATE_STEP = 0.0001
+# Money may differ by a hundredth of a cent: at rates of a few basis points the reference annuity
+# loop and the closed form round the near-zero final balance differently by up to ~1e-5 euros
+_MONEY_ATOL = 1e-4
+
+
+class DifferentialCheck:
+    """
+    A fast vectorized path and the iterative reference it replaces.
+
+    generate(rng, size) returns named input columns, edge_cases() the inputs that are always
+    checked on top of the random ones. reference is called once per row with plain Python values
+    and returns a tuple of outputs; fast is called with the columns and returns the same outputs
+    as arrays. Outputs match when |fast - reference| <= atol + rtol * |reference|.
+    """
+    __slots__ = ("name", "generate", "edge_cases", "reference", "fast", "outputs", "rtol", "atol")
+
+    def __init__(self, name, generate, edge_cases, reference, fast, outputs, rtol, atol):
+        self.name = name
+        self.generate = generate
+        self.edge_cases = edge_cases
+        self.reference = reference
+        self.fast = fast
+        self.outputs = outputs
+        self.rtol = rtol
+        self.atol = atol
+
+
+class DifferentialReport(_Result):
+    """
+    Outcome of a check: mismatches counts rows where any output is outside the tolerance,
+    worst_case holds the inputs with the largest relative error and speedup is the throughput of
+    the fast path divided by that of the reference.
+    """
+    __slots__ = ("name", "samples", "mismatches", "max_abs_error", "max_rel_error", "worst_case", "reference_seconds",
+                 "fast_seconds")
+
+    @property
+    def passed(self):
+        return self.mismatches == 0
+
+    @property
+    def speedup(self):
+        return self.reference_seconds / self.fast_seconds if self.fast_seconds else float("inf")
+
+    def __repr__(self):
+        status = "ok" if self.passed else f"{self.mismatches} MISMATCHES"
+        return (f"{self.name}: {self.samples} samples, {status}, max abs error {self.max_abs_error:.3g}, "
+                f"max rel error {self.max_rel_error:.3g}, {self.speedup:.0f}x faster")
+
+
+def _rates(rng, size, high):
+    return rng.integers(0, round(high / _RATE_STEP) + 1, size) * _RATE_STEP
+
+
+def _mortgage_inputs(rng, size):
+    return {
+        "mortgage_amount": np.round(rng.uniform(0, 2000000, size), 2),
+        "interest_rate": _rates(rng, size, 0.12),
+        "years": rng.integers(1, 41, size)
+    }
+
+
+def _mortgage_edge_cases():
+    amounts, rates, years = np.meshgrid([0.0, 0.01, 250000.0, 2000000.0], [0.0, _RATE_STEP, 0.04, 0.12],
+                                        [1, 2, 30, 40], indexing="ij")
+    return {"mortgage_amount": amounts.reshape(-1), "interest_rate": rates.reshape(-1),
+            "years": years.reshape(-1).astype(np.int64)}
+
+
+def _reference_annuity_interest(mortgage_amount, interest_rate, years):
+    monthly_payment = calculate_annuity_mortgage_payment(mortgage_amount, interest_rate, years)
+    total_paid = monthly_payment * years * MONTHS_IN_YEAR
+    return calculate_total_annuity_interest(total_paid, monthly_payment, mortgage_amount, interest_rate, years)
+
+
+def _fast_interest(quote):
+    def fast(mortgage_amount, interest_rate, years):
+        batch = quote(mortgage_amount, interest_rate, years)
+        return batch.total_interest, batch.total_tax_return
+    return fast
+
+
+def _growth_inputs(rng, size):
+    return {"annual_yield": np.round(rng.integers(-2000, 3001, size) * _RATE_STEP, 4),
+            "years": rng.integers(1, 61, size)}
+
+
+def _growth_edge_cases():
+    yields, years = np.meshgrid([-0.2, -_RATE_STEP, 0.0, _RATE_STEP, 0.07, 0.3], [1, 2, 60], indexing="ij")
+    return {"annual_yield": yields.reshape(-1), "years": years.reshape(-1).astype(np.int64)}
+
+
+def _gift_inputs(rng, size):
+    return {"gift_amount": np.round(rng.uniform(0, 1000000, size), 2)}
+
+
+def _gift_edge_cases():
+    exemptions = HOME_ACQUISITION_EXEMPTION + ANNUAL_PARENTAL_EXEMPTION
+    boundaries = np.array([0.0, exemptions, exemptions + FIRST_BRACKET_LIMIT])
+    return {"gift_amount": np.maximum(0, np.concatenate([boundaries - 0.01, boundaries, boundaries + 0.01]))}
+
+
+CHECKS = {
+    "linear_interest": DifferentialCheck(
+        "linear_interest", _mortgage_inputs, _mortgage_edge_cases, calculate_total_linear_interest,
+        _fast_interest(quote_linear_mortgages), ("total_interest", "total_tax_return"), rtol=1e-9, atol=_MONEY_ATOL),
+    "annuity_interest": DifferentialCheck(
+        "annuity_interest", _mortgage_inputs, _mortgage_edge_cases, _reference_annuity_interest,
+        _fast_interest(quote_annuity_mortgages), ("total_interest", "total_tax_return"), rtol=1e-9, atol=_MONEY_ATOL),
+    "growth": DifferentialCheck(
+        "growth", _growth_inputs, _growth_edge_cases, lambda y, n: (calculate_growth_over_n_years(y, n),),
+        lambda y, n: (calculate_growths_over_n_years(y, n),), ("growth",), rtol=1e-12, atol=0.0),
+    "gift_tax": DifferentialCheck(
+        "gift_tax", _gift_inputs, _gift_edge_cases, lambda gift: (calculate_gift_tax(gift),),
+        lambda gift: (calculate_gift_taxes(gift),), ("tax",), rtol=0.0, atol=_MONEY_ATOL)
+}
+
+
+def run_check(check, samples=100000, seed=0, chunk_size=100000):
+    """
+    Compare a check's fast path with its reference on its edge cases plus `samples` random
+    inputs, chunk by chunk so millions of samples run in constant memory.
+    """
+    if isinstance(check, str):
+        if check not in CHECKS:
+            raise ValueError(f"Unknown check '{check}'. Must be one of: {', '.join(CHECKS)}.")
+        check = CHECKS[check]
+
+    rng = np.random.default_rng(seed)
+    chunks = itertools.chain([check.edge_cases()], (check.generate(rng, min(chunk_size, samples - start))
+                                                    for start in range(0, samples, chunk_size)))
+
+    total = mismatches = 0
+    max_abs_error = max_rel_error = 0.0
+    worst_case = None
+    reference_seconds = fast_seconds = 0.0
+    for inputs in chunks:
+        columns = list(inputs.values())
+        rows = list(zip(*(column.tolist() for column in columns)))
+
+        start = time.perf_counter()
+        expected = np.array([check.reference(*row) for row in rows], dtype=np.float64).reshape(len(rows), -1)
+        reference_seconds += time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = np.column_stack([np.asarray(output, dtype=np.float64).reshape(-1) for output in check.fast(*columns)])
+        fast_seconds += time.perf_counter() - start
+
+        abs_error = np.abs(actual - expected)
+        # relative errors of values that are zero within the absolute tolerance are not meaningful
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel_error = np.where(np.abs(expected) > check.atol, abs_error / np.abs(expected), 0.0)
+        outside = (abs_error > check.atol + check.rtol * np.abs(expected)).any(axis=1)
+
+        total += len(rows)
+        mismatches += int(np.count_nonzero(outside))
+        max_abs_error = max(max_abs_error, float(abs_error.max(initial=0.0)))
+        worst = int(np.argmax(rel_error.max(axis=1))) if len(rows) else None
+        if worst is not None and (worst_case is None or rel_error[worst].max() > max_rel_error):
+            max_rel_error = float(rel_error[worst].max())
+            worst_case = dict(zip(inputs, rows[worst]))
+
+    return DifferentialReport(name=check.name, samples=total, mismatches=mismatches, max_abs_error=max_abs_error,
+                              max_rel_error=max_rel_error, worst_case=worst_case,
+                              reference_seconds=reference_seconds, fast_seconds=fast_seconds)
+
+
+def run_all(samples=100000, seed=0, chunk_size=100000):
+    return {name: run_check(check, samples, seed, chunk_size) for name, check in CHECKS.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the vectorized calculators against the reference loops.")
+    parser.add_argument("checks", nargs="*", help=f"checks to run, out of {', '.join(CHECKS)} (default: all)")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+    unknown = [name for name in arguments.checks if name not in CHECKS]
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(unknown)}")
+
+    failed = False
+    for name in arguments.checks or CHECKS:
+        report = run_check(name, arguments.samples, arguments.seed)
+        failed |= not report.passed
+        print(report)
+        if not report.passed:
+            print(f"  worst case: {report.worst_case}")
+
+    raise SystemExit(1 if failed else 0)